@@ -0,0 +1,74 @@
+"""
+    Measures the memory held per Subscriber (with its Seats) and per Subscription once parsed from BSS JSON, and per
+    Subscriber kept in a SubscriberTable.
+
+    Runs offline on generated records shaped like BSS getSubscriberByCustomer / getSubscriptionByCustomer rows. The
+    JSON itself is released before measuring, so only the model objects and what they reference are counted.
+
+    python benchmarks/model_memory.py
+"""
+import gc
+import tracemalloc
+
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+
+COUNT = 10000
+
+
+def timestamp(i: int) -> str:
+    return "%02d/%02d/2019 %02d:%02d:%02d" % (1 + i % 12, 1 + i % 28, i % 24, i % 60, (i * 7) % 60)
+
+
+def subscriber_json(i: int) -> dict:
+    return {"Id": 1000 + i, "CustomerId": 42, "SubscriberState": "ACTIVE", "PartyRoleType": "SUBSCRIBER",
+            "IsGuest": False,
+            "SeatSet": [{"Id": 5000 + i, "SubscriptionId": 900 + i % 3, "SubscriberId": 1000 + i,
+                         "Created": timestamp(i), "Modified": timestamp(i + 1), "SeatState": "ASSIGNED"}],
+            "Person": {"EmailAddress": f"user{i}@example.com", "GivenName": f"Given{i}", "FamilyName": f"Family{i}",
+                       "OrgName": "Example", "Owner": 1, "Modified": timestamp(i * 3), "Created": timestamp(i * 5),
+                       "RoleSet": ["User"], "SecurityRealm": "NON_FEDERATED", "Deleted": False}}
+
+
+def subscription_json(i: int) -> dict:
+    return {"Id": 900 + i, "PartNumber": "D0NPULL", "CustomerId": 42, "SubscriptionState": "ACTIVE",
+            "NumberOfAvailableSeats": 10, "Modified": timestamp(i), "Created": timestamp(i + 1),
+            "PurchaseDate": timestamp(i + 2), "ExpirationDate": timestamp(i + 3), "EffectiveDate": timestamp(i + 4),
+            "MaxNumberOfSeats": 20, "DurationLength": 12, "DurationUnits": "MONTHS"}
+
+
+def bytes_per_model(build, make_json) -> float:
+    records = [make_json(i) for i in range(COUNT)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    models = build(records)
+    del records
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del models
+    return held / COUNT
+
+
+def subscriber_table(records: [dict]) -> SubscriberTable:
+    table = SubscriberTable("NA")
+    for record in records:
+        table.add(Subscriber.from_json("NA", record))
+    return table
+
+
+def main() -> None:
+    per_subscriber = bytes_per_model(lambda records: {record["Id"]: Subscriber.from_json("NA", record)
+                                                      for record in records}, subscriber_json)
+    per_row = bytes_per_model(subscriber_table, subscriber_json)
+    per_subscription = bytes_per_model(lambda records: [Subscription.from_json("NA", record) for record in records],
+                                       subscription_json)
+    print(f"Subscriber with 1 Seat  {per_subscriber:8.0f} bytes")
+    print(f"SubscriberTable row     {per_row:8.0f} bytes")
+    print(f"Subscription            {per_subscription:8.0f} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+    Times parsing a page of 1,000 Subscribers with utils.qol.parse_time against the plain strptime it replaced.
+
+    Runs offline on generated records shaped like BSS getSubscriberByCustomer rows.
+
+    python benchmarks/parse_time.py
+"""
+import timeit
+from datetime import datetime
+from unittest import mock
+
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.utils import qol
+
+PAGE_SIZE = 1000
+REPEAT = 5
+
+
+def strptime_parse_time(time_string: str) -> datetime:
+    return datetime.strptime(time_string, "%m/%d/%Y %H:%M:%S")
+
+
+def timestamp(i: int) -> str:
+    return "%02d/%02d/2019 %02d:%02d:%02d" % (1 + i % 12, 1 + i % 28, i % 24, i % 60, (i * 7) % 60)
+
+
+def subscriber_json(i: int) -> dict:
+    return {"Id": 1000 + i, "CustomerId": 42, "SubscriberState": "ACTIVE", "PartyRoleType": "SUBSCRIBER",
+            "IsGuest": False,
+            "SeatSet": [{"Id": 5000 + i, "SubscriptionId": 900 + i % 3, "SubscriberId": 1000 + i,
+                         "Created": timestamp(i), "Modified": timestamp(i + 1), "SeatState": "ASSIGNED"},
+                        {"Id": 6000 + i, "SubscriptionId": 903, "SubscriberId": 1000 + i, "SeatState": "ASSIGNED"}],
+            "Person": {"EmailAddress": f"user{i}@example.com", "GivenName": f"Given{i}", "FamilyName": f"Family{i}",
+                       "OrgName": "Example", "Owner": 1, "Modified": timestamp(i * 3), "Created": timestamp(i * 5),
+                       "RoleSet": ["User"], "SecurityRealm": "NON_FEDERATED", "Deleted": False}}
+
+
+def parse_page(page: [dict]) -> None:
+    for subscriber in page:
+        Subscriber.from_json("NA", subscriber)
+
+
+def best_of(fn) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT))
+
+
+def main() -> None:
+    page = [subscriber_json(i) for i in range(PAGE_SIZE)]
+    timestamps = [timestamp(i) for i in range(PAGE_SIZE)]
+
+    call_before = best_of(lambda: [strptime_parse_time(ts) for ts in timestamps])
+    call_cold = best_of(lambda: (qol._parse_time.cache_clear(), [qol.parse_time(ts) for ts in timestamps]))
+    call_warm = best_of(lambda: [qol.parse_time(ts) for ts in timestamps])
+
+    with mock.patch("smartcloudadmin.models.subscriber.parse_time", strptime_parse_time), \
+            mock.patch("smartcloudadmin.models.seat.parse_time", strptime_parse_time):
+        page_before = best_of(lambda: parse_page(page))
+    page_cold = best_of(lambda: (qol._parse_time.cache_clear(), parse_page(page)))
+    page_warm = best_of(lambda: parse_page(page))
+
+    print(f"parse_time, {PAGE_SIZE} distinct timestamps (us per call)")
+    print(f"  strptime        {call_before / PAGE_SIZE * 1e6:8.2f}")
+    print(f"  fast, cold LRU  {call_cold / PAGE_SIZE * 1e6:8.2f}  x{call_before / call_cold:.1f}")
+    print(f"  fast, warm LRU  {call_warm / PAGE_SIZE * 1e6:8.2f}  x{call_before / call_warm:.1f}")
+    print(f"Subscriber.from_json, page of {PAGE_SIZE} (us per record)")
+    print(f"  strptime        {page_before / PAGE_SIZE * 1e6:8.2f}")
+    print(f"  fast, cold LRU  {page_cold / PAGE_SIZE * 1e6:8.2f}  x{page_before / page_cold:.1f}")
+    print(f"  fast, warm LRU  {page_warm / PAGE_SIZE * 1e6:8.2f}  x{page_before / page_warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
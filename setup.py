@@ -3,7 +3,8 @@ from setuptools import setup
 setup(
     name='smartcloudadmin',
     version='0.7.5',
-    packages=['smartcloudadmin', 'smartcloudadmin.utils', 'smartcloudadmin.models', 'smartcloudadmin.json'],
+    packages=['smartcloudadmin', 'smartcloudadmin.utils', 'smartcloudadmin.models', 'smartcloudadmin.json',
+              'smartcloudadmin.aio'],
     url='https://github.com/cathaldi/smartcloud-administrator',
     include_package_data=True,
     package_data={'': ['*']},
@@ -11,6 +12,7 @@ setup(
     download_url='https://github.com/cathaldi/smartcloud-administrator/releases/download/0.7.5/smartcloudadmin-0.7.5.tar.gz',
     author='Cathal A. Dinneen',
     install_requires=['requests'],
+    extras_require={'aio': ['aiohttp'], 'numpy': ['numpy']},
     author_email='cathal.a.dinneen@gmail.com',
     description='A package that provides functions to help interacting with companies, subscriptions and subscribers on IBM Smartcloud'
 )
@@ -1,5 +1,9 @@
 from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.organization_cache import OrganizationCache
 from smartcloudadmin.models.subscriber import Subscriber
 from smartcloudadmin.models.subscription import Subscription
 from smartcloudadmin.models.seat import Seat
-from smartcloudadmin.models.contact import Contact
\ No newline at end of file
+from smartcloudadmin.models.contact import Contact
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+from smartcloudadmin.models.lazy import LazyOrganization, LazySubscriber, LazySubscription
+from smartcloudadmin.store import LocalStore
@@ -0,0 +1,450 @@
+import asyncio
+import json
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.utils import deadline
+from smartcloudadmin.utils.cache import cached, invalidates
+from smartcloudadmin.utils.single_flight import coalesced
+from smartcloudadmin.http_requests import _Attempts, _http_status_handler, bss_base_resource_url
+
+import logging
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency - pip install smartcloudadmin[aio]
+    aiohttp = None
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+config = BssConfig()
+
+"""
+    asyncio counterpart of smartcloudadmin.http_requests. Every endpoint function is a coroutine with the same
+    name, parameters and return value as its blocking version, e.g.
+
+    >>> org_json, subscribers_json = await asyncio.gather(get_org_by_id("NA", 123), get_subscribers_by_org("NA", 123))
+
+    Requests to a datacenter share one aiohttp session per event loop, sized from the datacenter pool settings
+    given to BssConfig.add_datacenter.
+"""
+
+# Keyed by environment name. The datacenter settings dict and the loop the session belongs to are kept alongside
+# the session, aiohttp sessions can't be used outside the loop they were created in.
+_sessions = {}
+
+
+class BssResponse:
+    """
+        A fully read response exposing the same status_code/json()/headers as a requests.Response so it can be passed
+        to the shared status handler.
+    """
+    def __init__(self, status_code: int, text: str, headers) -> None:
+        self.status_code: int = status_code
+        self.text: str = text
+        self.headers = headers
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def get_session(environment) -> 'aiohttp.ClientSession':
+    """
+        Returns the pooled session for a datacenter on the running event loop, creating it on first use.
+
+    :param environment: Datacenter name as registered with BssConfig.add_datacenter
+    :return: aiohttp.ClientSession
+    """
+    if aiohttp is None:
+        raise ImportError("aiohttp is required for smartcloudadmin.aio - pip install smartcloudadmin[aio]")
+    datacenter = config.datacenters.get(environment)
+    loop = asyncio.get_running_loop()
+    pooled_datacenter, pooled_loop, session = _sessions.get(environment, (None, None, None))
+    if session is None or session.closed or pooled_datacenter is not datacenter or pooled_loop is not loop:
+        if session is not None and pooled_loop is loop:
+            loop.create_task(session.close())
+        session = _create_session(environment)
+        _sessions[environment] = (datacenter, loop, session)
+    return session
+
+
+def _create_session(environment) -> 'aiohttp.ClientSession':
+    pool = config.get_pool_settings(environment)
+    username, password = config.get_credentials(environment)
+    connector = aiohttp.TCPConnector(limit=pool.get("pool_connections") * pool.get("pool_maxsize"),
+                                     limit_per_host=pool.get("pool_maxsize"),
+                                     force_close=not pool.get("keep_alive"),
+                                     ssl=None if config.verify_ssl else False)
+    logger.debug(f"Created async session for {environment} with pool settings {pool}")
+    return aiohttp.ClientSession(connector=connector, auth=aiohttp.BasicAuth(username, password))
+
+
+async def reset_session(environment) -> None:
+    """
+        Closes the pooled session for a datacenter. A new one is created on the next request.
+
+    :param environment: Datacenter name
+    """
+    _, loop, session = _sessions.pop(environment, (None, None, None))
+    if session is not None and loop is asyncio.get_running_loop():
+        await session.close()
+
+
+async def close_sessions() -> None:
+    """
+        Closes the pooled sessions for every datacenter. Should be awaited before the event loop is closed.
+    """
+    sessions = list(_sessions.values())
+    _sessions.clear()
+    for _, loop, session in sessions:
+        if loop is asyncio.get_running_loop():
+            await session.close()
+
+
+async def make_req(environment, url, **kwargs) -> BssResponse:
+    """
+        Awaitable version of :func:`smartcloudadmin.http_requests.make_req`, retrying transient failures according
+        to the datacenter's RetryPolicy.
+    """
+    attempts = _Attempts(environment, url, **kwargs)
+    while True:
+        wait = attempts.begin()
+        try:
+            if wait > 0:
+                await asyncio.sleep(wait)
+            timeout = attempts.timeout()
+        except BaseException:
+            attempts.abandon()
+            raise
+        try:
+            response = await _send(environment, url, timeout=timeout, **kwargs)
+        except Exception as error:
+            delay = attempts.failed(error)
+            if delay is None:
+                raise
+        else:
+            delay = attempts.responded(response)
+            if delay is None:
+                return response
+        await asyncio.sleep(delay)
+
+
+async def _send(environment, url, *, timeout, **kwargs) -> BssResponse:
+    connect_timeout, read_timeout = timeout
+    timeout = aiohttp.ClientTimeout(total=deadline.remaining(), sock_connect=connect_timeout, sock_read=read_timeout)
+    baseurl = config.get_url(environment)
+    params = kwargs.get('params', {})
+    json_body = kwargs.get('json', {})
+    headers = kwargs.get('headers', {})
+    method = kwargs.get('method', 'get')
+    session = get_session(environment)
+    if method == "get":
+        request = session.get(f"{baseurl}{url}", params=params, timeout=timeout)
+    elif method == "post":
+        request = session.post(f"{baseurl}{url}", json=json_body, params=params, headers=headers, timeout=timeout)
+    elif method == "delete":
+        request = session.delete(f"{baseurl}{url}", json=json_body, params=params, timeout=timeout)
+    elif method == "put":
+        request = session.put(f"{baseurl}{url}", json=json_body, params=params, timeout=timeout)
+    else:
+        raise ValueError(f"Unsupported method {method}")
+    async with request as response:
+        return BssResponse(response.status, await response.text(), response.headers)
+
+
+async def create_org(env, post_body, base_url=bss_base_resource_url):
+    bss_response = await make_req(env, f"{base_url}/customer", json=post_body, method="post")
+    if bss_response.json().get("Long", ""):  # Issue 17 - BSS returns 200 on successful create calls
+        bss_response.status_code = 201
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("customer")
+async def update_org(env, post_body, base_url=bss_base_resource_url):  # todo:  WIP
+    bss_response = await make_req(env, f"{base_url}/customer", json=post_body, method="put")
+    if bss_response.json().get("Long", ""):
+        return bss_response.json().get("Long")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("customer", "org_id")
+@invalidates("subscriber")
+@invalidates("subscription")
+async def delete_org(env, org_id):
+    bss_response = await make_req(env, f"/api/bss/resource/customer/{org_id}", method="delete")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("customer", "organization_id")
+@invalidates("subscriber")
+@invalidates("subscription")
+async def suspend_org(environment, organization_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/customer/{organization_id}",
+                            method="post", headers={"x-operation": "suspendCustomer"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("customer", "organization_id")
+@invalidates("subscriber")
+@invalidates("subscription")
+async def unsuspend_org(environment, organization_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/customer/{organization_id}",
+                            method="post", headers={"x-operation": "unsuspendCustomer"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@cached("customer", "organization_id")
+@coalesced("customer", "organization_id")
+async def get_org_by_id(environment, organization_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/customer/{organization_id}")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("customer")
+async def get_orgs_by_name(environment, org_name, *, page_number=1, page_size=25):
+    bss_response = await make_req(environment, f"/api/bss/resource/customer?_namedQuery=getCustomerByOrgName&"
+                                         f"orgName={org_name}&_pageNumber={page_number}&_pageSize={page_size}")
+    if bss_response.status_code == 200:
+        return bss_response.json().get("List")
+    elif bss_response.status_code == 404:  # todo: special case. Expected for empty list
+        return []
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscriber")
+async def get_subscriber_by_email(env, email):  # todo: re-evaluate this - maybe we expect many results as we are returned a list.
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber?"
+                                 f"_namedQuery=getSubscriberByEmailAddress&emailAddress={email}")
+    if bss_response.status_code == 200:
+        return bss_response.json().get("List")[0]
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscriber")
+async def get_subscribers_by_org(env, org_id, page_size=100, page_number=1):  # walk every page with utils.pagination.paginate
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber?_namedQuery=getSubscriberByCustomer&"
+                                 f"customer={org_id}&_pageNumber={page_number}&_pageSize={page_size}")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@cached("subscriber", "subscriber_id")
+@coalesced("subscriber", "subscriber_id")
+async def get_subscriber_by_id(environment, subscriber_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/subscriber/{subscriber_id}")
+    if bss_response.status_code == 200:
+        return bss_response.json().get("Subscriber")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+async def activate_subscriber(env, subscriber_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}", method="post",
+                            headers={"x-operation": "activateSubscriber"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def set_one_time_password(env, post_body):
+    bss_response = await make_req(env, "/api/bss/service/authentication/setOneTimePassword", method="post", json=post_body)
+    if bss_response.status_code == 204:
+        return {}
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def change_password(env, post_body):
+    bss_response = await make_req(env, "/api/bss/service/authentication/changePassword", method="post",
+                            json=post_body)
+    if bss_response.status_code == 204:
+        return {}
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def reset_password(env, email_address):
+    bss_response = await make_req(env, f"/api/bss/service/authentication/resetPassword?loginName={email_address} ",
+                            method="post")
+    if bss_response.status_code == 204:
+        return {}
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def set_password(env, post_body, by_pass_policy=False):
+    if by_pass_policy == False:
+        by_pass_policy = "false"
+    else:
+        by_pass_policy = "true"
+    bss_response = await make_req(env, f"/api/bss/service/authentication/setUserPassword?bypassPolicy={by_pass_policy}",
+                            method="post", json=post_body)
+    if bss_response.status_code == 204:
+        return {}
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def create_subscriber(environment, post_body, supress_email="true"):
+    bss_response = await make_req(environment, f"/api/bss/resource/subscriber?suppressEmail={supress_email}", json=post_body,
+                            method="post", params={"suppressEmail": f"{supress_email}"})
+
+    if bss_response.json().get("Long", ""):  # Issue 17 - BSS returs 200 on successful create calls
+        bss_response.status_code = 201
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscriber")
+async def get_subscribers(env):
+    bss_response = await make_req(env, "/api/bss/resource/subscriber/")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+async def delete_subscriber(env, subscriber_id, soft_delete="true"):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}?moveToSoftDelete={soft_delete}",
+                            method="delete")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+async def restore_subscriber(env, subscriber_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
+                            method="post", headers={"x-operation": "restoreSubscriber"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+async def suspend_subscriber(env, subscriber_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
+                            method="post", headers={"x-operation": "suspendSubscriber"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+async def unsuspend_subscriber(env, subscriber_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
+                            method="post", headers={"x-operation": "unSuspendSubscriber"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+@invalidates("subscription", "subscription_id")
+async def entitle_subscriber(env, subscriber_id, subscription_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}/subscription/{subscription_id}",
+                            method="post", headers={"x-operation": "entitleSubscriber"})
+    if bss_response.status_code == 200:
+        return bss_response.json().get("HashMap")
+    elif bss_response.status_code == 404:
+        # Playing fast and loose with response codes. todo: should info be returned explaining user is already entitled?
+        # {'ResponseCode': '404', 'MessageCode': 'BZSUS1926E', 'Severity': 'Error',
+        #  'ResponseMessage': 'The subscriber already has a seat for the subscription.',
+        # 'Useraction': 'Check that the subscriber already has the same subscription.'}
+        return ""
+
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscriber", "subscriber_id")
+@invalidates("subscription")
+async def revoke_subscriber(env, subscriber_id, seat_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}/seat/{seat_id}?_force=false",
+                            method="post", headers={"x-operation": "revokeSubscriber"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+async def create_subscription(env, body, suppress_email="true"):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription?suppressEmail={suppress_email}",
+                            method="post", json=body)
+    if bss_response.status_code == 200:
+        return bss_response.json().get("List")[0]
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscription", "subscription_id")
+async def suspend_subscription(env, subscription_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
+                            method="post", headers={"x-operation": "suspendSubscription"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscription", "subscription_id")
+async def unsuspend_subscription(env, subscription_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
+                            method="post", headers={"x-operation": "unsuspendSubscription"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscription", "subscription_id")
+async def delete_subscription(environment, subscription_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/subscription/{subscription_id}",
+                            method="delete")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscription", "current_subscription_id")
+@invalidates("subscription", "target_subscription_id")
+@invalidates("subscriber")
+async def transfer_subscription_seat(environment, current_subscription_id, seat_id, target_subscription_id):
+    bss_response = await make_req(environment, f"/api/bss/resource/subscription/{current_subscription_id}/seat/{seat_id}?"
+                                         f"targetSubscription={target_subscription_id}",
+                            method="post", headers={"x-operation": "transferSeat"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("subscription", "subscription_id")
+async def change_subscription_quota(env, subscription_id, seat_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
+                            method="post", headers={"x-operation": "changeQuota"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscription")
+async def get_subscription_list_by_customer_id(env, customer_id, page_number=1, page_size=100):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription?_namedQuery=getSubscriptionByCustomer&"
+                                 f"customerId={customer_id}",
+                            method="get", params={"_pageNumber": f"{page_number}", "_pageSize": f"{page_size}"})
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@cached("subscription", "subscription_id")
+@coalesced("subscription", "subscription_id")
+async def get_subscription_by_subscription_id(env, subscription_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
+                            method="get")
+    if bss_response.status_code == 200:  # bit of a custom handler
+        return bss_response.json().get("Subscription")  # todo: check all return json and standardise
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscription", "subscription_id")
+async def get_seat_details_by_subscription_id(env, subscription_id, seat_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
+                            method="get")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@coalesced("subscription", "subscription_id")
+async def vendor_get_subscription_list(env, subscription_id, seat_id):
+    bss_response = await make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
+                            method="get")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@cached("roles", "login_name")
+@coalesced("roles", "login_name")
+async def get_role_list(env, login_name):
+    bss_response = await make_req(env, f"/api/bss/service/authorization/getRoleList?loginName={login_name}",
+                                  method="post", idempotent=True)
+
+    if bss_response.status_code == 200:
+        return bss_response.json().get("List")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("roles", "login_name")
+async def assign_role(env, login_name, valid_role):
+    bss_response = await make_req(env, f"/api/bss/service/authorization/assignRole?loginName={login_name}&role={valid_role}",
+                            method="post")
+    return _http_status_handler(bss_response.status_code, bss_response)
+
+
+@invalidates("roles", "login_name")
+async def unassign_role(env, login_name, valid_role):
+    bss_response = await make_req(env, f"/api/bss/service/authorization/unassignRole?"
+                                 f"loginName={login_name}&role={valid_role}",
+                            method="post")
+    return _http_status_handler(bss_response.status_code, bss_response)
@@ -1,4 +1,5 @@
 import logging
+from smartcloudadmin.utils.retry import RetryPolicy
 
 
 class BssConfig:
@@ -11,21 +12,101 @@ class BssConfig:
 
     datacenters = {}
 
-    def add_datacenter(self, env_name: str, env_url: str, env_username_password: (str, str)):
+    def add_datacenter(self, env_name: str, env_url: str, env_username_password: (str, str), *,
+                       pool_connections: int = 10, pool_maxsize: int = 10, pool_block: bool = False,
+                       keep_alive: bool = True, page_fan_out: int = 1, page_size: int = 25,
+                       adaptive_page_size: bool = False, max_page_size: int = 1000, page_prefetch: int = 0,
+                       retry_policy: RetryPolicy = None, rate_limit: float = None, rate_burst: int = 1,
+                       circuit_failure_threshold: int = 5, circuit_cooldown: float = 30.0,
+                       connect_timeout: float = 10.0, read_timeout: float = 60.0, response_cache=None):
         """
             Makes more sense to call them datacenter
+
+        :param env_name: Name used to refer to the datacenter, e.g. NA, CE, AP
+        :param env_url: Base url of the datacenter, e.g. https://apps.na.collabserv.com
+        :param env_username_password: (username, password) used to authenticate against BSS
+        :param pool_connections: Number of host connection pools kept for the datacenter.
+        :param pool_maxsize: Maximum number of connections kept open per host.
+        :param pool_block: Block and wait for a free connection when the pool is exhausted instead of opening an
+        extra, non-pooled connection.
+        :param keep_alive: Re-use connections between requests. When False every request closes its connection.
+        :param page_fan_out: Number of subscriber pages requested concurrently when loading an Organization.
+        :param page_size: Number of results requested per page for paged queries.
+        :param adaptive_page_size: Double the page size after each full page, up to max_page_size, and halve it again
+        (never below page_size) when a page request times out or fails with a server error.
+        :param max_page_size: Largest page size adaptive paging will request.
+        :param page_prefetch: Number of pages requested in the background while earlier pages are being processed.
+        0 requests the next page only once the current one has been processed.
+        :param retry_policy: How requests failing with a 5xx or a network error are retried. Defaults to
+        RetryPolicy(), 3 attempts with exponential backoff for requests that only read data.
+        :param rate_limit: Maximum number of requests per second sent to the datacenter by this process, shared by
+        every thread and async task. None sends requests as fast as they are made.
+        :param rate_burst: Number of requests that can be sent back to back before rate_limit applies.
+        :param circuit_failure_threshold: Consecutive connection errors, timeouts, 502, 503 and 504 responses (and
+        500 responses to requests that only read data) after which requests to the datacenter fail fast with
+        BssCircuitOpen. 0 disables the circuit breaker.
+        :param circuit_cooldown: Seconds requests fail fast before a trial request is sent to the datacenter again.
+        :param connect_timeout: Seconds to wait for a connection to the datacenter. None waits forever.
+        :param read_timeout: Seconds to wait for the datacenter to send data once connected. None waits forever.
+        :param response_cache: (Optional) utils.cache.ResponseCache holding responses of read-only endpoints such as
+        get_org_by_id and get_role_list. Calls changing a resource drop its cached responses. Not cached by default.
         :return:
         """
         self.datacenters[env_name] = {
             "url": f"{env_url}",
-            "auth": env_username_password
+            "auth": env_username_password,
+            "pool": {
+                "pool_connections": pool_connections,
+                "pool_maxsize": pool_maxsize,
+                "pool_block": pool_block,
+                "keep_alive": keep_alive
+            },
+            "pagination": {
+                "fan_out": page_fan_out,
+                "page_size": page_size,
+                "adaptive": adaptive_page_size,
+                "max_page_size": max_page_size,
+                "prefetch": page_prefetch
+            },
+            "retry_policy": retry_policy or RetryPolicy(),
+            "rate_limit": {
+                "rate": rate_limit,
+                "burst": rate_burst
+            },
+            "circuit_breaker": {
+                "failure_threshold": circuit_failure_threshold,
+                "cooldown": circuit_cooldown
+            },
+            "timeouts": {
+                "connect": connect_timeout,
+                "read": read_timeout
+            },
+            "response_cache": response_cache
         }
 
-
-
-
     def get_credentials(self, env_name: str):
         return self.datacenters.get(env_name).get("auth")
 
     def get_url(self, env_name: str):
         return self.datacenters.get(env_name).get("url")
+
+    def get_pool_settings(self, env_name: str):
+        return self.datacenters.get(env_name).get("pool")
+
+    def get_pagination_settings(self, env_name: str):
+        return self.datacenters.get(env_name).get("pagination")
+
+    def get_retry_policy(self, env_name: str) -> RetryPolicy:
+        return self.datacenters.get(env_name).get("retry_policy")
+
+    def get_rate_limit_settings(self, env_name: str):
+        return self.datacenters.get(env_name).get("rate_limit")
+
+    def get_circuit_breaker_settings(self, env_name: str):
+        return self.datacenters.get(env_name).get("circuit_breaker")
+
+    def get_timeout_settings(self, env_name: str):
+        return self.datacenters.get(env_name).get("timeouts")
+
+    def get_response_cache(self, env_name: str):
+        return self.datacenters.get(env_name).get("response_cache")
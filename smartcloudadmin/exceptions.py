@@ -27,3 +27,27 @@ class BSSBadData(Exception):  # 5XX
     maybe trying to add sub when its deleted etc.
     """
     pass
+
+
+class BssThrottled(Exception):
+    """
+    BSS answered 429, too many requests were sent to the datacenter. Raised once the datacenter's RetryPolicy has no
+    attempts left.
+    """
+    pass
+
+
+class BssCircuitOpen(Exception):
+    """
+    Requests to the datacenter kept failing and are failed fast without being sent until the circuit breaker's
+    cooldown has passed.
+    """
+    pass
+
+
+class BssDeadlineExceeded(Exception):
+    """
+    The deadline given to an operation, e.g. Organization.get(..., deadline=30), passed before all of its requests
+    could be made.
+    """
+    pass
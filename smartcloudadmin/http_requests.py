@@ -1,6 +1,15 @@
+import threading
+import time
+
 import requests
+from requests.adapters import HTTPAdapter
 from smartcloudadmin.config import BssConfig
-from smartcloudadmin.exceptions import BssServerError, BssResourceNotFound, BSSBadData
+from smartcloudadmin.utils import deadline
+from smartcloudadmin.utils.cache import cached, invalidates
+from smartcloudadmin.utils.circuit_breaker import get_breaker, is_failure
+from smartcloudadmin.utils.single_flight import coalesced
+from smartcloudadmin.utils.rate_limit import get_bucket, parse_retry_after
+from smartcloudadmin.exceptions import BssServerError, BssResourceNotFound, BSSBadData, BssThrottled
 
 import logging
 
@@ -19,25 +28,229 @@ bss_base_resource_url = "/api/bss/resource"
 bss_base_service_url = "/api/bss/service"
 ssm_base_resource_url = "/scx/test/sbs/subscriber/"
 
+# One pooled keep-alive session per datacenter. Keyed by environment name, the datacenter settings dict is kept
+# alongside the session so re-registering a datacenter through add_datacenter gets a fresh session.
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(environment) -> requests.Session:
+    """
+        Returns the pooled session for a datacenter, creating it on first use.
+
+    :param environment: Datacenter name as registered with BssConfig.add_datacenter
+    :return: requests.Session
+    """
+    datacenter = config.datacenters.get(environment)
+    with _sessions_lock:
+        pooled_datacenter, session = _sessions.get(environment, (None, None))
+        if session is None or pooled_datacenter is not datacenter:
+            if session is not None:
+                session.close()
+            session = _create_session(environment)
+            _sessions[environment] = (datacenter, session)
+        return session
+
+
+def _create_session(environment) -> requests.Session:
+    pool = config.get_pool_settings(environment)
+    session = requests.Session()
+    session.auth = config.get_credentials(environment)
+    adapter = HTTPAdapter(pool_connections=pool.get("pool_connections"), pool_maxsize=pool.get("pool_maxsize"),
+                          pool_block=pool.get("pool_block"))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not pool.get("keep_alive"):
+        session.headers["Connection"] = "close"
+    logger.debug(f"Created session for {environment} with pool settings {pool}")
+    return session
+
+
+def reset_session(environment) -> None:
+    """
+        Closes the pooled session for a datacenter. A new one is created on the next request.
+
+    :param environment: Datacenter name
+    """
+    with _sessions_lock:
+        _, session = _sessions.pop(environment, (None, None))
+    if session is not None:
+        session.close()
+
+
+def close_sessions() -> None:
+    """
+        Closes the pooled sessions for every datacenter, e.g. before the process exits.
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for _, session in sessions:
+        session.close()
+
 
-def make_req(environment, url, **kwargs):  # todo: network exception handler
+def make_req(environment, url, **kwargs):
+    """
+        Sends a request to a datacenter, retrying transient failures according to the datacenter's RetryPolicy.
+
+    :param environment: Datacenter name
+    :param url: Path of the BSS resource, appended to the datacenter url.
+    :param kwargs: params, json, headers, method (get, post, put or delete) and idempotent. idempotent defaults to
+    True for get requests and marks requests that can be retried without opting in to retrying mutating requests.
+    Requests use the datacenter's connect and read timeouts, cut short to the deadline set with
+    utils.deadline.within when there is one.
+    :return: requests.Response
+    """
+    attempts = _Attempts(environment, url, **kwargs)
+    while True:
+        wait = attempts.begin()
+        try:
+            if wait > 0:
+                time.sleep(wait)
+            timeout = attempts.timeout()
+        except BaseException:
+            attempts.abandon()
+            raise
+        try:
+            response = _send(environment, url, timeout=timeout, **kwargs)
+        except Exception as error:
+            delay = attempts.failed(error)
+            if delay is None:
+                raise
+        else:
+            delay = attempts.responded(response)
+            if delay is None:
+                return response
+        time.sleep(delay)
+
+
+class _Attempts:
+    """
+        The decisions of :func:`make_req` and its asyncio counterpart, shared so the transports only send and wait:
+        whether the datacenter's circuit breaker lets an attempt through, how long its token bucket holds it back,
+        how the outcome counts against the breaker, whether BSS throttled the datacenter and whether and after how
+        long to try again.
+
+        Attributes
+        ----------
+        attempt : int
+            Number of the current attempt, starting at 1.
+    """
+    def __init__(self, environment, url, **kwargs) -> None:
+        self.environment = environment
+        self.url: str = url
+        self.method: str = kwargs.get('method', 'get')
+        self.idempotent: bool = kwargs.get('idempotent', self.method == "get")
+        self.retry_policy = config.get_retry_policy(environment)
+        self.bucket = get_bucket(environment)
+        self.breaker = get_breaker(environment)
+        self.attempt: int = 1
+
+    def begin(self) -> float:
+        """
+            Starts an attempt, to be ended by :func:`failed`, :func:`responded` or :func:`abandon`.
+
+        :return: Seconds to wait for a token before sending.
+        :raises BssCircuitOpen: The datacenter's circuit breaker is open.
+        """
+        self.breaker.before_request()
+        return self.bucket.reserve()
+
+    def timeout(self) -> (float, float):
+        """
+        :return: Connect and read timeouts of the attempt, see utils.deadline.request_timeout.
+        :raises BssDeadlineExceeded: The current deadline has passed.
+        """
+        return deadline.request_timeout(self.environment)
+
+    def abandon(self) -> None:
+        """
+            Ends an attempt that wasn't sent, e.g. the deadline passed while waiting for a token, so a half open
+            breaker doesn't keep waiting on it.
+        """
+        self.breaker.release()
+
+    def failed(self, error: Exception) -> float:
+        """
+            Ends an attempt that raised.
+
+        :return: Seconds to wait before the next attempt, None when error should be raised.
+        """
+        retryable = isinstance(error, self.retry_policy.retry_exceptions)
+        if retryable:
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+        if not retryable or not self.retry_policy.can_retry(self.attempt, self.idempotent):
+            return None
+        logger.warning(f"{self.method} {self.url} on {self.environment} failed with {error!r}, "
+                       f"attempt {self.attempt}")
+        return self._next()
+
+    def responded(self, response) -> float:
+        """
+            Ends an attempt that got a response.
+
+        :return: Seconds to wait before the next attempt, None when response should be returned.
+        """
+        status_code = response.status_code
+        throttled = _throttle(self.bucket, response, self.retry_policy.delay(self.attempt))
+        if throttled or status_code < 500:
+            self.breaker.record_success()
+        elif is_failure(status_code, self.idempotent):
+            self.breaker.record_failure()
+        else:
+            self.breaker.release()
+        if status_code not in self.retry_policy.retry_statuses or \
+                not self.retry_policy.can_retry(self.attempt, self.idempotent or status_code == 429):
+            return None
+        logger.warning(f"{self.method} {self.url} on {self.environment} returned {status_code}, "
+                       f"attempt {self.attempt}")
+        if throttled:  # the paused bucket holds the next attempt back
+            self.attempt += 1
+            return 0.0
+        return self._next()
+
+    def _next(self) -> float:
+        delay = deadline.clamp(self.retry_policy.delay(self.attempt))
+        self.attempt += 1
+        return delay
+
+
+def _throttle(bucket, response, default_pause: float) -> bool:
+    """
+        Pauses the datacenter's requests when BSS throttles, for Retry-After seconds when given.
+
+    :return: True if the response was a throttling response.
+    """
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if response.status_code != 429 and not (response.status_code == 503 and retry_after is not None):
+        return False
+    pause = default_pause if retry_after is None else retry_after
+    bucket.throttle(pause)
+    logger.warning(f"Throttled by BSS with {response.status_code}, pausing requests for {pause:.1f}s")
+    return True
+
+
+def _send(environment, url, *, timeout, **kwargs):
     baseurl = config.get_url(environment)
-    auth = config.get_credentials(environment)
     params = kwargs.get('params', {})
     json = kwargs.get('json', {})
     headers = kwargs.get('headers', {})
     method = kwargs.get('method', 'get')
+    session = get_session(environment)
     if method == "get":
-        response = requests.get(f"{baseurl}{url}", auth=auth, params=params, verify=config.verify_ssl)
+        response = session.get(f"{baseurl}{url}", params=params, verify=config.verify_ssl, timeout=timeout)
         return response
     elif method == "post":
-        r = requests.post(f"{baseurl}{url}", auth=auth, json=json, params=params, headers=headers, verify=config.verify_ssl)
+        r = session.post(f"{baseurl}{url}", json=json, params=params, headers=headers, verify=config.verify_ssl,
+                         timeout=timeout)
         return r
     elif method == "delete":
-        r = requests.delete(f"{baseurl}{url}", auth=auth, json=json, params=params, verify=config.verify_ssl)
+        r = session.delete(f"{baseurl}{url}", json=json, params=params, verify=config.verify_ssl, timeout=timeout)
         return r
     elif method == "put":
-        r = requests.put(f"{baseurl}{url}", auth=auth, json=json, params=params, verify=config.verify_ssl)
+        r = session.put(f"{baseurl}{url}", json=json, params=params, verify=config.verify_ssl, timeout=timeout)
         return r
 
 
@@ -48,6 +261,7 @@ def create_org(env, post_body, base_url=bss_base_resource_url):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("customer")
 def update_org(env, post_body, base_url=bss_base_resource_url):  # todo:  WIP
     bss_response = make_req(env, f"{base_url}/customer", json=post_body, method="put")
     if bss_response.json().get("Long", ""):
@@ -55,28 +269,40 @@ def update_org(env, post_body, base_url=bss_base_resource_url):  # todo:  WIP
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("customer", "org_id")
+@invalidates("subscriber")
+@invalidates("subscription")
 def delete_org(env, org_id):
     bss_response = make_req(env, f"/api/bss/resource/customer/{org_id}", method="delete")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("customer", "organization_id")
+@invalidates("subscriber")
+@invalidates("subscription")
 def suspend_org(environment, organization_id):
     bss_response = make_req(environment, f"/api/bss/resource/customer/{organization_id}",
                             method="post", headers={"x-operation": "suspendCustomer"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("customer", "organization_id")
+@invalidates("subscriber")
+@invalidates("subscription")
 def unsuspend_org(environment, organization_id):
     bss_response = make_req(environment, f"/api/bss/resource/customer/{organization_id}",
                             method="post", headers={"x-operation": "unsuspendCustomer"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@cached("customer", "organization_id")
+@coalesced("customer", "organization_id")
 def get_org_by_id(environment, organization_id):
     bss_response = make_req(environment, f"/api/bss/resource/customer/{organization_id}")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("customer")
 def get_orgs_by_name(environment, org_name, *, page_number=1, page_size=25):
     bss_response = make_req(environment, f"/api/bss/resource/customer?_namedQuery=getCustomerByOrgName&"
                                          f"orgName={org_name}&_pageNumber={page_number}&_pageSize={page_size}")
@@ -87,6 +313,7 @@ def get_orgs_by_name(environment, org_name, *, page_number=1, page_size=25):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("subscriber")
 def get_subscriber_by_email(env, email):  # todo: re-evaluate this - maybe we expect many results as we are returned a list.
     bss_response = make_req(env, f"/api/bss/resource/subscriber?"
                                  f"_namedQuery=getSubscriberByEmailAddress&emailAddress={email}")
@@ -95,12 +322,15 @@ def get_subscriber_by_email(env, email):  # todo: re-evaluate this - maybe we ex
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
-def get_subscribers_by_org(env, org_id, page_size=100, page_number=1):  # todo: support pagination
+@coalesced("subscriber")
+def get_subscribers_by_org(env, org_id, page_size=100, page_number=1):  # walk every page with utils.pagination.paginate
     bss_response = make_req(env, f"/api/bss/resource/subscriber?_namedQuery=getSubscriberByCustomer&"
                                  f"customer={org_id}&_pageNumber={page_number}&_pageSize={page_size}")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@cached("subscriber", "subscriber_id")
+@coalesced("subscriber", "subscriber_id")
 def get_subscriber_by_id(environment, subscriber_id):
     bss_response = make_req(environment, f"/api/bss/resource/subscriber/{subscriber_id}")
     if bss_response.status_code == 200:
@@ -108,6 +338,7 @@ def get_subscriber_by_id(environment, subscriber_id):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
 def activate_subscriber(env, subscriber_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}", method="post",
                             headers={"x-operation": "activateSubscriber"})
@@ -158,35 +389,42 @@ def create_subscriber(environment, post_body, supress_email="true"):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("subscriber")
 def get_subscribers(env):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
 def delete_subscriber(env, subscriber_id, soft_delete="true"):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}?moveToSoftDelete={soft_delete}",
                             method="delete")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
 def restore_subscriber(env, subscriber_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
                             method="post", headers={"x-operation": "restoreSubscriber"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
 def suspend_subscriber(env, subscriber_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
                             method="post", headers={"x-operation": "suspendSubscriber"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
 def unsuspend_subscriber(env, subscriber_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}",
                             method="post", headers={"x-operation": "unSuspendSubscriber"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
+@invalidates("subscription", "subscription_id")
 def entitle_subscriber(env, subscriber_id, subscription_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}/subscription/{subscription_id}",
                             method="post", headers={"x-operation": "entitleSubscriber"})
@@ -202,6 +440,8 @@ def entitle_subscriber(env, subscriber_id, subscription_id):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscriber", "subscriber_id")
+@invalidates("subscription")
 def revoke_subscriber(env, subscriber_id, seat_id):
     bss_response = make_req(env, f"/api/bss/resource/subscriber/{subscriber_id}/seat/{seat_id}?_force=false",
                             method="post", headers={"x-operation": "revokeSubscriber"})
@@ -216,24 +456,30 @@ def create_subscription(env, body, suppress_email="true"):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscription", "subscription_id")
 def suspend_subscription(env, subscription_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
                             method="post", headers={"x-operation": "suspendSubscription"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscription", "subscription_id")
 def unsuspend_subscription(env, subscription_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
                             method="post", headers={"x-operation": "unsuspendSubscription"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscription", "subscription_id")
 def delete_subscription(environment, subscription_id):
     bss_response = make_req(environment, f"/api/bss/resource/subscription/{subscription_id}",
                             method="delete")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscription", "current_subscription_id")
+@invalidates("subscription", "target_subscription_id")
+@invalidates("subscriber")
 def transfer_subscription_seat(environment, current_subscription_id, seat_id, target_subscription_id):
     bss_response = make_req(environment, f"/api/bss/resource/subscription/{current_subscription_id}/seat/{seat_id}?"
                                          f"targetSubscription={target_subscription_id}",
@@ -241,12 +487,14 @@ def transfer_subscription_seat(environment, current_subscription_id, seat_id, ta
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("subscription", "subscription_id")
 def change_subscription_quota(env, subscription_id, seat_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
                             method="post", headers={"x-operation": "changeQuota"})
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("subscription")
 def get_subscription_list_by_customer_id(env, customer_id, page_number=1, page_size=100):
     bss_response = make_req(env, f"/api/bss/resource/subscription?_namedQuery=getSubscriptionByCustomer&"
                                  f"customerId={customer_id}",
@@ -254,6 +502,8 @@ def get_subscription_list_by_customer_id(env, customer_id, page_number=1, page_s
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@cached("subscription", "subscription_id")
+@coalesced("subscription", "subscription_id")
 def get_subscription_by_subscription_id(env, subscription_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}",
                             method="get")
@@ -262,33 +512,39 @@ def get_subscription_by_subscription_id(env, subscription_id):
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("subscription", "subscription_id")
 def get_seat_details_by_subscription_id(env, subscription_id, seat_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
                             method="get")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@coalesced("subscription", "subscription_id")
 def vendor_get_subscription_list(env, subscription_id, seat_id):
     bss_response = make_req(env, f"/api/bss/resource/subscription/{subscription_id}/seat/{seat_id}",
                             method="get")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@cached("roles", "login_name")
+@coalesced("roles", "login_name")
 def get_role_list(env, login_name):
     bss_response = make_req(env, f"/api/bss/service/authorization/getRoleList?loginName={login_name}",
-                            method="post")
+                            method="post", idempotent=True)
 
     if bss_response.status_code == 200:
         return bss_response.json().get("List")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("roles", "login_name")
 def assign_role(env, login_name, valid_role):
     bss_response = make_req(env, f"/api/bss/service/authorization/assignRole?loginName={login_name}&role={valid_role}",
                             method="post")
     return _http_status_handler(bss_response.status_code, bss_response)
 
 
+@invalidates("roles", "login_name")
 def unassign_role(env, login_name, valid_role):
     bss_response = make_req(env, f"/api/bss/service/authorization/unassignRole?"
                                  f"loginName={login_name}&role={valid_role}",
@@ -314,10 +570,10 @@ def _http_status_handler(given_status_code, bss_response_body):
         _throw_http_400(bss_response_body.json().get('BSSResponse'))
     elif given_status_code == 404:
         _throw_http_404(bss_response_body.json().get('BSSResponse'))
-    elif given_status_code == 500:
-        _throw_http_500(bss_response_body.json().get('BSSResponse'))
-    elif given_status_code == 502:
-        _throw_http_500(bss_response_body.json().get('BSSResponse'))
+    elif given_status_code == 429:
+        _throw_http_429(bss_response_body.headers.get("Retry-After"))
+    elif given_status_code in (500, 502, 503, 504):
+        _throw_http_500(_bss_message(bss_response_body))
     else:
         raise Exception(f"Unexpected exception. Received status {given_status_code}")
 
@@ -330,5 +586,16 @@ def _throw_http_404(bss_message_string: str):
     raise BssResourceNotFound(bss_message_string)
 
 
+def _throw_http_429(retry_after: str):
+    raise BssThrottled(f"Throttled by BSS, retry after {retry_after or 'an unspecified time'}")
+
+
 def _throw_http_500(bss_message_string: str):
     raise BssServerError(bss_message_string)
+
+
+def _bss_message(bss_response_body):
+    try:  # gateways answering 503/504 don't send BSS json
+        return bss_response_body.json().get('BSSResponse')
+    except ValueError:
+        return bss_response_body.text
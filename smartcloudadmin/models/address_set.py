@@ -1,5 +1,5 @@
 from smartcloudadmin.enums import AddressType
-from smartcloudadmin.utils.qol import parse_time
+from smartcloudadmin.utils.qol import parse_time, slots_equal
 import logging
 from smartcloudadmin.config import BssConfig
 
@@ -36,6 +36,8 @@ class AddressSet:
     address_type : enumerate
         Type of Address for record.
    """
+    __slots__ = ("state_code", "postal_code", "city", "modified", "address_line_1", "address_line_2", "state",
+                 "country", "country_code", "address_type")
 
     def __init__(self, *, state_code, postal_code, city, state, country, country_code, address_type, modified,
                  address_line_1="", address_line_2=""):
@@ -52,7 +54,7 @@ class AddressSet:
 
     @classmethod
     def not_provided(cls, *, modified):
-        pass
+        return cls.from_json(modified=modified)
 
     @classmethod
     def from_json(cls, *, modified):
@@ -80,7 +82,9 @@ class AddressSet:
         return f"""{self.address_line_1} , {self.address_line_2} , {self.city} , {self.state} ({self.state_code}) {self.postal_code}. {self.country} ({self.country_code})  {self.modified}"""
 
     def __eq__(self, other):
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, AddressSet):
+            return NotImplemented
+        return slots_equal(self, other, AddressSet.__slots__)
 
     def _dump_details(self):
         return f"""
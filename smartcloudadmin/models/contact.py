@@ -53,6 +53,9 @@ class Contact:
     home_phone : str
         Home phone number to reach Contact.
    """
+    __slots__ = ("family_name", "given_name", "email_address", "ldap_dn", "created", "employee_number", "modified",
+                 "name_prefix", "name_suffix", "deleted", "security_realm", "time_zone", "job_title", "mobile_phone",
+                 "work_phone", "home_phone", "org_name", "org_id")
 
     def __init__(self, *, given_name, family_name, email_address,
                  ldap_dn: str = "", employee_number: str = "", created: datetime="01/01/1970 00:00:00",
@@ -0,0 +1,165 @@
+import smartcloudadmin.http_requests as bss_api
+import smartcloudadmin.enums as bss_enums
+from smartcloudadmin.models.organization import Organization, _contact_from_json, _address_set_from_json
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.models.seat import Seat
+from smartcloudadmin.utils.lazy import LazyField, reset_lazy_fields
+from smartcloudadmin.utils.qol import parse_time
+
+
+def _state(value: str) -> str:
+    return bss_enums.State(value).value
+
+
+def _party_role_type(value: str) -> str:
+    return bss_enums.PartyRollType(value).value
+
+
+def _security_realm(value: str) -> str:
+    return bss_enums.SecurityRealm(value).value
+
+
+def _seat_set(subscriber_json: dict) -> dict:
+    return {seat.get("SubscriptionId"): Seat.from_json(seat) for seat in subscriber_json.get("SeatSet") or ()}
+
+
+def _entitlements(subscriber_json: dict) -> [int]:
+    return [seat.get("SubscriptionId") for seat in subscriber_json.get("SeatSet") or ()]
+
+
+class LazySubscriber(Subscriber):
+    """
+        Subscriber that keeps the BSS JSON it was parsed from and only turns a field into its attribute (parsing
+        timestamps, checking enums, building Seats) the first time the attribute is read. Listings that only read a
+        few attributes of many Subscribers don't pay for the rest.
+
+        Attributes, methods and equality are those of :class:`Subscriber`.
+
+        :example:
+        >>> for subscriber in LazyOrganization.get_basic("NA", 123456).iter_subscribers():
+        >>>     print(subscriber.id, subscriber.email)
+    """
+    __slots__ = ("_json",)
+
+    email = LazyField("Person", "EmailAddress")
+    given_name = LazyField("Person", "GivenName")
+    family_name = LazyField("Person", "FamilyName")
+    id = LazyField("Id")
+    org_name = LazyField("Person", "OrgName")
+    owner = LazyField("Person", "Owner")
+    modified = LazyField("Person", "Modified", convert=parse_time)
+    is_guest = LazyField("IsGuest")
+    created = LazyField("Person", "Created", convert=parse_time)
+    state = LazyField("SubscriberState", convert=_state)
+    party_role_type = LazyField("PartyRoleType", convert=_party_role_type)
+    deleted = LazyField("Person", "Deleted")
+    customer_id = LazyField("CustomerId")
+    seat_set = LazyField(load=_seat_set)
+    entitlements = LazyField(load=_entitlements)
+    role_set = LazyField("Person", "RoleSet")
+    name_prefix = LazyField("Person", "NamePrefix")
+    name_suffix = LazyField("Person", "NameSuffix")
+    security_realm = LazyField("Person", "SecurityRealm", convert=_security_realm)
+    employee_number = LazyField("Person", "EmployeeNumber")
+    invited_by = LazyField("InvitedBy")
+    is_sync_pending = LazyField("IsSyncPending")
+    is_restricted_use = LazyField("Person", "IsRestrictedUse")
+    language_preference = LazyField("Person", "LanguagePreference")
+
+    @classmethod
+    def from_json(cls, environment, json_body) -> 'LazySubscriber':
+        subscriber = cls.__new__(cls)
+        subscriber.environment = environment
+        subscriber._json = json_body
+        return subscriber
+
+    def _get_details_by_id(self, json_body=None) -> None:
+        self._json = json_body or bss_api.get_subscriber_by_id(self.environment, self.id)
+        reset_lazy_fields(self)
+
+
+class LazySubscription(Subscription):
+    """
+        Subscription that keeps the BSS JSON it was parsed from and only turns a field into its attribute the first
+        time the attribute is read.
+
+        Attributes, methods and equality are those of :class:`Subscription`.
+    """
+    __slots__ = ("_json",)
+
+    part_number = LazyField("PartNumber")
+    id = LazyField("Id")
+    part_quantity = LazyField("EntitlementQuantity")
+    customer_id = LazyField("CustomerId")
+    state = LazyField("SubscriptionState")
+    available_numbers_of_seats = LazyField("NumberOfAvailableSeats")
+    modified = LazyField("Modified", convert=parse_time)
+    created = LazyField("Created", convert=parse_time)
+    duration_length = LazyField("DurationLength")
+    duration_unit = LazyField("DurationUnits")
+    entitlement_quantity_available = LazyField("EntitlementQuantityAvailable")
+    max_number_of_seats = LazyField("MaxNumberOfSeats")
+    is_automatically_renewed = LazyField("IsAutomaticallyRenewed")
+    purchase_date = LazyField("PurchaseDate", convert=parse_time)
+    is_trial = LazyField("IsTrial")
+    deleted = LazyField("Deleted")
+    is_beta = LazyField("IsBeta")
+    is_free = LazyField("IsFree")
+    parent_subscription_id = LazyField("ParentSubscriptionId")
+    billing_frequency = LazyField("BillingFrequency")
+    expiration_date = LazyField("ExpirationDate", convert=parse_time)
+    effective_date = LazyField("EffectiveDate", convert=parse_time)
+
+    @classmethod
+    def from_json(cls, environment, json_body) -> 'LazySubscription':
+        subscription = cls.__new__(cls)
+        subscription.environment = environment
+        subscription._json = json_body
+        return subscription
+
+    def _get_details(self, *, json_payload: {} = None) -> None:
+        self._json = json_payload or bss_api.get_subscription_by_subscription_id(self.environment, self.id)
+        reset_lazy_fields(self)
+
+
+class LazyOrganization(Organization):
+    """
+        Organization whose own details are read from the BSS JSON on first use, and whose Subscribers and
+        Subscriptions are :class:`LazySubscriber` and :class:`LazySubscription`.
+
+        Attributes and methods are those of :class:`Organization`.
+
+        :example:
+        >>> my_organization = LazyOrganization.get("NA", 123456)
+        >>> emails = [subscriber.email for subscriber in my_organization.subscribers.values()]
+    """
+    subscriber_model = LazySubscriber
+    subscription_model = LazySubscription
+
+    id = LazyField("Id")
+    owner = LazyField("Organization", "Owner")
+    name = LazyField("Organization", "OrgName")
+    created = LazyField("Organization", "Created", convert=parse_time)
+    modified = LazyField("Organization", "Modified", convert=parse_time)
+    industry = LazyField("Organization", "Industry")
+    state = LazyField("CustomerState", convert=_state)
+    party_type = LazyField("Organization", "PartyType", convert=lambda value: bss_enums.PartyType(value).value)
+    size = LazyField("Organization", "CompanySize")
+    security_realm = LazyField("Organization", "SecurityRealm", convert=_security_realm)
+    vendor_id = LazyField(load=lambda customer: customer.get("CustomerAccountSet", [{}])[0].get("VendorId"))
+    is_guest = LazyField("IsGuest")
+    customer_type = LazyField("Organization", "CustomerType")
+    is_partner = LazyField("Organization", "IsPartner")
+    is_sync_pending = LazyField("Organization", "IsSyncPending")
+    contact = LazyField(load=_contact_from_json)
+    address_set = LazyField(load=_address_set_from_json)
+
+    def _get_details(self, *, component: str = "all", json_body: {} = None, fan_out: int = None) -> None:
+        if component == "all" or component == "organization":
+            self._json = json_body or bss_api.get_org_by_id(self.environment, self.id).get("Customer")
+            reset_lazy_fields(self)
+        if component == "all" or component == "subscriptions":
+            self._retrieve_subscriptions()
+        if component == "all" or component == "subscribers":
+            self._retrieve_subscribers(fan_out=fan_out)
@@ -0,0 +1,161 @@
+import copy
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.utils.single_flight import SingleFlight
+from smartcloudadmin.config import BssConfig
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+
+class _Entry:
+    def __init__(self, organization: Organization) -> None:
+        self.organization: Organization = organization
+        self.loaded: float = time.monotonic()
+        self.refreshing: bool = False
+
+
+class OrganizationCache:
+    """
+        Keeps fully loaded Organizations in memory, keyed by (environment, organization id), and serves them
+        stale-while-revalidate.
+
+        Up to soft_ttl seconds after it was loaded an Organization is returned as is. Past soft_ttl it is still returned
+        straight away while a background thread brings it up to date through :func:`Organization.check_for_updates`.
+        Past hard_ttl (e.g. because refreshes keep failing) the caller waits for a full reload.
+
+        A refresh brings a copy of the cached Organization up to date and swaps it in once it is complete, so an
+        Organization the cache has returned is never changed underneath its caller and a failed refresh leaves the
+        cached copy as it was. Call get again for the refreshed Organization.
+
+        The background refreshes run on a thread pool started by the first refresh. Close the cache once it is no
+        longer needed, or use it as a context manager, so those threads are stopped.
+
+        Attributes
+        ----------
+        soft_ttl : float
+            Seconds after which a cached Organization is refreshed in the background.
+        hard_ttl : float
+            Seconds after which a cached Organization is reloaded before being returned.
+        hits : int
+            Number of Organizations returned from the cache, stale or not.
+        misses : int
+            Number of Organizations that had to be loaded before being returned.
+        refreshes : int
+            Number of background refreshes started.
+
+        :example:
+        >>> with OrganizationCache(soft_ttl=60, hard_ttl=600) as organizations:
+        ...     my_organization = organizations.get("NA", 123456)
+    """
+    def __init__(self, *, soft_ttl: float = 60.0, hard_ttl: float = 600.0, max_refresh_workers: int = 4) -> None:
+        self.soft_ttl: float = soft_ttl
+        self.hard_ttl: float = hard_ttl
+        self.hits: int = 0
+        self.misses: int = 0
+        self.refreshes: int = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()  # callers missing the same Organization share its load
+        self._max_refresh_workers: int = max_refresh_workers
+        self._executor: ThreadPoolExecutor = None  # started by the first refresh, stopped by close
+
+    def __enter__(self) -> 'OrganizationCache':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, environment: str, organization_id: int) -> Organization:
+        """
+            Returns the Organization from the cache, loading it first when it isn't cached or is past hard_ttl.
+
+        :param environment: Datacenter of the Organization, e.g. NA, CE, AP
+        :param organization_id: Organization id
+        :return: Organization
+        """
+        key = (environment, str(organization_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            age = None if entry is None else time.monotonic() - entry.loaded
+            if age is not None and age < self.hard_ttl:
+                self.hits += 1
+                if age >= self.soft_ttl and not entry.refreshing:
+                    entry.refreshing = True
+                    self.refreshes += 1
+                    if self._executor is None:
+                        self._executor = ThreadPoolExecutor(max_workers=self._max_refresh_workers,
+                                                            thread_name_prefix="org-refresh")
+                    self._executor.submit(self._refresh, entry)
+                return entry.organization
+            self.misses += 1
+        return self._loads.do(key, self._load, key, environment, organization_id)
+
+    def invalidate(self, environment: str, organization_id: int) -> None:
+        """
+            Drops an Organization so the next get loads it again, e.g. after changing it outside this process.
+        """
+        with self._lock:
+            self._entries.pop((environment, str(organization_id)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def close(self) -> None:
+        """
+            Stops the background refresh threads once the refreshes in progress are done. A cache used after close
+            starts new ones.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        """
+        :return: {"hits": int, "misses": int, "refreshes": int, "size": int}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "refreshes": self.refreshes, "size": len(self._entries)}
+
+    def _load(self, key, environment: str, organization_id: int) -> Organization:
+        organization = Organization.get(environment, organization_id)
+        with self._lock:
+            self._entries[key] = _Entry(organization)
+        return organization
+
+    def _refresh(self, entry: _Entry) -> None:
+        organization = _working_copy(entry.organization)
+        try:
+            was_updated = organization.check_for_updates(deadline=self.hard_ttl)
+            with self._lock:
+                entry.organization = organization
+                entry.loaded = time.monotonic()
+            logger.info(f"Refreshed org_id {organization.id} on env {organization.environment}, "
+                        f"updated: {was_updated}")
+        except Exception as error:  # keep serving the cached copy, a reload happens once hard_ttl passes
+            logger.warning(f"Refreshing org_id {organization.id} on env {organization.environment} failed: "
+                           f"{error!r}")
+        finally:
+            entry.refreshing = False
+
+
+def _working_copy(organization: Organization) -> Organization:
+    """
+        Copy of a dict backed Organization that can be synced without changing the original. Sync replaces changed
+        records rather than changing them, so the records themselves are shared.
+    """
+    working = copy.copy(organization)
+    working.subscribers = dict(organization.subscribers)
+    working.subscriptions = dict(organization.subscriptions)
+    working.admins = dict(organization.admins)
+    working._index = None
+    working._table = None
+    if organization._sync is not None:
+        working._sync = organization._sync.copy(working)
+    return working
@@ -1,5 +1,5 @@
 from datetime import datetime
-from smartcloudadmin.utils.qol import parse_time
+from smartcloudadmin.utils.qol import parse_time, slots_equal
 import logging
 from smartcloudadmin.config import BssConfig
 
@@ -59,8 +59,12 @@ class Seat:
         update_this
 
    """
+    __slots__ = ("owner", "modified", "terms_of_use_id", "vendor_id", "created", "seat_state", "subscription_id",
+                 "entitlement_quantity_allocated", "version", "provisioning_workflow_id", "subscriber_id",
+                 "seat_service_product_attribute_set", "workflow_id_list", "deleted", "id", "terms_of_user_id",
+                 "has_accepted_terms_of_use")
 
-    def __int__(self):
+    def __init__(self):
         self.owner: int = 0
         self.modified: datetime = parse_time("01/01/1970 00:00:00")
         self.terms_of_use_id: int = 0
@@ -87,10 +91,10 @@ class Seat:
 
     def _get_details_by_id(self, json_body):
         self.owner = json_body.get('Owner', 0)
-        self.modified = parse_time(json_body.get('Modified', parse_time("01/01/1970 00:00:00")))
+        self.modified = parse_time(json_body.get('Modified', "01/01/1970 00:00:00"))
         self.terms_of_use_id = json_body.get('TermsOfUseId', 0)
         self.vendor_id = json_body.get('VendorId', 0)
-        self.created = parse_time(json_body.get('Created', parse_time("01/01/1970 00:00:00")))
+        self.created = parse_time(json_body.get('Created', "01/01/1970 00:00:00"))
         self.seat_state = json_body.get('SeatState', '')  # ASSIGNED
         self.subscription_id = json_body.get('SubscriptionId', 0)
         self.entitlement_quantity_allocated = json_body.get('EntitlementQuantityAllocated', 0)
@@ -103,6 +107,14 @@ class Seat:
         self.id = json_body.get('Id', 0)
         self.has_accepted_terms_of_use = json_body.get('HasAcceptedTermsOfUse', 0)
 
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Seat):
+            return NotImplemented
+        return slots_equal(self, other, Seat.__slots__)
+
+    def __hash__(self) -> int:  # equal Seats share their ids, so Seats stay usable in sets and as dict keys
+        return hash((self.id, self.subscription_id))
+
     def __repr__(self):
         return f"Seat id:{self.id} is part of subscription {self.subscription_id} created {self.created}"
 
@@ -1,10 +1,11 @@
 import smartcloudadmin.http_requests as bss_api
+import smartcloudadmin.aio.http_requests as bss_aio
 
 from smartcloudadmin.models.seat import Seat
 import smartcloudadmin.enums as bss_enums
 from smartcloudadmin.utils.json_constructor import register_subscriber_json, set_one_time_password_json,\
     set_user_password_json, change_password_json
-from smartcloudadmin.utils.qol import parse_time
+from smartcloudadmin.utils.qol import parse_time, slots_equal
 from datetime import datetime
 import logging
 from smartcloudadmin.config import BssConfig
@@ -64,6 +65,11 @@ class Subscriber:
          List of subscription id's to which subscriber has a seat.
     """
 
+    __slots__ = ("environment", "email", "given_name", "family_name", "id", "org_name", "owner", "modified", "is_guest",
+                 "created", "state", "party_role_type", "deleted", "customer_id", "role_set", "name_prefix",
+                 "name_suffix", "security_realm", "employee_number", "seat_set", "entitlements", "invited_by",
+                 "is_sync_pending", "is_restricted_use", "language_preference")
+
     def __init__(self, environment: str, *, customer_id: int = 0, org_name: str = "", owner: str = 0,
                  modified: datetime = "01/01/1970 00:00:00", is_guest: bool = False,
                  created: datetime = "01/01/1970 00:00:00", subscriber_state: str = bss_enums.State.UNSET.value,
@@ -120,13 +126,48 @@ class Subscriber:
         return subscriber
 
     @classmethod
-    def get(cls, environment, *, subscriber_id=None, email_address=None) -> 'Subscriber':
+    def get(cls, environment, *, subscriber_id=None, email_address=None, store=None,
+            max_age: float = None) -> 'Subscriber':
+        """
+        :param environment: Datacenter the subscriber belongs to.
+        :param subscriber_id: Subscriber id, used when both subscriber_id and email_address are given.
+        :param email_address: Subscriber's email address
+        :param store: (Optional) smartcloudadmin.store.LocalStore. A Subscriber retrieved from BSS is saved to it.
+        :param max_age: (Optional) Seconds a Subscriber saved to store is used without asking BSS.
+        :return: Subscriber
+        """
+        if not (subscriber_id or email_address):
+            raise ValueError("Either subscriber id or email address needs to be given as a parameter")
+        if store is not None and max_age is not None:
+            subscriber = store.get_subscriber(environment, subscriber_id=subscriber_id, email_address=email_address,
+                                              max_age=max_age, model=cls)
+            if subscriber is not None:
+                return subscriber
         if subscriber_id:  # if both are set use sub id.
             resp = bss_api.get_subscriber_by_id(environment, subscriber_id)
-            return Subscriber.from_json(environment, resp)
-        elif email_address:
+        else:
             resp = bss_api.get_subscriber_by_email(environment, email_address)
-            return Subscriber.from_json(environment, resp)
+        subscriber = cls.from_json(environment, resp)
+        if store is not None:
+            store.save_subscribers([subscriber])
+        return subscriber
+
+    @classmethod
+    async def aget(cls, environment, *, subscriber_id=None, email_address=None) -> 'Subscriber':
+        """
+        Awaitable version of :func:`get`.
+
+        :param environment: Datacenter the subscriber belongs to.
+        :param subscriber_id: Subscriber id, used when both subscriber_id and email_address are given.
+        :param email_address: Subscriber's email address
+        :return: Subscriber
+        """
+        if subscriber_id:  # if both are set use sub id.
+            resp = await bss_aio.get_subscriber_by_id(environment, subscriber_id)
+            return cls.from_json(environment, resp)
+        elif email_address:
+            resp = await bss_aio.get_subscriber_by_email(environment, email_address)
+            return cls.from_json(environment, resp)
         else:
             raise ValueError("Either subscriber id or email address needs to be given as a parameter")
 
@@ -173,6 +214,23 @@ class Subscriber:
         subscriber._get_details_by_id()
         return subscriber
 
+    @classmethod
+    async def acreate(cls, environment, organization_id, org_name, *, email_address, given_name, family_name,
+                      **kwargs) -> 'Subscriber':
+        """
+        Awaitable version of :func:`create`.
+
+        :return: Subscriber
+        """
+        body = register_subscriber_json(customer_id=organization_id, org_name=org_name, email_address=email_address,
+                                        given_name=given_name, family_name=family_name, **kwargs)
+        resp = await bss_aio.create_subscriber(environment, body)
+
+        subscriber = cls(environment)
+        subscriber.id = resp
+        await subscriber._aget_details_by_id()
+        return subscriber
+
     def get_roles(self) -> [str]:
         """
             The Roles currently held by subscriber.
@@ -184,7 +242,9 @@ class Subscriber:
         return roles
 
     def __eq__(self, other) -> bool:  # mostly for verifying different initialisation classmethods return the same obj
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, Subscriber):
+            return NotImplemented
+        return slots_equal(self, other, Subscriber.__slots__)
 
     def activate(self) -> None:
         """
@@ -299,6 +359,23 @@ class Subscriber:
         # del self.entitlements[subscription_id]
         self._get_details_by_id()
 
+    async def aentitle(self, subscription_id) -> None:
+        """
+            Awaitable version of :func:`entitle`.
+            :param subscription_id: subscription id to entitle user with.
+        """
+        await bss_aio.entitle_subscriber(self.environment, self.id, subscription_id=subscription_id)
+        await self._aget_details_by_id()
+
+    async def arevoke(self, subscription_id) -> None:
+        """
+            Awaitable version of :func:`revoke`.
+            :param subscription_id: subscription id the subscriber's seat is revoked from.
+        """
+        seat = self.seat_set[subscription_id]
+        await bss_aio.revoke_subscriber(self.environment, self.id, seat.id)
+        await self._aget_details_by_id()
+
     # Used for automation and testing - not for production use, unless you want randomly generated users.
     # In that case work away.
     @classmethod
@@ -326,7 +403,9 @@ class Subscriber:
         self.deleted: bool = person_json.get("Deleted")
         self.customer_id: int = json_body.get("CustomerId")
 
-        for seat in json_body.get("SeatSet"):
+        self.seat_set = {}
+        self.entitlements = []
+        for seat in json_body.get("SeatSet") or ():
             self.seat_set[seat.get("SubscriptionId")] = Seat.from_json(seat)
             self.entitlements.append(seat.get("SubscriptionId"))
         self.role_set = person_json.get("RoleSet")
@@ -341,6 +420,10 @@ class Subscriber:
         self.language_preference: str = person_json.get("LanguagePreference")
         self.security_realm: str = person_json.get("SecurityRealm")
 
+    async def _aget_details_by_id(self) -> None:
+        json_body = await bss_aio.get_subscriber_by_id(self.environment, self.id)
+        self._get_details_by_id(json_body=json_body)
+
     def _dump_details(self) -> None:
         print(f"""
         Environment : {self.environment}
@@ -371,7 +454,6 @@ class Subscriber:
         self.modified: datetime = "01/01/1970 00:00:00"
         self.is_guest: bool = False
         self.created: datetime = "01/01/1970 00:00:00"
-        self.subscriber_state: str = bss_enums.State.UNSET.value
         self.party_role_type = None
         self.deleted: datetime = "01/01/1970 00:00:00"
         self.role_set = None
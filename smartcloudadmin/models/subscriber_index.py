@@ -0,0 +1,84 @@
+from typing import Dict, Iterable, Set
+
+from smartcloudadmin.models.subscriber import Subscriber
+
+
+def _add(index: Dict[object, Set[int]], key, subscriber_id: int) -> None:
+    index.setdefault(key, set()).add(subscriber_id)
+
+
+def _discard(index: Dict[object, Set[int]], key, subscriber_id: int) -> None:
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(subscriber_id)
+        if not ids:
+            del index[key]
+
+
+class SubscriberIndex:
+    """
+        Hash indexes over an Organization's Subscribers so looking a Subscriber up by email address, or the Subscribers
+        in a state, holding a role or holding a seat in a Subscription, doesn't scan every Subscriber.
+
+        The index keeps the keys it filed each Subscriber under, so a Subscriber changed in place (entitled, revoked,
+        suspended, refreshed) is moved by calling :func:`add` again.
+
+        Attributes
+        ----------
+        by_email : Dict[str, int]
+            Lower cased email address to Subscriber id.
+        by_state : Dict[str, Set[int]]
+            Subscriber state to the ids of the Subscribers in it.
+        by_role : Dict[str, Set[int]]
+            Role to the ids of the Subscribers holding it.
+        by_subscription : Dict[int, Set[int]]
+            Subscription id to the ids of the Subscribers holding a seat in it.
+    """
+    def __init__(self, subscribers: Iterable[Subscriber] = ()) -> None:
+        self.by_email: Dict[str, int] = {}
+        self.by_state: Dict[str, Set[int]] = {}
+        self.by_role: Dict[str, Set[int]] = {}
+        self.by_subscription: Dict[int, Set[int]] = {}
+        self._keys: Dict[int, tuple] = {}
+        for subscriber in subscribers:
+            self.add(subscriber)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, subscriber_id) -> bool:
+        return subscriber_id in self._keys
+
+    def add(self, subscriber: Subscriber) -> None:
+        """
+            Files the Subscriber under its current email address, state, roles and seats, replacing what it was filed
+            under before.
+        """
+        self.remove(subscriber.id)
+        email = subscriber.email.lower() if subscriber.email else None
+        roles = tuple(subscriber.role_set or ())
+        subscription_ids = tuple(subscriber.seat_set or ())
+        if email is not None:
+            self.by_email[email] = subscriber.id
+        _add(self.by_state, subscriber.state, subscriber.id)
+        for role in roles:
+            _add(self.by_role, role, subscriber.id)
+        for subscription_id in subscription_ids:
+            _add(self.by_subscription, subscription_id, subscriber.id)
+        self._keys[subscriber.id] = (email, subscriber.state, roles, subscription_ids)
+
+    def remove(self, subscriber_id: int) -> None:
+        """
+            Drops the Subscriber from every index, nothing happens when it isn't indexed.
+        """
+        keys = self._keys.pop(subscriber_id, None)
+        if keys is None:
+            return
+        email, state, roles, subscription_ids = keys
+        if email is not None and self.by_email.get(email) == subscriber_id:
+            del self.by_email[email]
+        _discard(self.by_state, state, subscriber_id)
+        for role in roles:
+            _discard(self.by_role, role, subscriber_id)
+        for subscription_id in subscription_ids:
+            _discard(self.by_subscription, subscription_id, subscriber_id)
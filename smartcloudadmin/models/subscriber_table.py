@@ -0,0 +1,303 @@
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, timedelta
+from itertools import compress
+from typing import Callable, Dict, Iterator
+
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.seat import Seat
+from smartcloudadmin.utils.qol import parse_time
+
+_epoch = datetime(1970, 1, 1)
+
+# Subscriber and Seat attributes kept together as one dictionary encoded tuple per row. Most rows share the same values.
+_extra_fields = ("org_name", "owner", "is_guest", "deleted", "name_prefix", "name_suffix", "employee_number",
+                 "invited_by", "is_sync_pending", "is_restricted_use", "language_preference")
+_seat_extra_fields = ("owner", "terms_of_use_id", "vendor_id", "entitlement_quantity_allocated", "version",
+                      "provisioning_workflow_id", "seat_service_product_attribute_set", "workflow_id_list", "deleted",
+                      "terms_of_user_id", "has_accepted_terms_of_use")
+_list_fields = ("seat_service_product_attribute_set", "workflow_id_list")
+
+
+class _Vocabulary:
+    """
+        Dictionary encoding of a column: every distinct value is stored once and rows hold its code.
+    """
+    def __init__(self) -> None:
+        self.values: list = []
+        self._codes: dict = {}
+
+    def code(self, value) -> int:
+        try:
+            return self._codes[value]
+        except KeyError:
+            self._codes[value] = len(self.values)
+        except TypeError:  # unhashable, kept without sharing
+            pass
+        self.values.append(value)
+        return len(self.values) - 1
+
+
+def _seconds(value) -> int:
+    return int((parse_time(value) - _epoch).total_seconds())
+
+
+def _time(seconds: int) -> datetime:
+    return _epoch + timedelta(seconds=seconds)
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
+
+
+class SubscriberTable(MutableMapping):
+    """
+        Column oriented store of an Organization's Subscribers, for organizations too large to hold as Subscriber
+        objects.
+
+        Each attribute is kept as one column: ids and epoch-second created/modified times in arrays of machine
+        integers, emails and names as interned strings, states, realms and party role types as small integer codes
+        and roles as a bitmask. The rarely varying attributes are dictionary encoded together and Seats are kept in
+        columns of their own. The table is a mapping of Subscriber id to Subscriber: reading a row builds a new
+        Subscriber from the columns, so changes made to it are only kept by assigning it back.
+
+        Columns are arrays, so they can be scanned without building Subscribers, e.g. by :func:`count_by` or by
+        wrapping them in numpy.frombuffer. Rows removed or replaced are marked dead in the live column until enough
+        of them have piled up to compact the table.
+
+        Attributes
+        ----------
+        environment : str
+            Datacenter of the Subscribers.
+        columns : {str: array}
+            id, customer_id, email, given_name, family_name, state, security_realm, party_role_type, roles, role_set,
+            created, modified, extras, seat_start and live, one entry per row. seat_start[row]:seat_start[row + 1] are
+            the row's entries in the seat_id, seat_subscription_id, seat_subscriber_id, seat_state, seat_created,
+            seat_modified and seat_extras columns.
+        vocabularies : {str: [object]}
+            Values of the coded columns (state, security_realm, party_role_type, role_set, extras, seat_state,
+            seat_extras) in code order.
+        role_names : [str]
+            Role of each bit of the roles column, lowest bit first.
+
+        :example:
+        >>> my_organization = Organization.get("NA", 123456, columnar=True)
+        >>> my_organization.subscribers.count_by("state")
+        >>> my_organization.subscribers.count_by("created", key=lambda created: created.year)
+    """
+    def __init__(self, environment: str) -> None:
+        self.environment: str = environment
+        self.columns: Dict[str, object] = {
+            "id": array("q"), "customer_id": array("q"), "email": [], "given_name": [], "family_name": [],
+            "state": array("H"), "security_realm": array("H"), "party_role_type": array("H"), "roles": array("Q"),
+            "role_set": array("L"), "created": array("q"), "modified": array("q"), "extras": array("L"),
+            "seat_start": array("L", [0]), "live": array("B"),
+            "seat_id": array("q"), "seat_subscription_id": array("q"), "seat_subscriber_id": array("q"),
+            "seat_state": array("H"), "seat_created": array("q"), "seat_modified": array("q"),
+            "seat_extras": array("L"),
+        }
+        self._vocabularies: Dict[str, _Vocabulary] = {name: _Vocabulary() for name in (
+            "state", "security_realm", "party_role_type", "role_set", "extras", "seat_state", "seat_extras")}
+        self.role_names: [str] = []
+        self._rows: Dict[int, int] = {}  # Subscriber id to live row
+
+    @property
+    def vocabularies(self) -> Dict[str, list]:
+        return {name: vocabulary.values for name, vocabulary in self._vocabularies.items()}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._rows))
+
+    def __contains__(self, subscriber_id) -> bool:
+        return subscriber_id in self._rows
+
+    def __getitem__(self, subscriber_id) -> Subscriber:
+        return self._subscriber(self._rows[subscriber_id])
+
+    def __setitem__(self, subscriber_id, subscriber: Subscriber) -> None:
+        if subscriber_id in self._rows:
+            self._kill(self._rows.pop(subscriber_id))
+        self._rows[subscriber_id] = self._append(subscriber)
+
+    def __delitem__(self, subscriber_id) -> None:
+        self._kill(self._rows.pop(subscriber_id))
+        if len(self.columns["live"]) > 1024 and len(self._rows) * 2 < len(self.columns["live"]):
+            self.compact()
+
+    def add(self, subscriber: Subscriber) -> None:
+        """
+            Adds or replaces a Subscriber.
+        """
+        self[subscriber.id] = subscriber
+
+    def with_role(self, role: str) -> 'RoleView':
+        """
+        :return: Read only mapping of the Subscribers holding role, kept up to date with the table.
+        """
+        return RoleView(self, role)
+
+    def live_rows(self) -> Iterator[int]:
+        """
+        :return: Row numbers of the table's current Subscribers, in the order they were added.
+        """
+        return compress(range(len(self.columns["live"])), self.columns["live"])
+
+    def role_bit(self, role: str) -> int:
+        """
+        :return: Mask of role in the roles column, 0 when no Subscriber in the table holds role.
+        """
+        return 1 << self.role_names.index(role) if role in self.role_names else 0
+
+    def count_by(self, column: str, *, key: Callable = None) -> Dict[object, int]:
+        """
+            Counts the table's Subscribers per value of a column, without building Subscribers.
+
+        :param column: state, security_realm, party_role_type, customer_id, created, modified or role. A Subscriber
+        is counted once for every role it holds.
+        :param key: (Optional) Applied to each value before counting, e.g. lambda created: created.year for a yearly
+        histogram. Applied once per distinct value.
+        :return: {value: count}
+        """
+        live = self.columns["live"]
+        if column == "role":
+            counts = Counter(compress(self.columns["roles"], live))
+            return {role: sum(count for roles, count in counts.items() if roles & 1 << bit)
+                    for bit, role in enumerate(self.role_names)}
+        counts = Counter(compress(self.columns[column], live))
+        if column in self._vocabularies:
+            counts = {self._vocabularies[column].values[code]: count for code, count in counts.items()}
+        elif column in ("created", "modified"):
+            counts = {_time(seconds): count for seconds, count in counts.items()}
+        if key is None:
+            return dict(counts)
+        keyed = Counter()
+        for value, count in counts.items():
+            keyed[key(value)] += count
+        return dict(keyed)
+
+    def compact(self) -> None:
+        """
+            Drops the dead rows left by removed and replaced Subscribers.
+        """
+        subscribers = [self._subscriber(row) for row in self.live_rows()]
+        self.__init__(self.environment)
+        for subscriber in subscribers:
+            self.add(subscriber)
+
+    def _append(self, subscriber: Subscriber) -> int:
+        columns, vocabularies = self.columns, self._vocabularies
+        row = len(columns["live"])
+        roles = 0
+        for role in subscriber.role_set or ():
+            if role not in self.role_names:
+                if len(self.role_names) == 64:
+                    raise ValueError(f"A SubscriberTable can hold at most 64 roles, can't add {role}")
+                self.role_names.append(role)
+            roles |= 1 << self.role_names.index(role)
+        columns["id"].append(subscriber.id)
+        columns["customer_id"].append(subscriber.customer_id or 0)
+        columns["email"].append(_intern(subscriber.email))
+        columns["given_name"].append(_intern(subscriber.given_name))
+        columns["family_name"].append(_intern(subscriber.family_name))
+        columns["state"].append(vocabularies["state"].code(subscriber.state))
+        columns["security_realm"].append(vocabularies["security_realm"].code(subscriber.security_realm))
+        columns["party_role_type"].append(vocabularies["party_role_type"].code(subscriber.party_role_type))
+        columns["roles"].append(roles)
+        columns["role_set"].append(vocabularies["role_set"].code(_hashable(subscriber.role_set)))
+        columns["created"].append(_seconds(subscriber.created))
+        columns["modified"].append(_seconds(subscriber.modified))
+        columns["extras"].append(vocabularies["extras"].code(
+            tuple(_intern(getattr(subscriber, field, None)) for field in _extra_fields)))
+        for seat in subscriber.seat_set.values():
+            columns["seat_id"].append(seat.id)
+            columns["seat_subscription_id"].append(seat.subscription_id)
+            columns["seat_subscriber_id"].append(seat.subscriber_id)
+            columns["seat_state"].append(vocabularies["seat_state"].code(seat.seat_state))
+            columns["seat_created"].append(_seconds(seat.created))
+            columns["seat_modified"].append(_seconds(seat.modified))
+            columns["seat_extras"].append(vocabularies["seat_extras"].code(
+                tuple(_hashable(getattr(seat, field, None)) for field in _seat_extra_fields)))
+        columns["seat_start"].append(len(columns["seat_id"]))
+        columns["live"].append(1)
+        return row
+
+    def _kill(self, row: int) -> None:
+        self.columns["live"][row] = 0
+
+    def _subscriber(self, row: int) -> Subscriber:
+        columns, vocabularies = self.columns, self._vocabularies
+        subscriber = Subscriber.__new__(Subscriber)
+        subscriber.environment = self.environment
+        subscriber.id = columns["id"][row]
+        subscriber.customer_id = columns["customer_id"][row]
+        subscriber.email = columns["email"][row]
+        subscriber.given_name = columns["given_name"][row]
+        subscriber.family_name = columns["family_name"][row]
+        subscriber.state = vocabularies["state"].values[columns["state"][row]]
+        subscriber.security_realm = vocabularies["security_realm"].values[columns["security_realm"][row]]
+        subscriber.party_role_type = vocabularies["party_role_type"].values[columns["party_role_type"][row]]
+        role_set = vocabularies["role_set"].values[columns["role_set"][row]]
+        subscriber.role_set = list(role_set) if isinstance(role_set, tuple) else role_set
+        subscriber.created = _time(columns["created"][row])
+        subscriber.modified = _time(columns["modified"][row])
+        for field, value in zip(_extra_fields, vocabularies["extras"].values[columns["extras"][row]]):
+            setattr(subscriber, field, value)
+        subscriber.seat_set = {}
+        subscriber.entitlements = []
+        for index in range(columns["seat_start"][row], columns["seat_start"][row + 1]):
+            seat = self._seat(index)
+            subscriber.seat_set[seat.subscription_id] = seat
+            subscriber.entitlements.append(seat.subscription_id)
+        return subscriber
+
+    def _seat(self, index: int) -> Seat:
+        columns = self.columns
+        seat = Seat.__new__(Seat)
+        seat.id = columns["seat_id"][index]
+        seat.subscription_id = columns["seat_subscription_id"][index]
+        seat.subscriber_id = columns["seat_subscriber_id"][index]
+        seat.seat_state = self._vocabularies["seat_state"].values[columns["seat_state"][index]]
+        seat.created = _time(columns["seat_created"][index])
+        seat.modified = _time(columns["seat_modified"][index])
+        for field, value in zip(_seat_extra_fields,
+                                self._vocabularies["seat_extras"].values[columns["seat_extras"][index]]):
+            setattr(seat, field, list(value) if field in _list_fields and isinstance(value, tuple) else value)
+        return seat
+
+
+class RoleView(Mapping):
+    """
+        Read only mapping of the Subscribers of a SubscriberTable holding a role, e.g. an Organization's admins.
+    """
+    def __init__(self, table: SubscriberTable, role: str) -> None:
+        self.table: SubscriberTable = table
+        self.role: str = role
+
+    def _ids(self) -> Iterator[int]:
+        bit, columns = self.table.role_bit(self.role), self.table.columns
+        return (columns["id"][row] for row in self.table.live_rows() if columns["roles"][row] & bit)
+
+    def __getitem__(self, subscriber_id) -> Subscriber:
+        subscriber = self.table[subscriber_id]
+        if self.role not in (subscriber.role_set or ()):
+            raise KeyError(subscriber_id)
+        return subscriber
+
+    def __contains__(self, subscriber_id) -> bool:
+        row = self.table._rows.get(subscriber_id)
+        return row is not None and bool(self.table.columns["roles"][row] & self.table.role_bit(self.role))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(list(self._ids()))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self._ids())
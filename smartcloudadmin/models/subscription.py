@@ -1,7 +1,8 @@
 import smartcloudadmin.http_requests as bss_api
+import smartcloudadmin.aio.http_requests as bss_aio
 from smartcloudadmin.utils.json_constructor import register_subscription_json
 from smartcloudadmin.enums import State
-from smartcloudadmin.utils.qol import parse_time
+from smartcloudadmin.utils.qol import parse_time, slots_equal
 from datetime import datetime
 import logging
 from smartcloudadmin.config import BssConfig
@@ -74,6 +75,12 @@ class Subscription:
     expiration_date : :class:`.Datetime`
         Subscription end date
    """
+    __slots__ = ("environment", "part_number", "id", "customer_id", "part_quantity", "state",
+                 "available_numbers_of_seats", "modified", "created", "duration_length", "duration_unit",
+                 "entitlement_quantity_available", "max_number_of_seats", "is_automatically_renewed", "purchase_date",
+                 "is_trial", "deleted", "is_beta", "is_free", "parent_subscription_id", "billing_frequency",
+                 "effective_date", "expiration_date")
+
     def __init__(self, environment: str, customer_id: int=0,  part_number="", id=0, part_quantity=0, state=State.UNSET.value,
                  available_seats=0, modified="01/01/1970 00:00:00", created="01/01/1970 00:00:00", duration_length=0,
                  duration_unit=0, entitlement_quantity_available=0, max_number_of_seats=0,
@@ -132,7 +139,9 @@ class Subscription:
         return self.created.timestamp()
 
     def __eq__(self, other) -> bool:  # mostly for verifying different initialisation classmethods return the same obj
-        return self.__dict__ == other.__dict__
+        if not isinstance(other, Subscription):
+            return NotImplemented
+        return slots_equal(self, other, Subscription.__slots__)
 
     def __repr__(self) -> str:
             return f"{self.part_number} {self.id} {self.state}  {self.available_numbers_of_seats}/{self.max_number_of_seats} {self.modified}"
@@ -179,17 +188,40 @@ class Subscription:
         self.effective_date = parse_time(json_body.get("EffectiveDate"))
 
     @classmethod
-    def get(cls, environment, subscription_id) -> 'Subscription':
+    def get(cls, environment, subscription_id, *, store=None, max_age: float = None) -> 'Subscription':
         """ Populates subscription with an existing subcription details using BSS API
              :param environment: Datacenter Subscription resides on
              :type: str
              :param subscription_id: subscription id to retrieve
              :type: int
+             :param store: (Optional) smartcloudadmin.store.LocalStore. A Subscription retrieved from BSS is saved
+             to it.
+             :param max_age: (Optional) Seconds a Subscription saved to store is used without asking BSS.
              :returns: Subscription
              :rtype: Subscription
          """
+        if store is not None and max_age is not None:
+            subscription = store.get_subscription(environment, subscription_id, max_age=max_age, model=cls)
+            if subscription is not None:
+                return subscription
         resp = bss_api.get_subscription_by_subscription_id(environment, subscription_id)
-        return Subscription.from_json(environment, resp)
+        subscription = cls.from_json(environment, resp)
+        if store is not None:
+            store.save_subscriptions([subscription])
+        return subscription
+
+    @classmethod
+    async def aget(cls, environment, subscription_id) -> 'Subscription':
+        """ Awaitable version of :func:`get`
+             :param environment: Datacenter Subscription resides on
+             :type: str
+             :param subscription_id: subscription id to retrieve
+             :type: int
+             :returns: Subscription
+             :rtype: Subscription
+         """
+        resp = await bss_aio.get_subscription_by_subscription_id(environment, subscription_id)
+        return cls.from_json(environment, resp)
 
     @classmethod
     def create(cls, environment, customer_id, part_number, part_quantity,duration_units, duration_length, **kwargs) -> 'Subscription':
@@ -0,0 +1,415 @@
+import json
+import sqlite3
+import threading
+import time
+import logging
+from datetime import datetime
+from typing import List
+
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.models.seat import Seat
+from smartcloudadmin.models.contact import Contact
+from smartcloudadmin.models.address_set import AddressSet
+from smartcloudadmin.sync import SyncResult
+from smartcloudadmin.enums import AddressType
+from smartcloudadmin.config import BssConfig
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+# Attributes written to the store for each model. Listed explicitly rather than taken from __dict__ so records can be
+# written and read back whatever the model's attribute storage.
+_organization_fields = ("environment", "id", "name", "language_preference", "state", "time_zone",
+                        "payment_method_type", "currency_type", "owner", "created", "modified", "party_type",
+                        "security_realm", "size", "industry", "vendor_id", "is_guest", "customer_type", "is_partner",
+                        "is_sync_pending", "last_sync_date")
+_contact_fields = ("family_name", "given_name", "email_address", "ldap_dn", "created", "employee_number", "modified",
+                   "name_prefix", "name_suffix", "deleted", "security_realm", "time_zone", "job_title",
+                   "mobile_phone", "work_phone", "home_phone", "org_name", "org_id")
+_address_set_fields = ("state_code", "postal_code", "city", "modified", "address_line_1", "address_line_2", "state",
+                       "country", "country_code")
+_subscriber_fields = ("environment", "email", "given_name", "family_name", "id", "org_name", "owner", "modified",
+                      "is_guest", "created", "state", "party_role_type", "deleted", "customer_id", "role_set",
+                      "name_prefix", "name_suffix", "security_realm", "employee_number", "entitlements",
+                      "invited_by", "is_sync_pending", "is_restricted_use", "language_preference")
+_subscription_fields = ("environment", "part_number", "id", "customer_id", "part_quantity", "state",
+                        "available_numbers_of_seats", "modified", "created", "duration_length", "duration_unit",
+                        "entitlement_quantity_available", "max_number_of_seats", "is_automatically_renewed",
+                        "purchase_date", "is_trial", "deleted", "is_beta", "is_free", "parent_subscription_id",
+                        "billing_frequency", "effective_date", "expiration_date")
+_seat_fields = ("owner", "modified", "terms_of_use_id", "vendor_id", "created", "seat_state", "subscription_id",
+                "entitlement_quantity_allocated", "version", "provisioning_workflow_id", "subscriber_id",
+                "seat_service_product_attribute_set", "workflow_id_list", "deleted", "id", "terms_of_user_id",
+                "has_accepted_terms_of_use")
+
+_schema = """
+CREATE TABLE IF NOT EXISTS organizations (
+    environment TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    name TEXT,
+    state TEXT,
+    modified TEXT,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (environment, id)
+);
+CREATE INDEX IF NOT EXISTS organizations_state ON organizations (environment, state);
+CREATE INDEX IF NOT EXISTS organizations_modified ON organizations (environment, modified);
+
+CREATE TABLE IF NOT EXISTS subscribers (
+    environment TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    customer_id INTEGER,
+    email TEXT COLLATE NOCASE,
+    state TEXT,
+    modified TEXT,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (environment, id)
+);
+CREATE INDEX IF NOT EXISTS subscribers_email ON subscribers (environment, email);
+CREATE INDEX IF NOT EXISTS subscribers_customer ON subscribers (environment, customer_id);
+CREATE INDEX IF NOT EXISTS subscribers_state ON subscribers (environment, state);
+CREATE INDEX IF NOT EXISTS subscribers_modified ON subscribers (environment, modified);
+
+CREATE TABLE IF NOT EXISTS subscriptions (
+    environment TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    customer_id INTEGER,
+    part_number TEXT,
+    state TEXT,
+    modified TEXT,
+    stored_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (environment, id)
+);
+CREATE INDEX IF NOT EXISTS subscriptions_customer ON subscriptions (environment, customer_id);
+CREATE INDEX IF NOT EXISTS subscriptions_state ON subscriptions (environment, state);
+CREATE INDEX IF NOT EXISTS subscriptions_modified ON subscriptions (environment, modified);
+
+CREATE TABLE IF NOT EXISTS seats (
+    environment TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    subscriber_id INTEGER,
+    subscription_id INTEGER,
+    customer_id INTEGER,
+    state TEXT,
+    modified TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (environment, id)
+);
+CREATE INDEX IF NOT EXISTS seats_subscriber ON seats (environment, subscriber_id);
+CREATE INDEX IF NOT EXISTS seats_subscription ON seats (environment, subscription_id);
+CREATE INDEX IF NOT EXISTS seats_customer ON seats (environment, customer_id);
+CREATE INDEX IF NOT EXISTS seats_state ON seats (environment, state);
+CREATE INDEX IF NOT EXISTS seats_modified ON seats (environment, modified);
+"""
+
+
+class LocalStore:
+    """
+        Persistent local copy of Organizations, Subscribers, Subscriptions and Seats kept in SQLite.
+
+        Records are indexed on email address, customer id, state and modified time so lookups and audits can run
+        against the store without calling BSS, including after a restart. Model loaders given a store, e.g.
+        Organization.get("NA", 123456, store=store, max_age=600), use records stored less than max_age seconds ago as
+        they are. An older stored Organization is brought up to date with :func:`Organization.sync`, so BSS is only
+        asked for what changed, and older Subscribers and Subscriptions are retrieved again. What is retrieved from
+        BSS is written back to the store.
+
+        A store can be shared between threads.
+
+        :example:
+        >>> store = LocalStore("bss.sqlite")
+        >>> my_organization = Organization.get("NA", 123456, store=store)  # from BSS, then saved
+        >>> my_organization = Organization.get("NA", 123456, store=store)  # from the store, synced with BSS
+        >>> my_organization = Organization.get("NA", 123456, store=store, max_age=600)  # from the store
+        >>> store.find_subscribers("NA", customer_id=123456, state="SUSPENDED")
+    """
+    def __init__(self, path: str = ":memory:") -> None:
+        """
+        :param path: SQLite database file, created when missing. ":memory:" keeps the store in memory only.
+        """
+        self.path: str = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_schema)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    # Writing
+
+    def save_organization(self, organization: Organization) -> None:
+        """
+            Saves an Organization along with its Subscribers, Subscriptions and their Seats. Members stored earlier
+            that the Organization no longer has are removed.
+        """
+        environment, customer_id = organization.environment, organization.id
+        with self._lock, self._connection:
+            self._write_organization(organization)
+            for table in ("subscribers", "subscriptions", "seats"):
+                self._connection.execute(f"DELETE FROM {table} WHERE environment = ? AND customer_id = ?",
+                                         (environment, customer_id))
+            self._write_subscribers(organization.subscribers.values())
+            self._write_subscriptions(organization.subscriptions.values())
+
+    def save_changes(self, organization: Organization, result: SyncResult) -> None:
+        """
+            Saves what a sync of a stored Organization changed: the Organization itself and the Subscribers and
+            Subscriptions it added, changed or removed.
+
+        :param organization: The synced Organization.
+        :param result: The SyncResult of :func:`Organization.sync`.
+        """
+        environment = organization.environment
+        with self._lock, self._connection:
+            self._write_organization(organization)
+            self._write_subscribers(result.added_subscribers + [after for _, after in result.changed_subscribers])
+            self._write_subscriptions(result.added_subscriptions +
+                                      [after for _, after in result.changed_subscriptions])
+            for subscriber in result.removed_subscribers:
+                self._delete_subscriber(environment, subscriber.id)
+            for subscription in result.removed_subscriptions:
+                self._connection.execute("DELETE FROM subscriptions WHERE environment = ? AND id = ?",
+                                         (environment, subscription.id))
+
+    def save_subscribers(self, subscribers: List[Subscriber]) -> None:
+        with self._lock, self._connection:
+            self._write_subscribers(subscribers)
+
+    def save_subscriptions(self, subscriptions: List[Subscription]) -> None:
+        with self._lock, self._connection:
+            self._write_subscriptions(subscriptions)
+
+    def delete_organization(self, environment: str, organization_id: int) -> None:
+        """
+            Removes an Organization and its members from the store.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM organizations WHERE environment = ? AND id = ?",
+                                     (environment, organization_id))
+            for table in ("subscribers", "subscriptions", "seats"):
+                self._connection.execute(f"DELETE FROM {table} WHERE environment = ? AND customer_id = ?",
+                                         (environment, organization_id))
+
+    def delete_subscriber(self, environment: str, subscriber_id: int) -> None:
+        with self._lock, self._connection:
+            self._delete_subscriber(environment, subscriber_id)
+
+    def _delete_subscriber(self, environment: str, subscriber_id: int) -> None:
+        self._connection.execute("DELETE FROM subscribers WHERE environment = ? AND id = ?",
+                                 (environment, subscriber_id))
+        self._connection.execute("DELETE FROM seats WHERE environment = ? AND subscriber_id = ?",
+                                 (environment, subscriber_id))
+
+    def _write_organization(self, organization: Organization) -> None:
+        data = _dump(organization, _organization_fields)
+        data["contact"] = _dump(organization.contact, _contact_fields) if organization.contact else None
+        data["address_set"] = _dump(organization.address_set, _address_set_fields) \
+            if organization.address_set else None
+        self._connection.execute("INSERT OR REPLACE INTO organizations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 (organization.environment, organization.id, organization.name, organization.state,
+                                  _timestamp(organization.modified), time.time(), _encode(data)))
+
+    def _write_subscribers(self, subscribers) -> None:
+        for subscriber in subscribers:
+            environment = subscriber.environment
+            self._connection.execute("INSERT OR REPLACE INTO subscribers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     (environment, subscriber.id, subscriber.customer_id, subscriber.email,
+                                      subscriber.state, _timestamp(subscriber.modified), time.time(),
+                                      _encode(_dump(subscriber, _subscriber_fields))))
+            self._connection.execute("DELETE FROM seats WHERE environment = ? AND subscriber_id = ?",
+                                     (environment, subscriber.id))
+            self._connection.executemany("INSERT OR REPLACE INTO seats VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                         [(environment, seat.id, subscriber.id, seat.subscription_id,
+                                           subscriber.customer_id, seat.seat_state, _timestamp(seat.modified),
+                                           _encode(_dump(seat, _seat_fields)))
+                                          for seat in subscriber.seat_set.values()])
+
+    def _write_subscriptions(self, subscriptions) -> None:
+        self._connection.executemany("INSERT OR REPLACE INTO subscriptions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                     [(subscription.environment, subscription.id, subscription.customer_id,
+                                       subscription.part_number, subscription.state,
+                                       _timestamp(subscription.modified), time.time(),
+                                       _encode(_dump(subscription, _subscription_fields)))
+                                      for subscription in subscriptions])
+
+    # Reading
+
+    def load_organization(self, environment: str, organization_id: int, *, model=Organization,
+                          columnar: bool = False) -> Organization:
+        """
+        :param model: Organization class to build, e.g. LazyOrganization. Its Subscribers and Subscriptions are
+        built as its subscriber_model and subscription_model.
+        :param columnar: Keep the Subscribers in a :class:`SubscriberTable`.
+        :return: The stored Organization with its Subscribers and Subscriptions, None when it isn't stored.
+        """
+        row = self._fetch_one("SELECT data FROM organizations WHERE environment = ? AND id = ?",
+                              (environment, organization_id))
+        if row is None:
+            return None
+        data = _decode(row[0])
+        organization = model(environment)
+        if columnar:
+            organization._use_subscriber_table()
+        contact, address_set = data.pop("contact"), data.pop("address_set")
+        _load(organization, data)
+        organization.contact = _load(Contact.__new__(Contact), contact) if contact else None
+        organization.address_set = _load(AddressSet.__new__(AddressSet), address_set) if address_set else None
+        if organization.address_set is not None:
+            organization.address_set.address_type = AddressType.BILLING  # AddressSet always uses billing
+        for subscriber in self.find_subscribers(environment, customer_id=organization_id,
+                                                model=organization.subscriber_model):
+            organization._add_subscriber(subscriber)
+        for subscription in self.find_subscriptions(environment, customer_id=organization_id,
+                                                    model=organization.subscription_model):
+            organization.subscriptions[subscription.id] = subscription
+        return organization
+
+    def get_subscriber(self, environment: str, *, subscriber_id: int = None, email_address: str = None,
+                       max_age: float = None, model=Subscriber) -> Subscriber:
+        """
+        :param max_age: (Optional) Only a Subscriber stored less than max_age seconds ago.
+        :param model: Subscriber class to build, e.g. LazySubscriber.
+        :return: The stored Subscriber with the given id or email address, None when it isn't stored.
+        """
+        if subscriber_id:
+            subscribers = self.find_subscribers(environment, subscriber_id=subscriber_id, max_age=max_age,
+                                                model=model)
+        else:
+            subscribers = self.find_subscribers(environment, email=email_address, max_age=max_age, model=model)
+        return subscribers[0] if subscribers else None
+
+    def get_subscription(self, environment: str, subscription_id: int, *, max_age: float = None,
+                         model=Subscription) -> Subscription:
+        """
+        :param max_age: (Optional) Only a Subscription stored less than max_age seconds ago.
+        :param model: Subscription class to build, e.g. LazySubscription.
+        :return: The stored Subscription, None when it isn't stored.
+        """
+        subscriptions = self.find_subscriptions(environment, subscription_id=subscription_id, max_age=max_age,
+                                                model=model)
+        return subscriptions[0] if subscriptions else None
+
+    def find_subscribers(self, environment: str, *, subscriber_id: int = None, customer_id: int = None,
+                         email: str = None, state: str = None, modified_since: datetime = None,
+                         max_age: float = None, model=Subscriber) -> List[Subscriber]:
+        """
+            Stored Subscribers matching every given criterion, with their Seats.
+
+        :param email: Email address, compared case insensitively.
+        :param modified_since: Only Subscribers modified at or after this time.
+        :param max_age: Only Subscribers stored less than max_age seconds ago.
+        :param model: Subscriber class to build.
+        """
+        where, parameters = _where(environment, id=subscriber_id, customer_id=customer_id, email=email, state=state,
+                                   modified_since=modified_since, max_age=max_age)
+        with self._lock:  # one query for the Seats of every matching Subscriber
+            rows = self._connection.execute(f"SELECT data FROM subscribers WHERE {where} ORDER BY id",
+                                            parameters).fetchall()
+            seat_rows = self._connection.execute(
+                f"SELECT subscriber_id, data FROM seats WHERE environment = ? AND subscriber_id IN "
+                f"(SELECT id FROM subscribers WHERE {where}) ORDER BY id", [environment] + parameters).fetchall()
+        seat_sets = {}
+        for subscriber_id, data in seat_rows:
+            seat = _load(Seat.__new__(Seat), _decode(data))
+            seat_sets.setdefault(subscriber_id, {})[seat.subscription_id] = seat
+        subscribers = []
+        for (data,) in rows:
+            subscriber = _load(model.__new__(model), _decode(data))
+            subscriber.seat_set = seat_sets.get(subscriber.id, {})
+            subscribers.append(subscriber)
+        return subscribers
+
+    def find_subscriptions(self, environment: str, *, subscription_id: int = None, customer_id: int = None,
+                           state: str = None, part_number: str = None, modified_since: datetime = None,
+                           max_age: float = None, model=Subscription) -> List[Subscription]:
+        """
+            Stored Subscriptions matching every given criterion.
+
+        :param max_age: Only Subscriptions stored less than max_age seconds ago.
+        :param model: Subscription class to build.
+        """
+        rows = self._select("subscriptions", environment, id=subscription_id, customer_id=customer_id, state=state,
+                            part_number=part_number, modified_since=modified_since, max_age=max_age)
+        return [_load(model.__new__(model), _decode(data)) for (data,) in rows]
+
+    def find_seats(self, environment: str, *, subscriber_id: int = None, subscription_id: int = None,
+                   customer_id: int = None, state: str = None, modified_since: datetime = None) -> List[Seat]:
+        """
+            Stored Seats matching every given criterion.
+        """
+        rows = self._select("seats", environment, subscriber_id=subscriber_id, subscription_id=subscription_id,
+                            customer_id=customer_id, state=state, modified_since=modified_since)
+        return [_load(Seat.__new__(Seat), _decode(data)) for (data,) in rows]
+
+    def last_modified(self, environment: str, customer_id: int) -> datetime:
+        """
+        :return: Most recent modified time of the Organization's stored Subscribers, None when none are stored.
+        """
+        row = self._fetch_one("SELECT max(modified) FROM subscribers WHERE environment = ? AND customer_id = ?",
+                              (environment, customer_id))
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+
+    def stored_at(self, environment: str, organization_id: int) -> float:
+        """
+        :return: time.time() the Organization was last saved, None when it isn't stored.
+        """
+        row = self._fetch_one("SELECT stored_at FROM organizations WHERE environment = ? AND id = ?",
+                              (environment, organization_id))
+        return row[0] if row else None
+
+    def _select(self, table: str, environment: str, **criteria) -> list:
+        where, parameters = _where(environment, **criteria)
+        with self._lock:
+            return self._connection.execute(f"SELECT data FROM {table} WHERE {where} ORDER BY id",
+                                            parameters).fetchall()
+
+    def _fetch_one(self, query: str, parameters: tuple):
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()
+
+
+def _dump(model, fields) -> dict:
+    return {field: getattr(model, field, None) for field in fields}
+
+
+def _load(model, data: dict):
+    for field, value in data.items():
+        setattr(model, field, value)
+    return model
+
+
+def _where(environment: str, *, modified_since: datetime = None, max_age: float = None, **criteria) -> (str, list):
+    clauses, parameters = ["environment = ?"], [environment]
+    for column, value in criteria.items():
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            parameters.append(value)
+    if modified_since is not None:
+        clauses.append("modified >= ?")
+        parameters.append(_timestamp(modified_since))
+    if max_age is not None:
+        clauses.append("stored_at > ?")
+        parameters.append(time.time() - max_age)
+    return " AND ".join(clauses), parameters
+
+
+def _timestamp(value) -> str:
+    return value.isoformat(sep=" ") if isinstance(value, datetime) else None
+
+
+def _encode(data: dict) -> str:
+    return json.dumps(data, default=lambda value: {"$datetime": value.isoformat()})
+
+
+def _decode(text: str) -> dict:
+    return json.loads(text, object_hook=lambda value: datetime.fromisoformat(value["$datetime"])
+                      if value.keys() == {"$datetime"} else value)
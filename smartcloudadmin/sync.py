@@ -0,0 +1,239 @@
+import logging
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.utils.pagination import paginate
+from smartcloudadmin.utils.qol import parse_time
+from smartcloudadmin.config import BssConfig
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+config = BssConfig()
+
+
+class SyncResult:
+    """
+        What an incremental sync of an Organization changed.
+
+        Attributes
+        ----------
+        organization_changed : bool
+            The Organization's own details (name, state, ...) changed.
+        contact_changed : bool
+            The Organization's contact changed.
+        address_set_changed : bool
+            The Organization's address set changed.
+        previous_state : str
+            Organization state before the sync.
+        added_subscriptions : [Subscription]
+        changed_subscriptions : [(Subscription, Subscription)]
+            (before, after) pairs.
+        removed_subscriptions : [Subscription]
+        added_subscribers : [Subscriber]
+        changed_subscribers : [(Subscriber, Subscriber)]
+            (before, after) pairs.
+        removed_subscribers : [Subscriber]
+        requests : int
+            Number of requests made to BSS.
+    """
+    def __init__(self) -> None:
+        self.organization_changed: bool = False
+        self.contact_changed: bool = False
+        self.address_set_changed: bool = False
+        self.previous_state: str = None
+        self.added_subscriptions: [Subscription] = []
+        self.changed_subscriptions: [(Subscription, Subscription)] = []
+        self.removed_subscriptions: [Subscription] = []
+        self.added_subscribers: [Subscriber] = []
+        self.changed_subscribers: [(Subscriber, Subscriber)] = []
+        self.removed_subscribers: [Subscriber] = []
+        self.requests: int = 0
+
+    @property
+    def changed(self) -> bool:
+        """
+        :return: Whether anything changed.
+        """
+        return any((self.organization_changed, self.contact_changed, self.address_set_changed,
+                    self.added_subscriptions, self.changed_subscriptions, self.removed_subscriptions,
+                    self.added_subscribers, self.changed_subscribers, self.removed_subscribers))
+
+    def __repr__(self) -> str:
+        return f"SyncResult(organization={self.organization_changed}, contact={self.contact_changed}, " \
+               f"address_set={self.address_set_changed}, subscriptions=+{len(self.added_subscriptions)}" \
+               f"/~{len(self.changed_subscriptions)}/-{len(self.removed_subscriptions)}, " \
+               f"subscribers=+{len(self.added_subscribers)}/~{len(self.changed_subscribers)}" \
+               f"/-{len(self.removed_subscribers)}, requests={self.requests})"
+
+
+class OrganizationSync:
+    """
+        Brings a loaded Organization up to date incrementally.
+
+        A watermark is kept for the Organization, its contact, its address set and every Subscription and Subscriber,
+        made of the record's Modified time and the fields BSS changes without touching it (states, seat counts and
+        seat assignments). Each sync reads the Organization and walks the Subscription and Subscriber lists once, then
+        only turns the records whose watermark moved, or that are new, into model objects and drops the records that
+        are gone. Nothing else is requested, so a sync costs 1 request plus one per page.
+
+        :example:
+        >>> result = my_organization.sync()
+        >>> result.added_subscribers, result.requests
+    """
+    def __init__(self, organization) -> None:
+        """
+        :param organization: A loaded Organization, its current contents are the starting watermarks.
+        """
+        self.organization = organization
+        self.watermarks: dict = {
+            "organization": (organization.modified, organization.state),
+            "contact": getattr(organization.contact, "modified", None),
+            "address_set": getattr(organization.address_set, "modified", None),
+            "subscriptions": {subscription_id: _subscription_watermark(subscription)
+                              for subscription_id, subscription in organization.subscriptions.items()},
+            "subscribers": {subscriber_id: _subscriber_watermark(subscriber)
+                            for subscriber_id, subscriber in organization.subscribers.items()}
+        }
+
+    def copy(self, organization) -> 'OrganizationSync':
+        """
+        :param organization: A copy of this sync's Organization holding the same records.
+        :return: OrganizationSync of the copy, starting from this sync's watermarks.
+        """
+        copied = OrganizationSync.__new__(OrganizationSync)
+        copied.organization = organization
+        copied.watermarks = {name: dict(watermark) if isinstance(watermark, dict) else watermark
+                             for name, watermark in self.watermarks.items()}
+        return copied
+
+    def sync(self, *, subscribers: bool = True) -> SyncResult:
+        """
+            Every list is read before anything is applied, so a sync that fails part way (a timeout, a deadline, a
+            server error on a later page) leaves the Organization and the watermarks as they were and the next sync
+            reports the same changes.
+
+        :param subscribers: Also sync Subscribers. Leaving them out saves walking the Subscriber list.
+        :return: SyncResult
+        """
+        result = SyncResult()
+        organization = self._read_organization(result)
+        subscriptions = self._read_subscriptions(result)
+        staged_subscribers = self._read_subscribers(result) if subscribers else None
+        self._apply_organization(result, *organization)
+        self._apply_subscriptions(result, *subscriptions)
+        if staged_subscribers is not None:
+            self._apply_subscribers(result, *staged_subscribers)
+        logger.info(f"Synced org_id {self.organization.id} on env {self.organization.environment}: {result}")
+        return result
+
+    def _read_organization(self, result: SyncResult) -> tuple:
+        organization = self.organization
+        customer = bss_api.get_org_by_id(organization.environment, organization.id).get("Customer")
+        result.requests += 1
+        result.previous_state = organization.state
+        organization_json = customer.get("Organization")
+        address_sets = organization_json.get("AddressSet") or [{}]
+        watermarks = {"organization": (parse_time(organization_json.get("Modified")), customer.get("CustomerState")),
+                      "contact": parse_time(organization_json.get("Contact").get("Modified")),
+                      "address_set": parse_time(address_sets[0].get("Modified") or organization_json.get("Modified"))}
+        return customer, watermarks
+
+    def _apply_organization(self, result: SyncResult, customer: dict, watermarks: dict) -> None:
+        organization = self.organization
+        result.organization_changed = watermarks["organization"] != self.watermarks["organization"]
+        result.contact_changed = watermarks["contact"] != self.watermarks["contact"]
+        result.address_set_changed = watermarks["address_set"] != self.watermarks["address_set"]
+        if result.organization_changed or result.contact_changed or result.address_set_changed:
+            size = organization.size  # parsing the organization overwrites size with CompanySize
+            organization._get_details(component="organization", json_body=customer)
+            organization.size = size
+            self.watermarks.update(watermarks)
+
+    def _read_subscriptions(self, result: SyncResult) -> tuple:
+        organization = self.organization
+        watermarks = self.watermarks["subscriptions"]
+        seen = set()
+        staged = {}
+        pages = paginate(organization.environment, bss_api.get_subscription_list_by_customer_id, organization.id)
+        for page in pages:
+            for subscription_json in page:
+                subscription_id = subscription_json.get("Id")
+                seen.add(subscription_id)
+                watermark = (parse_time(subscription_json.get("Modified")),
+                             subscription_json.get("SubscriptionState"),
+                             subscription_json.get("NumberOfAvailableSeats"))
+                if watermarks.get(subscription_id) != watermark:
+                    staged[subscription_id] = (organization.subscription_model.from_json(organization.environment,
+                                                                                         subscription_json),
+                                               watermark)
+        result.requests += pages.requests
+        return staged, seen
+
+    def _apply_subscriptions(self, result: SyncResult, staged: dict, seen: set) -> None:
+        organization = self.organization
+        watermarks = self.watermarks["subscriptions"]
+        for subscription_id, (subscription, watermark) in staged.items():
+            previous = organization.subscriptions.get(subscription_id)
+            if previous is None:
+                result.added_subscriptions.append(subscription)
+            else:
+                result.changed_subscriptions.append((previous, subscription))
+            organization.subscriptions[subscription_id] = subscription
+            watermarks[subscription_id] = watermark
+        for subscription_id in set(watermarks) - seen:
+            del watermarks[subscription_id]
+            result.removed_subscriptions.append(organization.subscriptions.pop(subscription_id))
+
+    def _read_subscribers(self, result: SyncResult) -> tuple:
+        organization = self.organization
+        watermarks = self.watermarks["subscribers"]
+        seen = set()
+        staged = {}
+        fan_out = config.get_pagination_settings(organization.environment).get("fan_out")
+        pages = paginate(organization.environment, bss_api.get_subscribers_by_org, organization.id, fan_out=fan_out)
+        for page in pages:
+            for subscriber_json in page:
+                subscriber_id = subscriber_json.get("Id")
+                seen.add(subscriber_id)
+                person = subscriber_json.get("Person")
+                watermark = (parse_time(person.get("Modified")), subscriber_json.get("SubscriberState"),
+                             tuple(sorted((seat.get("Id"), parse_time(seat.get("Modified")))
+                                          for seat in subscriber_json.get("SeatSet") or ())))
+                if watermarks.get(subscriber_id) != watermark:
+                    staged[subscriber_id] = (organization.subscriber_model.from_json(organization.environment,
+                                                                                     subscriber_json),
+                                             watermark)
+        result.requests += pages.requests
+        return staged, seen
+
+    def _apply_subscribers(self, result: SyncResult, staged: dict, seen: set) -> None:
+        organization = self.organization
+        watermarks = self.watermarks["subscribers"]
+        for subscriber_id, (subscriber, watermark) in staged.items():
+            previous = organization._remove_subscriber(subscriber_id)
+            organization._add_subscriber(subscriber)
+            watermarks[subscriber_id] = watermark
+            if subscriber_id not in organization.subscribers:  # neither a User nor an admin, not held
+                if previous is not None:
+                    result.removed_subscribers.append(previous)
+            elif previous is None:
+                result.added_subscribers.append(subscriber)
+            else:
+                result.changed_subscribers.append((previous, subscriber))
+        for subscriber_id in set(watermarks) - seen:
+            del watermarks[subscriber_id]
+            removed = organization._remove_subscriber(subscriber_id)
+            if removed is not None:
+                result.removed_subscribers.append(removed)
+        organization.size = len(seen)
+
+
+def _subscription_watermark(subscription: Subscription) -> tuple:
+    return subscription.modified, subscription.state, subscription.available_numbers_of_seats
+
+
+def _subscriber_watermark(subscriber: Subscriber) -> tuple:
+    return subscriber.modified, subscriber.state, tuple(sorted((seat.id, seat.modified)
+                                                               for seat in subscriber.seat_set.values()))
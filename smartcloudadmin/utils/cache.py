@@ -0,0 +1,240 @@
+import copy
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.utils.single_flight import flights, async_flights
+
+config = BssConfig()
+
+
+class ResponseCache:
+    """
+        In-memory cache of read-only BSS endpoint responses with per-endpoint time to live and least recently used
+        eviction.
+
+        Entries are tagged with the resource they describe, e.g. ("NA", "subscriber", "123"), so that a call changing
+        that resource drops every cached response about it. Responses are copied in and out so callers can't change
+        what is cached.
+
+        A read that started before a change to its resource can finish after the change has been invalidated. Reads
+        take the resource's generation with :func:`begin_read` before calling BSS, invalidating bumps it, and
+        :func:`put` doesn't store a response read under an older generation.
+
+        Attributes
+        ----------
+        max_size : int
+            Maximum number of cached responses, the least recently used one is evicted when full.
+        ttl : float
+            Seconds a response stays cached.
+        ttls : {str: float}
+            Per-endpoint overrides of ttl, keyed by endpoint name, e.g. {"get_role_list": 300}.
+        hits : int
+            Number of responses served from the cache.
+        misses : int
+            Number of lookups that had to call BSS.
+        evictions : int
+            Number of responses dropped to make room.
+    """
+    def __init__(self, *, max_size: int = 1024, ttl: float = 60.0, ttls: {str: float} = None) -> None:
+        self.max_size: int = max_size
+        self.ttl: float = ttl
+        self.ttls: {str: float} = dict(ttls or {})
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries = OrderedDict()  # key -> (expires, resource, response)
+        self._keys_by_resource = {}  # resource -> {key}
+        self._generations = {}  # resource -> [generation, reads in flight], only while reads are in flight
+        self._kind_generations = {}  # (environment, kind) -> generation
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        :param key: (environment, endpoint name, arguments)
+        :return: (True, cached response) or (False, None) when not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, copy.deepcopy(entry[2])
+
+    def begin_read(self, resource) -> tuple:
+        """
+            Registers a read of a resource about to be sent to BSS, to be ended with :func:`end_read`.
+
+        :param resource: (environment, resource kind, resource id)
+        :return: The resource's generation, to be passed to :func:`put`.
+        """
+        with self._lock:
+            self._generations.setdefault(resource, [0, 0])[1] += 1
+            return self._generation(resource)
+
+    def end_read(self, resource) -> None:
+        with self._lock:
+            state = self._generations[resource]
+            state[1] -= 1
+            if not state[1]:
+                del self._generations[resource]
+
+    def put(self, key, resource, response, *, generation: tuple = None) -> None:
+        """
+        :param key: (environment, endpoint name, arguments)
+        :param resource: (environment, resource kind, resource id) the response describes.
+        :param response: Parsed endpoint response.
+        :param generation: (Optional) Generation from :func:`begin_read`. The response isn't stored when the resource
+        has been invalidated since.
+        """
+        expires = time.monotonic() + self.ttls.get(key[1], self.ttl)
+        response = copy.deepcopy(response)
+        with self._lock:
+            if generation is not None and generation != self._generation(resource):
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires, resource, response)
+            self._keys_by_resource.setdefault(resource, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, environment: str, kind: str, resource_id=None) -> None:
+        """
+            Drops the cached responses about a resource, or about every resource of a kind when resource_id is None.
+        """
+        with self._lock:
+            if resource_id is not None:
+                resources = [(environment, kind, str(resource_id))]
+                if resources[0] in self._generations:
+                    self._generations[resources[0]][0] += 1
+            else:
+                resources = [resource for resource in self._keys_by_resource if resource[:2] == (environment, kind)]
+                self._kind_generations[environment, kind] = self._kind_generations.get((environment, kind), 0) + 1
+            for resource in resources:
+                for key in list(self._keys_by_resource.get(resource, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_resource.clear()
+
+    def stats(self) -> dict:
+        """
+        :return: {"hits": int, "misses": int, "evictions": int, "size": int}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._entries)}
+
+    def _generation(self, resource) -> tuple:
+        state = self._generations.get(resource)
+        return self._kind_generations.get(resource[:2], 0), state[0] if state else 0
+
+    def _remove(self, key) -> None:
+        _, resource, _ = self._entries.pop(key)
+        keys = self._keys_by_resource.get(resource)
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_resource[resource]
+
+
+def cached(kind: str, id_param: str):
+    """
+        Caches a read-only endpoint's responses in the datacenter's ResponseCache, when it has one.
+
+    :param kind: Kind of resource the endpoint reads, e.g. customer, subscriber, subscription or roles.
+    :param id_param: Name of the endpoint parameter holding the resource id.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        def lookup(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            environment, *arguments = bound.arguments.values()
+            resource = (environment, kind, str(bound.arguments[id_param]))
+            key = (environment, endpoint.__name__, tuple(str(argument) for argument in arguments))
+            return config.get_response_cache(environment), key, resource
+
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                cache, key, resource = lookup(args, kwargs)
+                if cache is None:
+                    return await endpoint(*args, **kwargs)
+                found, response = cache.get(key)
+                if not found:
+                    generation = cache.begin_read(resource)
+                    try:
+                        response = await endpoint(*args, **kwargs)
+                        cache.put(key, resource, response, generation=generation)
+                    finally:
+                        cache.end_read(resource)
+                return response
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                cache, key, resource = lookup(args, kwargs)
+                if cache is None:
+                    return endpoint(*args, **kwargs)
+                found, response = cache.get(key)
+                if not found:
+                    generation = cache.begin_read(resource)
+                    try:
+                        response = endpoint(*args, **kwargs)
+                        cache.put(key, resource, response, generation=generation)
+                    finally:
+                        cache.end_read(resource)
+                return response
+        return wrapper
+    return decorator
+
+
+def invalidates(kind: str, id_param: str = None):
+    """
+        Drops cached responses about the resource an endpoint changes once the endpoint returns or raises (a failed
+        call may still have changed the resource), and detaches the reads of it in flight so later reads don't join
+        one that started before the change.
+
+    :param kind: Kind of resource the endpoint changes, e.g. customer, subscriber, subscription or roles.
+    :param id_param: Name of the endpoint parameter holding the resource id, None when every resource of the kind
+    may have changed.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        def invalidate(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            environment = next(iter(bound.arguments.values()))
+            resource_id = bound.arguments.get(id_param) if id_param else None
+            flights.detach(environment, kind, resource_id)
+            async_flights.detach(environment, kind, resource_id)
+            cache = config.get_response_cache(environment)
+            if cache is not None:
+                cache.invalidate(environment, kind, resource_id)
+
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                try:
+                    return await endpoint(*args, **kwargs)
+                finally:
+                    invalidate(args, kwargs)
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                try:
+                    return endpoint(*args, **kwargs)
+                finally:
+                    invalidate(args, kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,131 @@
+import threading
+import time
+import logging
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssCircuitOpen
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+config = BssConfig()
+
+# One breaker per datacenter. Keyed by environment name, the datacenter settings dict is kept alongside the breaker
+# so re-registering a datacenter gets a fresh, closed breaker.
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+# Responses that show the datacenter itself failing. BSS also answers business errors (e.g. suspending an already
+# suspended Organization) with a 500, so a 500 only counts for requests that read data, see is_failure.
+_failure_statuses = (502, 503, 504)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+        Stops requests to a datacenter that keeps failing.
+
+        closed: requests are sent. After failure_threshold consecutive failures (connection errors, timeouts,
+        502, 503 and 504 responses, and 500 responses to requests that only read data) the breaker opens. Other
+        errors say nothing about the datacenter's health and aren't counted.
+        open: requests fail straight away with BssCircuitOpen. After cooldown seconds the breaker goes half open.
+        half_open: a single trial request is let through. Success closes the breaker, failure opens it again for
+        another cooldown.
+
+        Attributes
+        ----------
+        failure_threshold : int
+            Consecutive failures that open the breaker. 0 disables the breaker.
+        cooldown : float
+            Seconds the breaker stays open before a trial request is let through.
+        state : str
+            closed, open or half_open.
+    """
+    def __init__(self, name: str, failure_threshold: int = 5, cooldown: float = 30.0) -> None:
+        self.name: str = name
+        self.failure_threshold: int = failure_threshold
+        self.cooldown: float = cooldown
+        self.state: str = CLOSED
+        self.failures: int = 0
+        self._opened_at: float = 0.0
+        self._trial_started: float = None
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """
+            Lets a request through or fails it fast.
+
+        :raises BssCircuitOpen: The datacenter is failing and the cooldown hasn't passed, or a trial request is
+        already in flight.
+        """
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.cooldown:
+                    raise BssCircuitOpen(f"Circuit for {self.name} is open, retry in "
+                                         f"{self.cooldown - (now - self._opened_at):.1f}s")
+                self.state = HALF_OPEN
+                self._trial_started = None
+            if self.state == HALF_OPEN:
+                # a trial that never reported back (e.g. cancelled) doesn't hold the breaker half open forever
+                if self._trial_started is not None and now - self._trial_started < self.cooldown:
+                    raise BssCircuitOpen(f"Circuit for {self.name} is half open, waiting on a trial request")
+                self._trial_started = now
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_started = None
+
+    def release(self) -> None:
+        """
+            Ends a request whose outcome isn't counted either way, see :func:`is_failure`. A half open breaker lets
+            the next trial request through.
+        """
+        with self._lock:
+            self._trial_started = None
+
+    def record_failure(self) -> None:
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.failure_threshold):
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} consecutive failures")
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._trial_started = None
+
+
+def is_failure(status_code: int, idempotent: bool) -> bool:
+    """
+    :param status_code: Status of a response that isn't a throttling response.
+    :param idempotent: Whether the request only reads data.
+    :return: Whether the response counts as a failure of the datacenter.
+    """
+    return status_code in _failure_statuses or (status_code == 500 and idempotent)
+
+
+def get_breaker(environment) -> CircuitBreaker:
+    """
+        Returns the circuit breaker for a datacenter, creating it from the datacenter's settings on first use.
+
+    :param environment: Datacenter name as registered with BssConfig.add_datacenter
+    :return: CircuitBreaker
+    """
+    datacenter = config.datacenters.get(environment)
+    with _breakers_lock:
+        breaker_datacenter, breaker = _breakers.get(environment, (None, None))
+        if breaker is None or breaker_datacenter is not datacenter:
+            settings = config.get_circuit_breaker_settings(environment)
+            breaker = CircuitBreaker(environment, settings.get("failure_threshold"), settings.get("cooldown"))
+            _breakers[environment] = (datacenter, breaker)
+        return breaker
@@ -0,0 +1,72 @@
+import contextlib
+import contextvars
+import time
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssDeadlineExceeded
+
+config = BssConfig()
+
+# time.monotonic() by which the current operation has to finish, None when there is no deadline. A context variable
+# so that concurrent operations, threads started with a copied context and asyncio tasks each see their own.
+_deadline = contextvars.ContextVar("bss_deadline", default=None)
+
+
+@contextlib.contextmanager
+def within(seconds: float = None):
+    """
+        Bounds every BSS request made inside the block to finish within seconds from now. Nested blocks can only
+        shorten the deadline.
+
+    :param seconds: Time budget for the block, None leaves the current deadline (if any) in place.
+
+    :example:
+    >>> with within(30):
+    ...     org = Organization.get("NA", 123456)
+    """
+    if seconds is None:
+        yield
+        return
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float:
+    """
+    :return: Seconds left before the current deadline, None when there is no deadline.
+    """
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def clamp(seconds: float) -> float:
+    """
+    :param seconds: A wait, e.g. a retry backoff delay.
+    :return: The wait cut short to the time left before the current deadline.
+    """
+    left = remaining()
+    return seconds if left is None else max(min(seconds, left), 0.0)
+
+
+def request_timeout(environment) -> (float, float):
+    """
+        Connect and read timeouts for the next request to a datacenter: the datacenter's timeouts, cut short to the
+        time left before the current deadline.
+
+    :param environment: Datacenter name
+    :return: (connect timeout, read timeout)
+    :raises BssDeadlineExceeded: The current deadline has passed.
+    """
+    settings = config.get_timeout_settings(environment)
+    connect, read = settings.get("connect"), settings.get("read")
+    left = remaining()
+    if left is None:
+        return connect, read
+    if left <= 0:
+        raise BssDeadlineExceeded(f"Deadline exceeded by {-left:.1f}s")
+    return min(connect or left, left), min(read or left, left)
@@ -0,0 +1,78 @@
+from types import MemberDescriptorType
+from typing import Callable
+
+
+class LazyField:
+    """
+        Model attribute computed from the instance's raw BSS JSON, held in its _json attribute, the first time it is
+        read. The value is then kept, in the slot of the same name a base class declares or else in the instance's
+        __dict__, and assigning to the attribute works as it does for a plain attribute.
+
+        :example:
+        >>> class LazySubscriber(Subscriber):
+        >>>     __slots__ = ("_json",)
+        >>>     email = LazyField("Person", "EmailAddress")
+        >>>     modified = LazyField("Person", "Modified", convert=parse_time)
+    """
+    def __init__(self, *path: str, convert: Callable = None, load: Callable = None) -> None:
+        """
+        :param path: Keys leading to the value in the JSON, a missing key gives None.
+        :param convert: (Optional) Applied to the value found at path, e.g. parse_time.
+        :param load: (Optional) Computes the value from the whole JSON instead of following path.
+        """
+        self.path = path
+        self.convert: Callable = convert
+        self.load: Callable = load
+        self.name: str = None
+        self.slot: MemberDescriptorType = None
+
+    def __set_name__(self, owner, name: str) -> None:
+        self.name = name
+        for base in owner.__mro__[1:]:
+            if isinstance(vars(base).get(name), MemberDescriptorType):
+                self.slot = vars(base)[name]
+                break
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner) if self.slot else instance.__dict__[self.name]
+        except (AttributeError, KeyError):
+            pass
+        value = self._compute(instance._json)
+        self.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value) -> None:
+        if self.slot:
+            self.slot.__set__(instance, value)
+        else:
+            instance.__dict__[self.name] = value
+
+    def reset(self, instance) -> None:
+        """
+            Forgets the kept value so the next read computes it again.
+        """
+        try:
+            self.slot.__delete__(instance) if self.slot else instance.__dict__.pop(self.name)
+        except (AttributeError, KeyError):
+            pass
+
+    def _compute(self, json_body: dict):
+        if self.load:
+            return self.load(json_body)
+        value = json_body
+        for key in self.path:
+            value = value.get(key) if value else None
+        return self.convert(value) if self.convert else value
+
+
+def reset_lazy_fields(instance) -> None:
+    """
+        Forgets every LazyField value kept on instance, e.g. after its _json has been replaced.
+    """
+    for cls in type(instance).__mro__:
+        for field in vars(cls).values():
+            if isinstance(field, LazyField):
+                field.reset(instance)
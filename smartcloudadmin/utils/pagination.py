@@ -0,0 +1,402 @@
+import asyncio
+import contextvars
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import logging
+
+import requests
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssServerError, BSSBadData
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency - pip install smartcloudadmin[aio]
+    aiohttp = None
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+config = BssConfig()
+
+# Errors after which an adaptive page walk retries the page at a smaller size.
+_shrinkable_errors = (BssServerError, BSSBadData, requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                      asyncio.TimeoutError) + ((aiohttp.ClientError,) if aiohttp else ())
+
+# Response keys BSS may use to report the total number of results of a paged query.
+_total_keys = ("TotalResults", "TotalCount", "Total")
+
+# (page size, max page size) that last worked for a datacenter and query, so the next walk can start there.
+_learned_page_sizes = {}
+_learned_page_sizes_lock = threading.Lock()
+
+
+class PageSizer:
+    """
+        Keeps track of the page size and position of a paged BSS query.
+
+        BSS pages are addressed by number, so the page size can only change when the number of results read so far
+        is a multiple of the new size. Adaptive sizes are always the configured page size doubled some number of
+        times which keeps growing and shrinking aligned.
+
+        A server may silently cap the page size, answering a bigger page with fewer results than asked for. A short
+        page is only taken as the end of the results at a size the server has returned a full page at, see
+        :func:`capped`. A size is remembered for later walks once a full page has come back at it, and a cap once
+        results were found past the short page.
+
+        Attributes
+        ----------
+        page_size : int
+            Page size to use for the next request.
+        offset : int
+            Number of results read so far.
+        adaptive : bool
+            Whether the page size grows and shrinks during the walk.
+        honoured_page_size : int
+            Largest page size the server has returned a full page at, the configured page size (or the remembered
+            size the walk started at) until then.
+    """
+    def __init__(self, page_size: int, *, adaptive: bool = False, max_page_size: int = 1000,
+                 start_page_size: int = None, learned_key=None) -> None:
+        self.base_page_size: int = page_size
+        self.page_size: int = start_page_size or page_size
+        self.max_page_size: int = max(max_page_size, self.page_size)
+        self.adaptive: bool = adaptive
+        self.honoured_page_size: int = self.page_size
+        self.offset: int = 0
+        self.page_number: int = 1
+        self._learned_key = learned_key
+        self._remembered_max_page_size: int = self.max_page_size
+        self._suspected_cap = None  # (offset the short page ended at, page size within the cap)
+
+    def advance(self, result_count: int) -> None:
+        """
+            Records a received page and grows the page size when adaptive.
+
+        :param result_count: Number of results in the page.
+        """
+        self.offset += result_count
+        self.page_number += 1
+        if self._suspected_cap is not None and self.offset > self._suspected_cap[0]:  # the short page wasn't the end
+            self._remembered_max_page_size = self._suspected_cap[1]
+            self._suspected_cap = None
+            self._remember()
+        if not self.adaptive or result_count < self.page_size:
+            return
+        if self.page_size > self.honoured_page_size:
+            self.honoured_page_size = self.page_size
+            self._remember()
+        grown_page_size = self.page_size * 2
+        if grown_page_size <= self.max_page_size and self.offset % grown_page_size == 0:
+            self._resize(grown_page_size)
+
+    def capped(self, result_count: int) -> bool:
+        """
+            Checks a short page received at a size the server hasn't returned a full page at yet. The page may have
+            been cut short by a server side cap rather than by the end of the results, and it isn't known which
+            results a capping server put in it, so it is requested again at the largest honoured size within its
+            result count. That size is the walk's max_page_size from then on.
+
+        :param result_count: Number of results in the page.
+        :return: True if the page should be discarded and requested again at the new size.
+        """
+        if not self.adaptive or result_count >= self.page_size or self.page_size <= self.honoured_page_size:
+            return False
+        page_size = self.honoured_page_size
+        while page_size * 2 <= result_count:
+            page_size *= 2
+        logger.info(f"Page of {result_count} results at page size {self.page_size} may be capped by the server, "
+                    f"retrying with page size {page_size}")
+        self._suspected_cap = (self.offset + result_count, page_size)
+        self.max_page_size = page_size
+        self._resize(page_size)
+        return True
+
+    def shrink(self, error: Exception) -> bool:
+        """
+            Halves the page size after a failed page request.
+
+        :param error: The exception raised by the page request.
+        :return: True if the page should be retried at the new size, False if the error should be raised.
+        """
+        if not self.adaptive or self.page_size <= self.base_page_size:
+            return False
+        self.max_page_size = self.page_size // 2  # the server wouldn't take anything bigger during this walk
+        self._resize(self.page_size // 2)
+        self.honoured_page_size = min(self.honoured_page_size, self.page_size)
+        self._remembered_max_page_size = self.max_page_size
+        self._remember()
+        logger.info(f"Page request failed with {type(error).__name__}, retrying with page size {self.page_size}")
+        return True
+
+    def _resize(self, page_size: int) -> None:
+        self.page_size = page_size
+        self.page_number = self.offset // page_size + 1
+
+    def _remember(self) -> None:
+        if self._learned_key is not None:
+            with _learned_page_sizes_lock:
+                _learned_page_sizes[self._learned_key] = (self.honoured_page_size,
+                                                           self._remembered_max_page_size)
+
+
+def page_sizer(environment: str, query: str, *, page_size: int = None) -> PageSizer:
+    """
+        Creates a PageSizer from the datacenter's pagination settings.
+
+    :param environment: Datacenter name
+    :param query: Name of the paged query, used to remember adaptive page sizes between walks.
+    :param page_size: (Optional) Fixed page size overriding the datacenter's page size and adaptive settings.
+    :return: PageSizer
+    """
+    if page_size:
+        return PageSizer(page_size)
+    settings = config.get_pagination_settings(environment)
+    learned_key = (environment, query)
+    start_page_size, max_page_size = None, settings.get("max_page_size")
+    if settings.get("adaptive"):
+        with _learned_page_sizes_lock:
+            start_page_size, max_page_size = _learned_page_sizes.get(learned_key, (None, max_page_size))
+    return PageSizer(settings.get("page_size"), adaptive=settings.get("adaptive"), max_page_size=max_page_size,
+                     start_page_size=start_page_size, learned_key=learned_key)
+
+
+class Pages:
+    """
+        Iterates over the pages of a paged BSS query, yielding each page's result list in page order.
+
+        The walk ends on the first page holding fewer results than were asked for, on an empty page, or once the
+        total result count is reached when the response carries one. With an adaptive PageSizer a short page at a
+        size the server hasn't honoured yet is requested again at a smaller size instead, see
+        :func:`PageSizer.capped`. Pages can be iterated with ``for`` for blocking
+        endpoints or ``async for`` when fetch_page returns a coroutine.
+
+        With prefetch set, pages are requested by a background thread (or task when iterated with ``async for``)
+        while the pages already received are being turned into model objects. Up to prefetch pages are held ready.
+
+        Attributes
+        ----------
+        requests : int
+            Number of page requests made so far.
+        result_count : int
+            Number of results yielded so far.
+        total : int
+            Total result count reported by BSS, None if the responses don't carry one.
+    """
+    def __init__(self, fetch_page, sizer: PageSizer, *, result_key: str = "List", fan_out: int = 1,
+                 prefetch: int = 0) -> None:
+        """
+        :param fetch_page: callable taking a page number and page size and returning the BSS json response.
+        :param sizer: PageSizer tracking the page size and position.
+        :param result_key: key of the result list in the json response, None when the response is the list itself.
+        :param fan_out: Number of page requests kept in flight. Greater than 1 fetches pages ahead through a thread
+        pool at a fixed page size.
+        :param prefetch: Number of pages requested ahead of the one being processed. Ignored when fan_out is
+        greater than 1.
+        """
+        self.fetch_page = fetch_page
+        self.sizer: PageSizer = sizer
+        self.result_key: str = result_key
+        self.fan_out: int = fan_out
+        self.prefetch: int = prefetch
+        self.requests: int = 0
+        self.result_count: int = 0
+        self.total: int = None
+        self._lock = threading.Lock()
+
+    def _fetch(self, page_number: int, page_size: int):
+        with self._lock:
+            self.requests += 1
+        return self.fetch_page(page_number, page_size)
+
+    def _results(self, resp) -> list:
+        if self.result_key is None:
+            return resp or []
+        if self.total is None:
+            for total_key in _total_keys:
+                if resp.get(total_key) is not None:
+                    self.total = int(resp.get(total_key))
+                    break
+        return resp.get(self.result_key) or []
+
+    def _capped(self, page: list) -> bool:
+        if self.total is not None and self.result_count + len(page) >= self.total:
+            return False
+        return self.sizer.capped(len(page))
+
+    def _is_last(self, page: list, page_size: int) -> bool:
+        self.result_count += len(page)
+        return len(page) < page_size or (self.total is not None and self.result_count >= self.total)
+
+    def __iter__(self):
+        if self.fan_out > 1:
+            return self._iter_concurrently()
+        if self.prefetch > 0:
+            return self._iter_prefetching()
+        return self._iter_sequentially()
+
+    def _iter_sequentially(self):
+        while True:
+            page_size = self.sizer.page_size
+            try:
+                page = self._results(self._fetch(self.sizer.page_number, page_size))
+            except _shrinkable_errors as error:
+                if self.sizer.shrink(error):
+                    continue
+                raise
+            if not page:  # Empty list means we've hit the last page in our pagination journey.
+                return
+            if self._capped(page):
+                continue
+            is_last = self._is_last(page, page_size)
+            self.sizer.advance(len(page))
+            yield page
+            if is_last:
+                return
+
+    def __aiter__(self):
+        if self.prefetch > 0:
+            return self._aiter_prefetching()
+        return self._aiter_sequentially()
+
+    async def _aiter_sequentially(self):
+        while True:
+            page_size = self.sizer.page_size
+            try:
+                page = self._results(await self._fetch(self.sizer.page_number, page_size))
+            except _shrinkable_errors as error:
+                if self.sizer.shrink(error):
+                    continue
+                raise
+            if not page:
+                return
+            if self._capped(page):
+                continue
+            is_last = self._is_last(page, page_size)
+            self.sizer.advance(len(page))
+            yield page
+            if is_last:
+                return
+
+    def _iter_prefetching(self):
+        prefetched = queue.Queue(maxsize=self.prefetch)
+        stopped = threading.Event()
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    prefetched.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch_pages() -> None:
+            try:
+                for page in self._iter_sequentially():
+                    if not put((page, None)):
+                        return
+                put((None, None))
+            except Exception as error:
+                put((None, error))
+
+        threading.Thread(target=contextvars.copy_context().run, args=(fetch_pages,), daemon=True).start()
+        try:
+            while True:
+                page, error = prefetched.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            stopped.set()
+
+    async def _aiter_prefetching(self):
+        prefetched = asyncio.Queue(maxsize=self.prefetch)
+
+        async def fetch_pages() -> None:
+            try:
+                async for page in self._aiter_sequentially():
+                    await prefetched.put((page, None))
+                await prefetched.put((None, None))
+            except Exception as error:
+                await prefetched.put((None, error))
+
+        fetching = asyncio.ensure_future(fetch_pages())
+        try:
+            while True:
+                page, error = await prefetched.get()
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            fetching.cancel()
+
+    def _iter_concurrently(self):
+        page_size = self.sizer.page_size
+        executor = ThreadPoolExecutor(max_workers=self.fan_out)
+        in_flight = deque()
+        next_page = self.sizer.page_number
+
+        def request_next_page():
+            nonlocal next_page
+            if self.total is not None and (next_page - 1) * page_size >= self.total:
+                return
+            # each request runs in a copy of the caller's context so a deadline set around the walk applies
+            in_flight.append(executor.submit(contextvars.copy_context().run, self._fetch, next_page, page_size))
+            next_page += 1
+
+        try:
+            for _ in range(self.fan_out):
+                request_next_page()
+            while in_flight:
+                page = self._results(in_flight.popleft().result())
+                if not page:
+                    return
+                is_last = self._is_last(page, page_size)
+                if not is_last:
+                    request_next_page()
+                yield page
+                if is_last:
+                    return
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+
+def paginate(environment: str, endpoint, *args, result_key: str = "List", fan_out: int = 1, page_size: int = None,
+             prefetch: int = None, **kwargs) -> Pages:
+    """
+        Walks every page of a paged http_requests (or aio.http_requests) endpoint using the datacenter's pagination
+        settings.
+
+    :param environment: Datacenter name
+    :param endpoint: Paged endpoint function taking page_number and page_size keyword arguments, e.g.
+    get_subscribers_by_org, get_subscription_list_by_customer_id or get_orgs_by_name.
+    :param args: Positional arguments for the endpoint after the environment.
+    :param result_key: key of the result list in the json response, None when the endpoint returns the list itself.
+    :param fan_out: Number of page requests kept in flight, blocking endpoints only.
+    :param page_size: (Optional) Fixed page size, defaults to the datacenter's pagination settings.
+    :param prefetch: (Optional) Number of pages requested ahead while earlier pages are processed, defaults to the
+    datacenter's page_prefetch setting.
+    :param kwargs: Keyword arguments for the endpoint.
+    :return: Pages
+
+    :example:
+    >>> pages = paginate("NA", bss_api.get_orgs_by_name, "Acme", result_key=None)
+    >>> orgs = [org for page in pages for org in page]
+    >>> pages.requests
+    1
+    """
+    sizer = page_sizer(environment, endpoint.__name__, page_size=page_size)
+    if prefetch is None:
+        prefetch = config.get_pagination_settings(environment).get("prefetch")
+    return Pages(lambda page_number, page_size: endpoint(environment, *args, page_number=page_number,
+                                                         page_size=page_size, **kwargs),
+                 sizer, result_key=result_key, fan_out=fan_out, prefetch=prefetch)
@@ -1,9 +1,45 @@
+from functools import lru_cache
 
 from datetime import datetime
 
+BSS_TIME_FORMAT = "%m/%d/%Y %H:%M:%S"
+
+_UNSET = object()
+
 
 def parse_time(time_string: str) -> datetime:  # place holder in case we want to add in timezones.
-    return datetime.strptime(time_string, "%m/%d/%Y %H:%M:%S")  # Using a world inward in timestamp
+    """
+        Parses a BSS timestamp, e.g. 01/31/2019 13:45:00. Datetimes are returned as they are.
+    """
+    if isinstance(time_string, datetime):
+        return time_string
+    return _parse_time(time_string)
+
+
+@lru_cache(maxsize=4096)  # records share timestamps, starting with the 01/01/1970 00:00:00 default
+def _parse_time(time_string: str) -> datetime:
+    # BSS always sends the zero padded "%m/%d/%Y %H:%M:%S" form, sliced here rather than going through strptime
+    if len(time_string) == 19 and time_string[2] == time_string[5] == "/" and time_string[10] == " " \
+            and time_string[13] == time_string[16] == ":":
+        month, day, year = time_string[0:2], time_string[3:5], time_string[6:10]
+        hour, minute, second = time_string[11:13], time_string[14:16], time_string[17:19]
+        digits = month + day + year + hour + minute + second
+        if digits.isdigit():
+            try:
+                return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+            except ValueError:  # e.g. month 13, strptime raises its own error below
+                pass
+    return datetime.strptime(time_string, BSS_TIME_FORMAT)  # anything else, strptime accepts it or explains why not
 #
 # def parse_time_back(time_string: str) -> datetime:  # place holder in case we want to add in timezones.
-#     return datetime.strptime(time_string, "%Y %H:%M:%S")  # Using a world inward in timestamp
\ No newline at end of file
+#     return datetime.strptime(time_string, "%Y %H:%M:%S")  # Using a world inward in timestamp
+
+
+def slots_equal(first, second, fields: tuple) -> bool:
+    """
+        Compares two models field by field. A field set on only one of them makes them unequal, as a missing key did
+        when models compared their __dict__.
+
+    :param fields: __slots__ of the model class, subclasses such as the lazy models add slots of their own.
+    """
+    return all(getattr(first, field, _UNSET) == getattr(second, field, _UNSET) for field in fields)
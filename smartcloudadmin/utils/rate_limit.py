@@ -0,0 +1,128 @@
+import asyncio
+import email.utils
+import threading
+import time
+
+from smartcloudadmin.config import BssConfig
+
+config = BssConfig()
+
+# One bucket per datacenter, shared by every thread and event loop in the process. Keyed by environment name, the
+# datacenter settings dict is kept alongside the bucket so re-registering a datacenter gets a fresh bucket.
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+class TokenBucket:
+    """
+        Thread-safe token bucket limiting how fast requests are sent to a datacenter.
+
+        The bucket holds up to burst tokens and refills at rate tokens per second. Every request takes one token,
+        waiting for it when the bucket is empty. Tokens are handed out in the order they were asked for so waiting
+        threads and tasks are served first come first served.
+
+        When BSS throttles the datacenter the bucket is paused and nothing is sent to that datacenter until the pause
+        is over. Buckets of other datacenters are unaffected.
+
+        Attributes
+        ----------
+        rate : float
+            Requests per second, None for no limit.
+        burst : int
+            Number of requests that can be sent back to back after the bucket has been idle.
+        throttle_count : int
+            Number of throttling responses received from the datacenter.
+    """
+    def __init__(self, rate: float = None, burst: int = 1) -> None:
+        self.rate: float = rate
+        self.burst: int = max(burst, 1)
+        self._tokens: float = self.burst
+        self._updated: float = time.monotonic()
+        self._paused_until: float = 0.0
+        self.throttle_count: int = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+            Takes a token, going into debt when the bucket is empty.
+
+        :return: Seconds the caller has to wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            paused = max(self._paused_until - now, 0.0)
+            if self.rate is None:
+                return paused
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate if self._tokens < 0 else 0.0, paused)
+
+    def throttle(self, seconds: float) -> None:
+        """
+            Records a throttling response and holds back every request to the datacenter for a while.
+
+        :param seconds: How long to pause, usually the response's Retry-After.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self.throttle_count += 1
+
+    def acquire(self) -> None:
+        """
+            Blocks until a request may be sent.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """
+            Waits, without blocking the event loop, until a request may be sent.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+def get_bucket(environment) -> TokenBucket:
+    """
+        Returns the token bucket for a datacenter, creating it from the datacenter's rate limit settings on first use.
+
+    :param environment: Datacenter name as registered with BssConfig.add_datacenter
+    :return: TokenBucket
+    """
+    datacenter = config.datacenters.get(environment)
+    with _buckets_lock:
+        bucket_datacenter, bucket = _buckets.get(environment, (None, None))
+        if bucket is None or bucket_datacenter is not datacenter:
+            settings = config.get_rate_limit_settings(environment)
+            bucket = TokenBucket(settings.get("rate"), settings.get("burst"))
+            _buckets[environment] = (datacenter, bucket)
+        return bucket
+
+
+def throttle_stats() -> dict:
+    """
+    :return: Number of throttling responses received per datacenter since the process started, e.g. {"NA": 3}
+    """
+    with _buckets_lock:
+        return {environment: bucket.throttle_count for environment, (_, bucket) in _buckets.items()}
+
+
+def parse_retry_after(value) -> float:
+    """
+    :param value: Retry-After header, either a number of seconds or an HTTP date.
+    :return: Seconds to wait, None when the header is missing or can't be read.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
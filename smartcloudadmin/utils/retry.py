@@ -0,0 +1,67 @@
+import asyncio
+import random
+
+import requests
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency - pip install smartcloudadmin[aio]
+    aiohttp = None
+
+# Network errors worth another attempt, for both the blocking and the asyncio transport.
+default_retry_exceptions = (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                            asyncio.TimeoutError) + ((aiohttp.ClientConnectionError,) if aiohttp else ())
+
+
+class RetryPolicy:
+    """
+        Describes how the transport retries BSS requests that fail with a transient error.
+
+        The delay before attempt n + 1 is base_delay * 2 ** (n - 1), capped at max_delay. jitter randomly removes up to
+        that fraction of the delay so that many clients retrying at once spread out.
+
+        Attributes
+        ----------
+        max_attempts : int
+            Total number of attempts, including the first one. 1 disables retries.
+        base_delay : float
+            Delay in seconds before the first retry.
+        max_delay : float
+            Longest delay in seconds between two attempts.
+        jitter : float
+            Fraction of each delay that is randomised, between 0 (fixed delays) and 1 (anywhere from 0 to the delay).
+        retry_statuses : (int)
+            HTTP status codes that are retried. 429 (throttled) requests weren't processed by BSS so they are retried
+            whether they change data or not.
+        retry_exceptions : (Exception)
+            Exceptions raised while sending a request that are retried.
+        retry_mutating : bool
+            Also retry requests that change data on BSS, e.g. suspend or entitle. Such a request may have been applied
+            before failing, so this is off unless explicitly enabled.
+    """
+    def __init__(self, *, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 30.0, jitter: float = 1.0,
+                 retry_statuses: (int) = (429, 500, 502, 503, 504), retry_exceptions=default_retry_exceptions,
+                 retry_mutating: bool = False) -> None:
+        self.max_attempts: int = max_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.jitter: float = jitter
+        self.retry_statuses: (int) = tuple(retry_statuses)
+        self.retry_exceptions = tuple(retry_exceptions)
+        self.retry_mutating: bool = retry_mutating
+
+    def can_retry(self, attempt: int, idempotent: bool) -> bool:
+        """
+        :param attempt: Number of the attempt that just failed, starting at 1.
+        :param idempotent: Whether the request only reads data.
+        :return: Whether another attempt should be made.
+        """
+        return attempt < self.max_attempts and (idempotent or self.retry_mutating)
+
+    def delay(self, attempt: int) -> float:
+        """
+        :param attempt: Number of the attempt that just failed, starting at 1.
+        :return: Seconds to wait before the next attempt.
+        """
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay * (1 - self.jitter * random.random())
@@ -0,0 +1,162 @@
+import asyncio
+import functools
+import inspect
+import threading
+
+from smartcloudadmin.utils import deadline
+
+
+class _Call:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException = None
+
+
+def _reads(resource, environment: str, kind: str, resource_id) -> bool:
+    """
+    :param resource: (environment, resource kind, resource id or None for a list) a call reads.
+    :return: Whether the call may read the resource changed, resource_id None meaning every resource of the kind.
+    """
+    return resource[:2] == (environment, kind) and \
+        (resource_id is None or resource[2] is None or resource[2] == str(resource_id))
+
+
+class SingleFlight:
+    """
+        Runs at most one call per key at a time across threads. Callers asking for a key while its call is in flight
+        wait for that call and get its result (or exception) instead of making their own.
+
+        Keys start with the resource the call reads. Once a resource has been changed :func:`detach` stops later
+        callers from joining a call that may have read it before the change, they start a new call instead.
+
+        Attributes
+        ----------
+        coalesced : int
+            Number of calls answered by another caller's in-flight call.
+    """
+    def __init__(self) -> None:
+        self.coalesced: int = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            in_flight = call is not None
+            if in_flight:
+                self.coalesced += 1
+            else:
+                call = self._calls[key] = _Call()
+        if in_flight:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    def detach(self, environment: str, kind: str, resource_id=None) -> None:
+        """
+            Leaves the calls in flight that read a resource to the callers already waiting for them.
+
+        :param resource_id: Id of the resource changed, None when every resource of the kind may have changed.
+        """
+        with self._lock:
+            for key in [key for key in self._calls if _reads(key[0], environment, kind, resource_id)]:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """
+        asyncio counterpart of SingleFlight, coalescing calls made by tasks of the same event loop.
+
+        Attributes
+        ----------
+        coalesced : int
+            Number of calls answered by another task's in-flight call.
+    """
+    def __init__(self) -> None:
+        self.coalesced: int = 0
+        self._calls = {}
+
+    async def do(self, key, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)  # a waiter being cancelled mustn't cancel the shared call
+        future = self._calls[key] = loop.create_future()
+        future.add_done_callback(lambda done: done.cancelled() or done.exception())  # nobody may be waiting
+        try:
+            result = await fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def detach(self, environment: str, kind: str, resource_id=None) -> None:
+        """
+            Leaves the calls in flight that read a resource to the tasks already waiting for them.
+
+        :param resource_id: Id of the resource changed, None when every resource of the kind may have changed.
+        """
+        for key in [key for key in list(self._calls) if _reads(key[1][0], environment, kind, resource_id)]:
+            self._calls.pop(key, None)
+
+
+flights = SingleFlight()
+async_flights = AsyncSingleFlight()
+
+
+def coalesced(kind: str, id_param: str = None):
+    """
+        Makes concurrent calls of a read-only endpoint with the same arguments share one BSS request and its parsed
+        response. Calls made with a deadline set (utils.deadline.within) aren't shared, another caller's deadline
+        mustn't cut them short nor theirs cut short a call others wait for.
+
+    :param kind: Kind of resource the endpoint reads, e.g. customer, subscriber, subscription or roles.
+    :param id_param: Name of the endpoint parameter holding the resource id, None when the endpoint lists resources
+    of the kind.
+    """
+    def decorator(endpoint):
+        signature = inspect.signature(endpoint)
+
+        def key(args, kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            environment = next(iter(bound.arguments.values()))
+            resource = (environment, kind, str(bound.arguments[id_param]) if id_param else None)
+            return resource, endpoint.__name__, tuple(str(argument) for argument in bound.arguments.values())
+
+        if inspect.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **kwargs):
+                if deadline.remaining() is not None:
+                    return await endpoint(*args, **kwargs)
+                return await async_flights.do(key(args, kwargs), endpoint, *args, **kwargs)
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **kwargs):
+                if deadline.remaining() is not None:
+                    return endpoint(*args, **kwargs)
+                return flights.do(key(args, kwargs), endpoint, *args, **kwargs)
+        return wrapper
+    return decorator
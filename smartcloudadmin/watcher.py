@@ -0,0 +1,293 @@
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Iterable, List, Tuple
+
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.sync import SyncResult
+from smartcloudadmin.enums import State
+from smartcloudadmin.config import BssConfig
+
+logging.basicConfig(level=BssConfig.log_level)
+logger = logging.getLogger(__name__)
+
+
+class ChangeType(Enum):
+    """
+        Kinds of change reported by the FleetWatcher.
+    """
+    ORG_STATE_CHANGED = "ORG_STATE_CHANGED"
+    ORG_UPDATED = "ORG_UPDATED"
+    SUBSCRIPTION_ADDED = "SUBSCRIPTION_ADDED"
+    SUBSCRIPTION_REMOVED = "SUBSCRIPTION_REMOVED"
+    SUBSCRIPTION_EXPIRED = "SUBSCRIPTION_EXPIRED"
+    SUBSCRIPTION_STATE_CHANGED = "SUBSCRIPTION_STATE_CHANGED"
+    SUBSCRIPTION_SEATS_CHANGED = "SUBSCRIPTION_SEATS_CHANGED"
+    SUBSCRIPTION_UPDATED = "SUBSCRIPTION_UPDATED"
+    SUBSCRIBER_ADDED = "SUBSCRIBER_ADDED"
+    SUBSCRIBER_REMOVED = "SUBSCRIBER_REMOVED"
+    SUBSCRIBER_SUSPENDED = "SUBSCRIBER_SUSPENDED"
+    SUBSCRIBER_UNSUSPENDED = "SUBSCRIBER_UNSUSPENDED"
+    SUBSCRIBER_UPDATED = "SUBSCRIBER_UPDATED"
+    POLL_FAILED = "POLL_FAILED"
+
+
+class ChangeEvent:
+    """
+        A change noticed in a watched Organization.
+
+        Attributes
+        ----------
+        change_type : ChangeType
+        environment : str
+            Datacenter of the Organization.
+        organization_id : int
+        subject_id : int
+            Id of the Subscription or Subscriber that changed, the organization id for organization changes.
+        before :
+            Previous value: a state for state changes, the previous Subscription/Subscriber for updates and removals,
+            None for additions.
+        after :
+            New value: a state for state changes, the new Subscription/Subscriber for updates and additions, the
+            exception for POLL_FAILED, None for removals.
+        time : datetime
+            When the change was noticed.
+    """
+    def __init__(self, change_type: ChangeType, environment: str, organization_id: int, subject_id: int,
+                 before=None, after=None) -> None:
+        self.change_type: ChangeType = change_type
+        self.environment: str = environment
+        self.organization_id: int = organization_id
+        self.subject_id: int = subject_id
+        self.before = before
+        self.after = after
+        self.time: datetime = datetime.now()
+
+    def __repr__(self) -> str:
+        return f"{self.change_type.value} {self.environment}/{self.organization_id} ({self.subject_id}): " \
+               f"{self.before!r} -> {self.after!r}"
+
+
+class _Target:
+    def __init__(self, environment: str, organization_id: int, due: float) -> None:
+        self.environment: str = environment
+        self.organization_id: int = organization_id
+        self.organization: Organization = None
+        self.due: float = due
+        self.failures: int = 0
+        self.polling: bool = False
+        self.last_polled: datetime = None
+
+
+class FleetWatcher:
+    """
+        Polls a set of Organizations on an interval and reports what changed as ChangeEvents.
+
+        The first poll of an Organization loads it, later polls use :func:`Organization.sync` which only rebuilds
+        the records that changed. At most max_concurrency Organizations are polled at once. Every poll is scheduled
+        interval seconds after the previous one, give or take jitter, so polls of a large fleet spread out. An
+        Organization whose poll fails is retried with exponential backoff, up to max_backoff seconds, and a
+        POLL_FAILED event is reported.
+
+        Events go to callback, to events (e.g. a queue.Queue), or both.
+
+        :example:
+        >>> watcher = FleetWatcher([("NA", 123456), ("CE", 654321)], interval=300, callback=print)
+        >>> watcher.start()
+        ...
+        >>> watcher.stop()
+    """
+    def __init__(self, targets: Iterable[Tuple[str, int]], *, interval: float = 300.0, max_concurrency: int = 8,
+                 jitter: float = 0.1, max_backoff: float = 3600.0, callback: Callable[[ChangeEvent], None] = None,
+                 events=None, subscribers: bool = True, deadline: float = None) -> None:
+        """
+        :param targets: (environment, organization id) pairs to watch.
+        :param interval: Seconds between two polls of an Organization.
+        :param max_concurrency: Maximum number of Organizations polled at the same time.
+        :param jitter: Fraction of interval each poll is randomly moved by.
+        :param max_backoff: Longest wait in seconds before retrying an Organization whose polls keep failing.
+        :param callback: (Optional) Called with every ChangeEvent, from a polling thread.
+        :param events: (Optional) Object with a put method, e.g. queue.Queue, every ChangeEvent is put on.
+        :param subscribers: Watch Subscribers too. Leaving them out makes polls of large Organizations much cheaper.
+        :param deadline: (Optional) Seconds a single poll may take.
+        """
+        self.interval: float = interval
+        self.max_concurrency: int = max_concurrency
+        self.jitter: float = jitter
+        self.max_backoff: float = max_backoff
+        self.callback = callback
+        self.events = events
+        self.subscribers: bool = subscribers
+        self.deadline: float = deadline
+        self.polls: int = 0
+        self.failures: int = 0
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._wake = threading.Event()
+        self._scheduler: threading.Thread = None
+        self._executor: ThreadPoolExecutor = None
+        for environment, organization_id in targets:
+            self.add(environment, organization_id)
+
+    def add(self, environment: str, organization_id: int) -> None:
+        """
+            Starts watching an Organization. Its first poll is spread over the first jitter * interval seconds.
+        """
+        with self._lock:
+            key = (environment, str(organization_id))
+            if key not in self._targets:
+                due = time.monotonic() + random.uniform(0, self.jitter * self.interval)
+                self._targets[key] = _Target(environment, organization_id, due)
+        self._wake.set()
+
+    def remove(self, environment: str, organization_id: int) -> None:
+        """
+            Stops watching an Organization.
+        """
+        with self._lock:
+            self._targets.pop((environment, str(organization_id)), None)
+
+    def start(self) -> None:
+        """
+            Starts polling in the background.
+        """
+        self._stopped.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="fleet-watcher")
+        self._scheduler = threading.Thread(target=self._schedule, name="fleet-watcher-scheduler", daemon=True)
+        self._scheduler.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """
+            Stops polling.
+
+        :param wait: Wait for the polls in progress to finish.
+        """
+        self._stopped.set()
+        self._wake.set()
+        if self._scheduler is not None:
+            self._scheduler.join()
+            with self._lock:
+                executor, self._executor = self._executor, None
+            executor.shutdown(wait=wait)
+
+    def poll_once(self) -> List[ChangeEvent]:
+        """
+            Polls every watched Organization now, max_concurrency at a time, whatever their schedule. Organizations
+            being polled already are left out. A started watcher polls them on its own threads.
+
+        :return: The events of this round, also sent to callback and events.
+        """
+        with self._lock:
+            targets = [target for target in self._targets.values() if not target.polling]
+            for target in targets:
+                target.polling = True
+            executor = self._executor
+        if executor is not None:
+            futures = [executor.submit(self._poll, target) for target in targets]
+            return [event for future in futures for event in future.result()]
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            return [event for events in executor.map(self._poll, targets) for event in events]
+
+    def _schedule(self) -> None:
+        while not self._stopped.is_set():
+            now = time.monotonic()
+            with self._lock:
+                due = [target for target in self._targets.values() if not target.polling and target.due <= now]
+                for target in due:
+                    target.polling = True
+                upcoming = [target.due for target in self._targets.values() if not target.polling]
+            for target in due:
+                self._executor.submit(self._poll, target)
+            self._wake.clear()
+            self._wake.wait(max(min(upcoming, default=now + self.interval) - time.monotonic(), 0.05))
+
+    def _poll(self, target: _Target) -> List[ChangeEvent]:
+        polled = datetime.now()
+        try:
+            if target.organization is None:
+                target.organization = Organization.get(target.environment, target.organization_id,
+                                                       deadline=self.deadline)
+                events = []  # first poll is the baseline
+            else:
+                result = target.organization.sync(deadline=self.deadline, subscribers=self.subscribers)
+                events = self._events(target, result, polled)
+            target.last_polled = polled  # a failed poll leaves the expiry window open until the next success
+            failed = False
+        except Exception as error:
+            logger.warning(f"Polling org_id {target.organization_id} on env {target.environment} failed: {error!r}")
+            events = [ChangeEvent(ChangeType.POLL_FAILED, target.environment, target.organization_id,
+                                  target.organization_id, after=error)]
+            failed = True
+        with self._lock:  # the scheduler reads due and polling, other polls update the counters
+            self.polls += 1
+            if failed:
+                target.failures += 1
+                self.failures += 1
+                delay = min(self.max_backoff, self.interval * 2 ** (target.failures - 1))
+            else:
+                target.failures = 0
+                delay = self.interval
+            target.due = time.monotonic() + delay * (1 + random.uniform(-self.jitter, self.jitter))
+            target.polling = False
+        self._wake.set()
+        for event in events:
+            self._emit(event)
+        return events
+
+    def _events(self, target: _Target, result: SyncResult, polled: datetime) -> List[ChangeEvent]:
+        organization = target.organization
+
+        def event(change_type, subject_id, before=None, after=None):
+            return ChangeEvent(change_type, target.environment, target.organization_id, subject_id, before, after)
+
+        events = []
+        if result.previous_state != organization.state:
+            events.append(event(ChangeType.ORG_STATE_CHANGED, organization.id, result.previous_state,
+                                organization.state))
+        elif result.organization_changed or result.contact_changed or result.address_set_changed:
+            events.append(event(ChangeType.ORG_UPDATED, organization.id, after=organization))
+
+        for subscription in result.added_subscriptions:
+            events.append(event(ChangeType.SUBSCRIPTION_ADDED, subscription.id, after=subscription))
+        for subscription in result.removed_subscriptions:
+            events.append(event(ChangeType.SUBSCRIPTION_REMOVED, subscription.id, before=subscription))
+        for before, after in result.changed_subscriptions:
+            if before.state != after.state:
+                events.append(event(ChangeType.SUBSCRIPTION_STATE_CHANGED, after.id, before.state, after.state))
+            elif before.available_numbers_of_seats != after.available_numbers_of_seats:
+                events.append(event(ChangeType.SUBSCRIPTION_SEATS_CHANGED, after.id,
+                                    before.available_numbers_of_seats, after.available_numbers_of_seats))
+            else:
+                events.append(event(ChangeType.SUBSCRIPTION_UPDATED, after.id, before, after))
+        if target.last_polled is not None:
+            for subscription in organization.subscriptions.values():
+                expiration_date = subscription.expiration_date
+                if isinstance(expiration_date, datetime) and target.last_polled < expiration_date <= polled:
+                    events.append(event(ChangeType.SUBSCRIPTION_EXPIRED, subscription.id, after=subscription))
+
+        for subscriber in result.added_subscribers:
+            events.append(event(ChangeType.SUBSCRIBER_ADDED, subscriber.id, after=subscriber))
+        for subscriber in result.removed_subscribers:
+            events.append(event(ChangeType.SUBSCRIBER_REMOVED, subscriber.id, before=subscriber))
+        for before, after in result.changed_subscribers:
+            if before.state != after.state and after.state == State.SUSPENDED.value:
+                events.append(event(ChangeType.SUBSCRIBER_SUSPENDED, after.id, before.state, after.state))
+            elif before.state != after.state and before.state == State.SUSPENDED.value:
+                events.append(event(ChangeType.SUBSCRIBER_UNSUSPENDED, after.id, before.state, after.state))
+            else:
+                events.append(event(ChangeType.SUBSCRIBER_UPDATED, after.id, before, after))
+        return events
+
+    def _emit(self, event: ChangeEvent) -> None:
+        if self.events is not None:
+            self.events.put(event)
+        if self.callback is not None:
+            try:
+                self.callback(event)
+            except Exception:
+                logger.exception(f"FleetWatcher callback failed for {event!r}")
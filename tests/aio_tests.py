@@ -0,0 +1,111 @@
+import asyncio
+import unittest
+
+import smartcloudadmin.aio.http_requests as bss_aio
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssResourceNotFound, BssServerError
+from smartcloudadmin.utils.retry import RetryPolicy
+from tests.offline import ORGANIZATION_ID, customer_json, subscriber_json
+
+try:
+    from aiohttp import web
+    from aiohttp.test_utils import TestServer
+except ImportError:  # optional dependency - pip install smartcloudadmin[aio]
+    web = None
+
+ENVIRONMENT = "AIO"
+
+
+class LoopbackBss:
+    """
+        Answers a few BSS endpoints on a local port, failing the first fail_count requests with a 503.
+
+        Attributes
+        ----------
+        requests : [(str, str, str)]
+            (method, path, x-operation header) of every request.
+    """
+    def __init__(self, fail_count: int = 0) -> None:
+        self.fail_count = fail_count
+        self.requests = []
+        self.authorizations = set()
+
+    def app(self) -> 'web.Application':
+        app = web.Application()
+        app.router.add_route("*", "/api/bss/resource/{resource}/{id}", self.handle)
+        return app
+
+    async def handle(self, request: 'web.Request') -> 'web.Response':
+        self.requests.append((request.method, request.path, request.headers.get("x-operation")))
+        self.authorizations.add(request.headers.get("Authorization"))
+        if len(self.requests) <= self.fail_count:
+            return web.json_response({"BSSResponse": {"Message": "try again"}}, status=503)
+        resource, resource_id = request.match_info["resource"], int(request.match_info["id"])
+        if request.method == "POST":
+            return web.Response(status=204)
+        if resource == "customer" and resource_id == ORGANIZATION_ID:
+            return web.json_response({"Customer": customer_json()})
+        if resource == "subscriber" and resource_id == 1001:
+            return web.json_response({"Subscriber": subscriber_json(1)})
+        return web.json_response({"BSSResponse": {"Message": f"{resource} {resource_id} not found"}}, status=404)
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAioHttpRequests(unittest.TestCase):
+
+    def serve(self, bss: LoopbackBss, calls, **datacenter):
+        async def run():
+            async with TestServer(bss.app()) as server:
+                BssConfig().add_datacenter(ENVIRONMENT, str(server.make_url("")).rstrip("/"), ("user", "password"),
+                                           **datacenter)
+                try:
+                    return await calls()
+                finally:
+                    await bss_aio.close_sessions()
+        return asyncio.run(run())
+
+    def test_endpoints_share_one_session(self):
+        bss = LoopbackBss()
+
+        async def calls():
+            organization, subscriber = await asyncio.gather(bss_aio.get_org_by_id(ENVIRONMENT, ORGANIZATION_ID),
+                                                            bss_aio.get_subscriber_by_id(ENVIRONMENT, 1001))
+            session = bss_aio.get_session(ENVIRONMENT)
+            await bss_aio.suspend_subscriber(ENVIRONMENT, 1001)
+            self.assertIs(bss_aio.get_session(ENVIRONMENT), session)
+            return organization, subscriber
+
+        organization, subscriber = self.serve(bss, calls)
+        self.assertEqual(organization["Customer"]["Id"], ORGANIZATION_ID)
+        self.assertEqual(subscriber["Id"], 1001)
+        self.assertEqual(bss.requests[-1], ("POST", "/api/bss/resource/subscriber/1001", "suspendSubscriber"))
+        self.assertEqual(len(bss.authorizations), 1)
+        self.assertTrue(next(iter(bss.authorizations)).startswith("Basic "))
+
+    def test_status_handling_matches_the_blocking_api(self):
+        async def calls():
+            with self.assertRaises(BssResourceNotFound):
+                await bss_aio.get_subscriber_by_id(ENVIRONMENT, 2000)
+
+        self.serve(LoopbackBss(), calls)
+
+    def test_reads_are_retried_and_changes_are_not(self):
+        retry_policy = RetryPolicy(max_attempts=3, base_delay=0.001)
+        bss = LoopbackBss(fail_count=2)
+        organization = self.serve(bss, lambda: bss_aio.get_org_by_id(ENVIRONMENT, ORGANIZATION_ID),
+                                  retry_policy=retry_policy)
+        self.assertEqual(organization["Customer"]["Id"], ORGANIZATION_ID)
+        self.assertEqual(len(bss.requests), 3)
+
+        bss = LoopbackBss(fail_count=1)
+
+        async def calls():
+            with self.assertRaises(BssServerError):
+                await bss_aio.suspend_subscriber(ENVIRONMENT, 1001)
+
+        self.serve(bss, calls, retry_policy=retry_policy)
+        self.assertEqual(len(bss.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
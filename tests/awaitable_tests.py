@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+from smartcloudadmin.models.subscription import Subscription
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID
+
+
+class TestAwaitableEntryPoints(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+        self.bss.requests.clear()
+
+    def test_aget_matches_get(self):
+        organization = asyncio.run(Organization.aget(ENVIRONMENT, ORGANIZATION_ID))
+        self.assertEqual(organization.subscribers, self.organization.subscribers)
+        self.assertEqual(organization.subscriptions, self.organization.subscriptions)
+        self.assertEqual(set(organization.admins), set(self.organization.admins))
+        self.assertEqual((organization.name, organization.state, organization.size),
+                         (self.organization.name, self.organization.state, self.organization.size))
+        self.assertEqual(sorted(name for name, _, _ in self.bss.requests),
+                         ["get_org_by_id"] + ["get_subscribers_by_org"] * 3 + ["get_subscription_list_by_customer_id"])
+
+    def test_aget_columnar_and_basic(self):
+        columnar = asyncio.run(Organization.aget(ENVIRONMENT, ORGANIZATION_ID, columnar=True))
+        self.assertIsInstance(columnar.subscribers, SubscriberTable)
+        self.assertEqual(set(columnar.admins), set(self.organization.admins))
+        self.bss.requests.clear()
+        basic = asyncio.run(Organization.aget_basic(ENVIRONMENT, ORGANIZATION_ID))
+        self.assertEqual(basic.name, self.organization.name)
+        self.assertEqual(self.bss.requests, [("get_org_by_id", ORGANIZATION_ID, None)])
+
+    def test_subscriber_and_subscription_aget(self):
+        self.assertEqual(asyncio.run(Subscriber.aget(ENVIRONMENT, subscriber_id=1003)),
+                         Subscriber.get(ENVIRONMENT, subscriber_id=1003))
+        self.assertEqual(asyncio.run(Subscription.aget(ENVIRONMENT, 901)), Subscription.get(ENVIRONMENT, 901))
+
+    def test_changes_through_the_organization(self):
+        async def changes():
+            added = await self.organization.aadd_subscriber(email_address="new@example.com", given_name="New",
+                                                            family_name="Subscriber", role_set="User")
+            await self.organization.aentitle_subscriber(added, 902)
+            subscriber = self.organization.subscribers[1001]
+            await self.organization.arevoke_subscriber(subscriber, 901)
+            return added, subscriber
+
+        added, subscriber = asyncio.run(changes())
+        self.assertIs(self.organization.subscriber_by_email("new@example.com"), added)
+        self.assertIn(added.id, self.organization.subscribers_by_subscription(902))
+        self.assertNotIn(901, subscriber.seat_set)
+        self.assertNotIn(1001, self.organization.subscribers_by_subscription(901))
+        self.assertEqual([name for name, _, _ in self.bss.requests],
+                         ["create_subscriber", "get_subscriber_by_id", "entitle_subscriber", "get_subscriber_by_id",
+                          "revoke_subscriber", "get_subscriber_by_id"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssCircuitOpen
+from smartcloudadmin.utils.circuit_breaker import CircuitBreaker, CLOSED, OPEN, HALF_OPEN, get_breaker
+from smartcloudadmin.utils.retry import RetryPolicy
+
+ENVIRONMENT = "BREAKER"
+
+
+class Response:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.headers = {}
+
+
+class TestCircuitBreaker(unittest.TestCase):
+
+    def test_opens_after_threshold_and_recovers(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, cooldown=0.05)
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+        with self.assertRaises(BssCircuitOpen):
+            breaker.before_request()
+        time.sleep(0.06)
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        with self.assertRaises(BssCircuitOpen):  # one trial at a time
+            breaker.before_request()
+        breaker.record_success()
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_failed_trial_opens_again(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_release_lets_the_next_trial_through(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown=0.05)
+        breaker.record_failure()
+        time.sleep(0.06)
+        breaker.before_request()
+        breaker.release()
+        breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+
+    def test_disabled(self):
+        breaker = CircuitBreaker("test", failure_threshold=0)
+        for _ in range(10):
+            breaker.record_failure()
+        breaker.before_request()
+
+
+class TestMakeReqFailures(unittest.TestCase):
+
+    def setUp(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"),
+                                   retry_policy=RetryPolicy(max_attempts=1), circuit_failure_threshold=3)
+        self.breaker = get_breaker(ENVIRONMENT)
+
+    def send(self, outcome, **kwargs):
+        def _send(environment, url, *, timeout, **send_kwargs):
+            if isinstance(outcome, Exception):
+                raise outcome
+            return Response(outcome)
+
+        with mock.patch.object(bss_api, "_send", _send):
+            try:
+                bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1", **kwargs)
+            except Exception:
+                pass
+
+    def test_transport_errors_count(self):
+        for outcome in (requests.exceptions.ConnectionError(), requests.exceptions.Timeout(), 502):
+            self.send(outcome)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_gateway_errors_count(self):
+        for status_code in (502, 503, 504):
+            self.send(status_code, method="post")
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_500_counts_for_reads_only(self):
+        for _ in range(5):
+            self.send(500, method="post")
+        self.assertEqual(self.breaker.failures, 0)
+        for _ in range(3):
+            self.send(500)
+        self.assertEqual(self.breaker.state, OPEN)
+
+    def test_programming_errors_do_not_count(self):
+        for _ in range(5):
+            self.send(ValueError("Unsupported method"))
+        self.assertEqual(self.breaker.state, CLOSED)
+        self.assertEqual(self.breaker.failures, 0)
+
+    def test_success_resets(self):
+        self.send(502)
+        self.send(502)
+        self.send(200)
+        self.send(502)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import smartcloudadmin.aio.http_requests as bss_aio
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssDeadlineExceeded
+from smartcloudadmin.utils.circuit_breaker import CLOSED, get_breaker
+from smartcloudadmin.utils import deadline
+from smartcloudadmin.utils.deadline import within
+from smartcloudadmin.utils.retry import RetryPolicy
+
+ENVIRONMENT = "DEADLINE"
+
+
+class Response:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.headers = {}
+
+
+class TestDeadline(unittest.TestCase):
+
+    def test_nested_blocks_only_shorten(self):
+        self.assertIsNone(deadline.remaining())
+        with within(10):
+            self.assertAlmostEqual(deadline.remaining(), 10, delta=0.5)
+            with within(60):
+                self.assertAlmostEqual(deadline.remaining(), 10, delta=0.5)
+            with within(1):
+                self.assertAlmostEqual(deadline.remaining(), 1, delta=0.5)
+                with within(None):
+                    self.assertAlmostEqual(deadline.remaining(), 1, delta=0.5)
+            self.assertAlmostEqual(deadline.remaining(), 10, delta=0.5)
+        self.assertIsNone(deadline.remaining())
+
+    def test_clamp(self):
+        self.assertEqual(deadline.clamp(30), 30)
+        with within(1):
+            self.assertEqual(deadline.clamp(0.1), 0.1)
+            self.assertLessEqual(deadline.clamp(30), 1)
+        with within(-1):
+            self.assertEqual(deadline.clamp(30), 0)
+
+    def test_request_timeout(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), connect_timeout=5,
+                                   read_timeout=None)
+        self.assertEqual(deadline.request_timeout(ENVIRONMENT), (5, None))
+        with within(2):
+            connect, read = deadline.request_timeout(ENVIRONMENT)
+            self.assertLessEqual(connect, 2)
+            self.assertLessEqual(read, 2)
+        with within(30):
+            self.assertEqual(deadline.request_timeout(ENVIRONMENT)[0], 5)
+        with within(0), self.assertRaises(BssDeadlineExceeded):
+            deadline.request_timeout(ENVIRONMENT)
+
+    def test_each_thread_and_task_has_its_own(self):
+        async def task(seconds):
+            with within(seconds):
+                await asyncio.sleep(0.01)
+                return round(deadline.remaining())
+
+        async def tasks():
+            return await asyncio.gather(task(10), task(20))
+
+        with within(30):
+            with ThreadPoolExecutor(1) as executor:
+                self.assertIsNone(executor.submit(deadline.remaining).result())
+            self.assertEqual(asyncio.run(tasks()), [10, 20])
+
+    def test_retries_stop_at_the_deadline(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"),
+                                   retry_policy=RetryPolicy(max_attempts=100, base_delay=0.05, jitter=0),
+                                   circuit_failure_threshold=0)
+        sent = []
+
+        def send(environment, url, *, timeout, **kwargs):
+            sent.append(timeout)
+            return Response(503)
+
+        started = time.monotonic()
+        with mock.patch.object(bss_api, "_send", send), within(0.3), self.assertRaises(BssDeadlineExceeded):
+            bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1")
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertLess(len(sent), 10)
+        self.assertTrue(all(read <= 0.3 for _, read in sent))
+
+
+class TestDeadlineAndCircuitBreaker(unittest.TestCase):
+
+    def setUp(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"),
+                                   retry_policy=RetryPolicy(max_attempts=1), circuit_failure_threshold=1,
+                                   circuit_cooldown=60)
+        self.breaker = get_breaker(ENVIRONMENT)
+        self.breaker.record_failure()
+        self.breaker._opened_at -= 60  # cooldown over, the next request is the half open trial
+
+    def test_passed_deadline_does_not_hold_the_trial_slot(self):
+        with mock.patch.object(bss_api, "_send", lambda environment, url, *, timeout, **kwargs: Response(200)):
+            with within(0), self.assertRaises(BssDeadlineExceeded):
+                bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1")
+            self.assertEqual(bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1").status_code, 200)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_passed_deadline_does_not_hold_the_async_trial_slot(self):
+        async def send(environment, url, *, timeout, **kwargs):
+            return Response(200)
+
+        async def requests():
+            with within(0), self.assertRaises(BssDeadlineExceeded):
+                await bss_aio.make_req(ENVIRONMENT, "/api/bss/resource/customer/1")
+            return await bss_aio.make_req(ENVIRONMENT, "/api/bss/resource/customer/1")
+
+        with mock.patch.object(bss_aio, "_send", send):
+            self.assertEqual(asyncio.run(requests()).status_code, 200)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.exceptions import BssServerError
+from smartcloudadmin.models.organization import Organization
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID
+
+
+class TestSubscriberFanOut(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=95)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self._lock = threading.Lock()
+        serve_page = self.bss.get_subscribers_by_org
+
+        def get_subscribers_by_org(env, org_id, page_size=100, page_number=1):
+            with self._lock:
+                self.in_flight += 1
+                self.most_in_flight = max(self.most_in_flight, self.in_flight)
+            try:
+                time.sleep(0.02 if page_number % 2 else 0.005)  # later pages overtake earlier ones
+                return serve_page(env, org_id, page_size=page_size, page_number=page_number)
+            finally:
+                with self._lock:
+                    self.in_flight -= 1
+
+        patch = mock.patch.object(bss_api, "get_subscribers_by_org", get_subscribers_by_org)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_fan_out_matches_the_sequential_walk(self):
+        sequential = Organization.get(ENVIRONMENT, ORGANIZATION_ID, fan_out=1)
+        self.assertEqual(self.most_in_flight, 1)
+        concurrent = Organization.get(ENVIRONMENT, ORGANIZATION_ID, fan_out=4)
+        self.assertGreater(self.most_in_flight, 1)
+        self.assertLessEqual(self.most_in_flight, 4)
+        self.assertEqual(list(concurrent.subscribers), list(sequential.subscribers))
+        self.assertEqual(concurrent.subscribers, sequential.subscribers)
+        self.assertEqual(list(concurrent.admins), list(sequential.admins))
+        self.assertEqual(len(concurrent.subscribers), 95)
+
+    def test_failed_page_fails_the_load(self):
+        self.bss.fail_pages[("get_subscribers_by_org", 3)] = BssServerError("page 3")
+        with self.assertRaises(BssServerError):
+            Organization.get(ENVIRONMENT, ORGANIZATION_ID, fan_out=4)
+
+
+if __name__ == '__main__':
+    unittest.main()
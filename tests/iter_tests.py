@@ -0,0 +1,43 @@
+import unittest
+
+from smartcloudadmin.models.organization import Organization
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscription_json
+
+
+class TestOrganizationIterators(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25, subscription_count=12)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.bss.subscriptions[5] = dict(subscription_json(5), PartNumber="D0NRILL")
+        self.organization = Organization.get_basic(ENVIRONMENT, ORGANIZATION_ID)
+        self.bss.requests.clear()
+
+    def test_subscribers_arrive_page_by_page(self):
+        subscribers = self.organization.iter_subscribers(page_size=10)
+        self.assertEqual(self.bss.requests, [])  # nothing is requested until the first Subscriber is asked for
+        first = next(subscribers)
+        self.assertEqual(first.id, 1000)
+        self.assertEqual(self.bss.requests, [("get_subscribers_by_org", 1, 10)])
+        self.assertEqual([subscriber.id for subscriber in subscribers], list(range(1001, 1025)))
+        self.assertEqual([page for _, page, _ in self.bss.requests], [1, 2, 3])
+        self.assertEqual(self.organization.subscribers, {})
+
+    def test_filters(self):
+        self.assertEqual([subscriber.id for subscriber in self.organization.iter_subscribers(
+            filters={"state": "SUSPENDED"})], [1000, 1007, 1014, 1021])
+        self.assertEqual([subscriber.id for subscriber in self.organization.iter_subscribers(
+            filters={"state": "ACTIVE", "is_guest": True})], [])
+
+    def test_subscriptions(self):
+        subscriptions = list(self.organization.iter_subscriptions(page_size=5))
+        self.assertEqual([subscription.id for subscription in subscriptions], list(range(900, 912)))
+        self.assertEqual([page for _, page, _ in self.bss.requests], [1, 2, 3])
+        self.assertEqual([subscription.id for subscription in self.organization.iter_subscriptions(
+            filters={"part_number": "D0NRILL"})], [905])
+        self.assertEqual(self.organization.subscriptions, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
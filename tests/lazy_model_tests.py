@@ -0,0 +1,74 @@
+import unittest
+
+from smartcloudadmin.models.lazy import LazySubscriber, LazySubscription
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.utils.lazy import LazyField, reset_lazy_fields
+from tests.offline import ENVIRONMENT, subscriber_json, subscription_json
+
+
+class TestLazyModels(unittest.TestCase):
+
+    def assertSameAttributes(self, eager, lazy, fields):
+        for field in fields:
+            with self.subTest(field=field):
+                self.assertEqual(getattr(lazy, field, None), getattr(eager, field, None))
+        self.assertEqual(lazy, eager)
+
+    def test_subscriber(self):
+        for json_body in (subscriber_json(3), subscriber_json(10, subscription_ids=[900, 901]),
+                          subscriber_json(4, subscription_ids=[]), dict(subscriber_json(5), SeatSet=None)):
+            eager = Subscriber.from_json(ENVIRONMENT, json_body)
+            lazy = LazySubscriber.from_json(ENVIRONMENT, json_body)
+            self.assertSameAttributes(eager, lazy, Subscriber.__slots__)
+
+    def test_subscriber_without_seat_set(self):
+        json_body = subscriber_json(5)
+        del json_body["SeatSet"]
+        lazy = LazySubscriber.from_json(ENVIRONMENT, json_body)
+        self.assertEqual(lazy.seat_set, {})
+        self.assertEqual(lazy.entitlements, [])
+
+    def test_subscription(self):
+        json_body = subscription_json(2)
+        eager = Subscription.from_json(ENVIRONMENT, json_body)
+        lazy = LazySubscription.from_json(ENVIRONMENT, json_body)
+        self.assertSameAttributes(eager, lazy, Subscription.__slots__)
+
+    def test_refresh_resets_fields(self):
+        lazy = LazySubscriber.from_json(ENVIRONMENT, subscriber_json(1))
+        self.assertEqual(lazy.state, "ACTIVE")
+        lazy._get_details_by_id(subscriber_json(1, state="SUSPENDED"))
+        self.assertEqual(lazy.state, "SUSPENDED")
+
+
+class _Record:
+    _json = {"Person": {"EmailAddress": "a@b.c", "Created": None}, "Count": "3"}
+    email = LazyField("Person", "EmailAddress")
+    missing = LazyField("Person", "Missing", "Deeper")
+    count = LazyField("Count", convert=int)
+    keys = LazyField(load=lambda json_body: sorted(json_body))
+
+
+class TestLazyField(unittest.TestCase):
+
+    def test_computed_once_and_kept(self):
+        record = _Record()
+        record._json = dict(_Record._json)
+        self.assertEqual(record.email, "a@b.c")
+        self.assertEqual(record.count, 3)
+        self.assertEqual(record.keys, ["Count", "Person"])
+        self.assertIsNone(record.missing)
+        record._json = {}
+        self.assertEqual(record.email, "a@b.c")
+
+    def test_assign_and_reset(self):
+        record = _Record()
+        record.email = "x@y.z"
+        self.assertEqual(record.email, "x@y.z")
+        reset_lazy_fields(record)
+        self.assertEqual(record.email, "a@b.c")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+    Offline stand-in for the BSS endpoints an Organization is loaded and synced with, for tests that don't need a
+    live datacenter. Records are shaped like BSS getSubscriberByCustomer / getSubscriptionByCustomer rows.
+"""
+from unittest import mock
+
+import smartcloudadmin.aio.http_requests as bss_aio
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+
+ENVIRONMENT = "OFFLINE"
+ORGANIZATION_ID = 42
+
+BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), page_size=10)
+
+
+def timestamp(i: int) -> str:
+    return "%02d/%02d/2019 %02d:%02d:%02d" % (1 + i % 12, 1 + i % 28, i % 24, i % 60, (i * 7) % 60)
+
+
+def subscriber_json(i: int, *, state: str = None, roles: [str] = None, subscription_ids: [int] = None) -> dict:
+    if subscription_ids is None:
+        subscription_ids = [900 + i % 3]
+    return {"Id": 1000 + i, "CustomerId": ORGANIZATION_ID,
+            "SubscriberState": state or ("SUSPENDED" if i % 7 == 0 else "ACTIVE"),
+            "PartyRoleType": "SUBSCRIBER", "IsGuest": False, "InvitedBy": "admin@example.com",
+            "SeatSet": [{"Id": 5000 + 10 * i + n, "SubscriptionId": subscription_id, "SubscriberId": 1000 + i,
+                         "Created": timestamp(i), "Modified": timestamp(i + n), "SeatState": "ASSIGNED"}
+                        for n, subscription_id in enumerate(subscription_ids)],
+            "Person": {"EmailAddress": f"User{i}@Example.com", "GivenName": f"Given{i}", "FamilyName": f"Family{i}",
+                       "OrgName": "Example", "Owner": 1, "Modified": timestamp(i * 3), "Created": timestamp(i * 5),
+                       "RoleSet": roles or (["User", "CustomerAdministrator"] if i % 10 == 0 else ["User"]),
+                       "SecurityRealm": "NON_FEDERATED", "Deleted": False, "LanguagePreference": "EN_US"}}
+
+
+def subscription_json(i: int) -> dict:
+    return {"Id": 900 + i, "PartNumber": "D0NPULL", "CustomerId": ORGANIZATION_ID, "SubscriptionState": "ACTIVE",
+            "NumberOfAvailableSeats": 10 + i, "Modified": timestamp(i), "Created": timestamp(i + 1),
+            "PurchaseDate": timestamp(i + 2), "ExpirationDate": timestamp(i + 3), "EffectiveDate": timestamp(i + 4),
+            "MaxNumberOfSeats": 20, "DurationLength": 12, "DurationUnits": "MONTHS"}
+
+
+def customer_json() -> dict:
+    return {"Id": ORGANIZATION_ID, "CustomerState": "ACTIVE", "IsGuest": False,
+            "CustomerAccountSet": [{"VendorId": 10}],
+            "Organization": {"OrgName": "Example", "Owner": 1, "Created": timestamp(0), "Modified": timestamp(1),
+                             "PartyType": "ORGANIZATION", "SecurityRealm": "NON_FEDERATED",
+                             "Contact": {"EmailAddress": "contact@example.com", "Created": timestamp(0),
+                                         "Modified": timestamp(2), "SecurityRealm": "NON_FEDERATED"},
+                             "AddressSet": [{"Modified": timestamp(3), "City": "Cork"}]}}
+
+
+def _awaitable(function):
+    async def call(*args, **kwargs):
+        return function(*args, **kwargs)
+    return call
+
+
+class OfflineBss:
+    """
+        Patches the Organization endpoint, the Subscription and Subscriber lists and lookups, in both the blocking and
+        the asyncio API, to serve the records held in subscribers and subscriptions, with the lists paged as BSS pages
+        them. Creating, suspending, entitling and revoking Subscribers change the records.
+
+        Attributes
+        ----------
+        subscribers : [dict]
+        subscriptions : [dict]
+        fail_pages : Dict[(str, int), Exception]
+            (endpoint name, page number) to the exception that page request raises.
+        requests : [(str, int, int)]
+            (endpoint name, page number or id, page size) of every request.
+    """
+    def __init__(self, subscriber_count: int = 25, subscription_count: int = 3) -> None:
+        self.subscribers = [subscriber_json(i) for i in range(subscriber_count)]
+        self.subscriptions = [subscription_json(i) for i in range(subscription_count)]
+        self.fail_pages = {}
+        self.requests = []
+        names = ("get_org_by_id", "get_subscribers_by_org", "get_subscription_list_by_customer_id",
+                 "get_subscriber_by_id", "get_subscription_by_subscription_id", "create_subscriber",
+                 "suspend_subscriber", "entitle_subscriber", "revoke_subscriber")
+        self._patches = [mock.patch.object(bss_api, name, getattr(self, name)) for name in names] + \
+                        [mock.patch.object(bss_aio, name, _awaitable(getattr(self, name))) for name in names]
+
+    def __enter__(self) -> 'OfflineBss':
+        for patch in self._patches:
+            patch.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        for patch in self._patches:
+            patch.stop()
+
+    def _page(self, name: str, records: [dict], page_number: int, page_size: int) -> dict:
+        self.requests.append((name, page_number, page_size))
+        error = self.fail_pages.get((name, page_number))
+        if error is not None:
+            raise error
+        return {"List": records[(page_number - 1) * page_size:page_number * page_size]}
+
+    def get_org_by_id(self, environment, organization_id) -> dict:
+        self.requests.append(("get_org_by_id", organization_id, None))
+        return {"Customer": customer_json()}
+
+    def get_subscribers_by_org(self, env, org_id, page_size=100, page_number=1) -> dict:
+        return self._page("get_subscribers_by_org", self.subscribers, page_number, page_size)
+
+    def get_subscription_list_by_customer_id(self, env, customer_id, page_number=1, page_size=100) -> dict:
+        return self._page("get_subscription_list_by_customer_id", self.subscriptions, page_number, page_size)
+
+    def get_subscriber_by_id(self, environment, subscriber_id) -> dict:
+        self.requests.append(("get_subscriber_by_id", subscriber_id, None))
+        return self._subscriber(subscriber_id)
+
+    def get_subscription_by_subscription_id(self, environment, subscription_id) -> dict:
+        self.requests.append(("get_subscription_by_subscription_id", subscription_id, None))
+        return next(subscription for subscription in self.subscriptions if subscription["Id"] == subscription_id)
+
+    def _subscriber(self, subscriber_id) -> dict:
+        return next(subscriber for subscriber in self.subscribers if subscriber["Id"] == subscriber_id)
+
+    def create_subscriber(self, environment, post_body) -> int:
+        person = post_body["Subscriber"]["Person"]
+        subscriber = subscriber_json(max(subscriber["Id"] for subscriber in self.subscribers) - 999,
+                                     state="PENDING", roles=person["RoleSet"], subscription_ids=[])
+        subscriber["Person"].update(EmailAddress=person["EmailAddress"], GivenName=person["GivenName"],
+                                    FamilyName=person["FamilyName"])
+        self.requests.append(("create_subscriber", subscriber["Id"], None))
+        self.subscribers.append(subscriber)
+        return subscriber["Id"]
+
+    def suspend_subscriber(self, env, subscriber_id) -> None:
+        self.requests.append(("suspend_subscriber", subscriber_id, None))
+        self._subscriber(subscriber_id)["SubscriberState"] = "SUSPENDED"
+
+    def entitle_subscriber(self, env, subscriber_id, subscription_id) -> None:
+        self.requests.append(("entitle_subscriber", subscriber_id, None))
+        seat_set = self._subscriber(subscriber_id)["SeatSet"]
+        seat = subscriber_json(subscriber_id - 1000, subscription_ids=[subscription_id])["SeatSet"][0]
+        seat_set.append(dict(seat, Id=max([seat["Id"] for seat in seat_set], default=seat["Id"] - 1) + 1))
+
+    def revoke_subscriber(self, env, subscriber_id, seat_id) -> None:
+        self.requests.append(("revoke_subscriber", subscriber_id, None))
+        subscriber = self._subscriber(subscriber_id)
+        subscriber["SeatSet"] = [seat for seat in subscriber["SeatSet"] if seat["Id"] != seat_id]
@@ -0,0 +1,58 @@
+import unittest
+
+from smartcloudadmin.models.organization_cache import OrganizationCache
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json, subscription_json
+
+
+class TestOrganizationCache(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.cache = OrganizationCache(soft_ttl=0, hard_ttl=600)
+        self.organization = self.cache.get(ENVIRONMENT, ORGANIZATION_ID)
+
+    def refresh(self):
+        self.cache.get(ENVIRONMENT, ORGANIZATION_ID)  # past soft_ttl, starts a background refresh
+        self.cache.close()
+        self.cache.soft_ttl = 600
+
+    def change_a_subscription(self):  # a refresh only syncs the Subscribers once a Subscription changed
+        self.bss.subscriptions[0] = dict(subscription_json(0), NumberOfAvailableSeats=1)
+
+    def test_refresh_swaps_in_an_updated_copy(self):
+        self.change_a_subscription()
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        del self.bss.subscribers[2]
+        self.refresh()
+        refreshed = self.cache.get(ENVIRONMENT, ORGANIZATION_ID)
+        self.assertIsNot(refreshed, self.organization)
+        self.assertEqual(refreshed.subscribers[1001].state, "SUSPENDED")
+        self.assertNotIn(1002, refreshed.subscribers)
+        self.assertEqual(self.organization.subscribers[1001].state, "ACTIVE")
+        self.assertIn(1002, self.organization.subscribers)
+
+    def test_failed_refresh_keeps_the_cached_copy(self):
+        self.change_a_subscription()
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.bss.fail_pages[("get_subscribers_by_org", 2)] = TimeoutError()
+        self.refresh()
+        self.assertIs(self.cache.get(ENVIRONMENT, ORGANIZATION_ID), self.organization)
+        self.assertEqual(self.organization.subscribers[1001].state, "ACTIVE")
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_refresh_threads_start_lazily_and_stop_on_exit(self):
+        with OrganizationCache(soft_ttl=0, hard_ttl=600) as cache:
+            cache.get(ENVIRONMENT, ORGANIZATION_ID)
+            self.assertIsNone(cache._executor)
+            cache.get(ENVIRONMENT, ORGANIZATION_ID)
+            executor = cache._executor
+            self.assertIsNotNone(executor)
+        self.assertIsNone(cache._executor)
+        self.assertTrue(executor._shutdown)
+        self.assertEqual(cache.stats()["refreshes"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+import smartcloudadmin.utils.pagination as pagination
+from smartcloudadmin.exceptions import BssServerError
+from smartcloudadmin.utils.pagination import PageSizer, Pages
+
+
+class Server:
+    """
+        Serves range(count) in pages, answering pages bigger than cap with cap results starting at the page's
+        offset at the capped size, as a server applying its own page size would.
+    """
+    def __init__(self, count: int, *, cap: int = None, total: bool = False, fail_above: int = None) -> None:
+        self.count = count
+        self.cap = cap
+        self.total = total
+        self.fail_above = fail_above
+        self.requests = []
+
+    def __call__(self, page_number: int, page_size: int) -> dict:
+        self.requests.append((page_number, page_size))
+        if self.fail_above is not None and page_size > self.fail_above:
+            raise BssServerError("page too big")
+        if self.cap is not None:
+            page_size = min(page_size, self.cap)
+        start = (page_number - 1) * page_size
+        resp = {"List": list(range(start, min(start + page_size, self.count)))}
+        if self.total:
+            resp["TotalResults"] = self.count
+        return resp
+
+
+def walk(server: Server, sizer: PageSizer, **kwargs) -> list:
+    return [result for page in Pages(server, sizer, **kwargs) for result in page]
+
+
+class TestPages(unittest.TestCase):
+
+    def test_stops_on_short_page(self):
+        server = Server(55)
+        self.assertEqual(walk(server, PageSizer(25)), list(range(55)))
+        self.assertEqual(server.requests, [(1, 25), (2, 25), (3, 25)])
+
+    def test_stops_on_empty_page(self):
+        server = Server(50)
+        self.assertEqual(walk(server, PageSizer(25)), list(range(50)))
+        self.assertEqual(len(server.requests), 3)
+
+    def test_stops_on_total(self):
+        server = Server(50, total=True)
+        self.assertEqual(walk(server, PageSizer(25)), list(range(50)))
+        self.assertEqual(len(server.requests), 2)
+
+    def test_adaptive_growth(self):
+        server = Server(1000)
+        self.assertEqual(walk(server, PageSizer(25, adaptive=True, max_page_size=200)), list(range(1000)))
+        self.assertEqual([size for _, size in server.requests], [25, 25, 50, 100, 200, 200, 200, 200, 200])
+
+    def test_adaptive_walk_survives_a_server_cap(self):
+        for count in (2000, 2400, 150, 400):
+            with self.subTest(count=count):
+                server = Server(count, cap=300)
+                sizer = PageSizer(25, adaptive=True, max_page_size=1000)
+                self.assertEqual(walk(server, sizer), list(range(count)))
+                self.assertLessEqual(sizer.max_page_size, 300)
+
+    def test_short_last_page_ends_without_cap(self):
+        server = Server(130)
+        sizer = PageSizer(25, adaptive=True, max_page_size=1000)
+        self.assertEqual(walk(server, sizer), list(range(130)))
+        self.assertEqual(server.requests, [(1, 25), (2, 25), (2, 50), (2, 100), (3, 50)])
+
+    def test_shrinks_after_server_error(self):
+        server = Server(500, fail_above=50)
+        sizer = PageSizer(25, adaptive=True, max_page_size=1000)
+        self.assertEqual(walk(server, sizer), list(range(500)))
+        self.assertEqual(sizer.max_page_size, 50)
+
+    def test_fixed_size_error_is_raised(self):
+        server = Server(500, fail_above=10)
+        with self.assertRaises(BssServerError):
+            walk(server, PageSizer(25))
+
+    def test_concurrent_walk(self):
+        server = Server(230)
+        self.assertEqual(walk(server, PageSizer(25), fan_out=4), list(range(230)))
+
+    def test_prefetching_walk(self):
+        server = Server(230)
+        self.assertEqual(walk(server, PageSizer(25), prefetch=2), list(range(230)))
+
+    def test_async_walk(self):
+        server = Server(2000, cap=300)
+
+        async def fetch_page(page_number, page_size):
+            return server(page_number, page_size)
+
+        async def walk_async():
+            return [result async for page in Pages(fetch_page, PageSizer(25, adaptive=True)) for result in page]
+
+        self.assertEqual(asyncio.run(walk_async()), list(range(2000)))
+
+
+class TestLearnedPageSizes(unittest.TestCase):
+
+    key = ("TEST", "pagination_tests")
+
+    def tearDown(self):
+        pagination._learned_page_sizes.pop(self.key, None)
+
+    def sizer(self) -> PageSizer:
+        start_page_size, max_page_size = pagination._learned_page_sizes.get(self.key, (None, 1000))
+        return PageSizer(25, adaptive=True, max_page_size=max_page_size, start_page_size=start_page_size,
+                         learned_key=self.key)
+
+    def test_later_walks_start_at_an_honoured_size(self):
+        server = Server(2000, cap=300)
+        self.assertEqual(walk(server, self.sizer()), list(range(2000)))
+        self.assertEqual(pagination._learned_page_sizes[self.key], (200, 200))
+        server.requests.clear()
+        self.assertEqual(walk(server, self.sizer()), list(range(2000)))
+        self.assertEqual({size for _, size in server.requests}, {200})
+
+    def test_short_walk_does_not_remember_an_unconfirmed_size(self):
+        self.assertEqual(walk(Server(60), self.sizer()), list(range(60)))
+        self.assertEqual(pagination._learned_page_sizes.get(self.key, (25, 1000)), (25, 1000))
+
+    def test_cap_is_remembered_once_confirmed(self):
+        walk(Server(120, cap=300), self.sizer())  # ends on a short page, nothing shows a cap
+        self.assertEqual(pagination._learned_page_sizes.get(self.key, (25, 1000))[1], 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from datetime import datetime
+from unittest import mock
+
+from smartcloudadmin.utils import qol
+from smartcloudadmin.utils.qol import BSS_TIME_FORMAT, parse_time
+from tests.offline import timestamp
+
+
+class TestParseTime(unittest.TestCase):
+
+    def test_fast_path_matches_strptime(self):
+        for text in [timestamp(i) for i in range(200)] + ["01/01/1970 00:00:00", "12/31/2099 23:59:59",
+                                                          "02/29/2020 12:00:00"]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_time(text), datetime.strptime(text, BSS_TIME_FORMAT))
+
+    def test_fast_path_skips_strptime(self):
+        class NoStrptime(datetime):
+            @classmethod
+            def strptime(cls, date_string, format):
+                raise AssertionError(f"strptime called for {date_string}")
+
+        qol._parse_time.cache_clear()
+        with mock.patch.object(qol, "datetime", NoStrptime):
+            self.assertEqual(parse_time("03/04/2019 05:06:07"), datetime(2019, 3, 4, 5, 6, 7))
+            self.assertRaises(AssertionError, parse_time, "3/4/2019 05:06:07")
+        qol._parse_time.cache_clear()
+
+    def test_repeated_values_are_cached(self):
+        qol._parse_time.cache_clear()
+        first = parse_time("01/01/1970 00:00:00")
+        self.assertIs(parse_time("01/01/1970 00:00:00"), first)
+        self.assertEqual(qol._parse_time.cache_info().hits, 1)
+
+    def test_datetimes_are_returned_as_they_are(self):
+        value = datetime(2019, 1, 2, 3, 4, 5)
+        self.assertIs(parse_time(value), value)
+
+    def test_other_layouts_fall_back_to_strptime(self):
+        self.assertEqual(parse_time("1/2/2019 3:04:05"), datetime(2019, 1, 2, 3, 4, 5))  # not zero padded
+        self.assertEqual(parse_time("01/02/2019 3:4:5"), datetime(2019, 1, 2, 3, 4, 5))
+
+    def test_invalid_values_raise_like_strptime(self):
+        for text in ("13/01/2019 00:00:00", "02/30/2019 00:00:00", "01/01/2019 24:00:00", "0a/01/2019 00:00:00",
+                     "+1/01/2019 00:00:00", "01-01-2019 00:00:00", "2019-01-01T00:00:00", "", "01/01/2019"):
+            with self.subTest(text=text):
+                self.assertRaises(ValueError, parse_time, text)
+
+
+if __name__ == '__main__':
+    unittest.main()
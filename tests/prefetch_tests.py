@@ -0,0 +1,75 @@
+import asyncio
+import threading
+import time
+import unittest
+
+import smartcloudadmin.aio.http_requests as bss_aio
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssServerError
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.utils.pagination import paginate
+from tests.offline import OfflineBss, ORGANIZATION_ID
+
+ENVIRONMENT = "PREFETCH"
+
+BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), page_size=10, page_prefetch=2)
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=55)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+
+    def subscriber_pages(self):
+        return [name for name, _, _ in self.bss.requests if name == "get_subscribers_by_org"]
+
+    def test_pages_are_requested_while_earlier_ones_are_processed(self):
+        pages = paginate(ENVIRONMENT, bss_api.get_subscribers_by_org, ORGANIZATION_ID)
+        iterator = iter(pages)
+        self.assertEqual(len(next(iterator)), 10)
+        deadline = time.monotonic() + 5
+        while len(self.subscriber_pages()) < 4 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        time.sleep(0.05)
+        self.assertEqual(len(self.subscriber_pages()), 4)  # 2 and 3 are held ready, 4 waits for room
+        self.assertEqual(sum(len(page) for page in iterator), 45)
+        self.assertEqual(len(self.subscriber_pages()), 6)
+
+    def test_organization_matches_the_sequential_walk(self):
+        prefetched = Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+        sequential = Organization.get("OFFLINE", ORGANIZATION_ID)  # same records, a datacenter without prefetch
+        self.assertEqual([repr(subscriber) for subscriber in prefetched.subscribers.values()],
+                         [repr(subscriber) for subscriber in sequential.subscribers.values()])
+        self.assertEqual(list(prefetched.subscribers), list(range(1000, 1055)))
+
+    def test_failed_page_is_raised_in_order(self):
+        self.bss.fail_pages[("get_subscribers_by_org", 3)] = BssServerError("page 3")
+        received = []
+        with self.assertRaises(BssServerError):
+            for page in paginate(ENVIRONMENT, bss_api.get_subscribers_by_org, ORGANIZATION_ID):
+                received.append(len(page))
+        self.assertEqual(received, [10, 10])
+
+    def test_abandoned_walk_stops_fetching(self):
+        threads = threading.active_count()
+        for _ in paginate(ENVIRONMENT, bss_api.get_subscribers_by_org, ORGANIZATION_ID):
+            break
+        deadline = time.monotonic() + 5
+        while threading.active_count() > threads and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(threading.active_count(), threads)
+        self.assertLess(len(self.subscriber_pages()), 6)
+
+    def test_async_walk(self):
+        async def walk():
+            return [len(page) async for page in paginate(ENVIRONMENT, bss_aio.get_subscribers_by_org,
+                                                         ORGANIZATION_ID)]
+
+        self.assertEqual(asyncio.run(walk()), [10, 10, 10, 10, 10, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
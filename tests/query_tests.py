@@ -0,0 +1,157 @@
+import operator
+import unittest
+from collections import Counter
+from datetime import date, datetime
+
+from smartcloudadmin import query
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+from smartcloudadmin.models.subscription import Subscription
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json, subscription_json
+
+
+def _values(value) -> list:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def matches(subscriber: Subscriber, *, state=None, role=None, security_realm=None, subscription_id=None,
+            created_after=None, created_before=None, modified_after=None, modified_before=None,
+            min_seats=None, max_seats=None) -> bool:
+    """
+        Python scan counterpart of query.subscriber_mask.
+    """
+    return (state is None or subscriber.state in _values(state)) and \
+        (security_realm is None or subscriber.security_realm in _values(security_realm)) and \
+        (role is None or any(name in subscriber.role_set for name in _values(role))) and \
+        (subscription_id is None or any(subscription in subscriber.seat_set
+                                        for subscription in _values(subscription_id))) and \
+        (created_after is None or subscriber.created >= created_after) and \
+        (created_before is None or subscriber.created < created_before) and \
+        (modified_after is None or subscriber.modified >= modified_after) and \
+        (modified_before is None or subscriber.modified < modified_before) and \
+        (min_seats is None or len(subscriber.seat_set) >= min_seats) and \
+        (max_seats is None or len(subscriber.seat_set) <= max_seats)
+
+
+@unittest.skipIf(query.numpy is None, "numpy is not installed")
+class TestSubscriberQueries(unittest.TestCase):
+
+    criteria = [{}, {"state": "SUSPENDED"}, {"state": ["ACTIVE", "PENDING"]}, {"role": "CustomerAdministrator"},
+                {"role": ["CustomerAdministrator", "User"]}, {"role": "Unknown"}, {"subscription_id": 901},
+                {"subscription_id": [900, 902]}, {"security_realm": "NON_FEDERATED"},
+                {"created_after": datetime(2019, 3, 1), "created_before": datetime(2019, 9, 1)},
+                {"modified_before": datetime(2019, 6, 15)}, {"min_seats": 2}, {"max_seats": 0},
+                {"state": "ACTIVE", "role": "User", "subscription_id": 900, "min_seats": 1,
+                 "modified_after": datetime(2019, 2, 1)}]
+
+    def setUp(self):
+        self.subscribers = {}
+        self.table = SubscriberTable(ENVIRONMENT)
+        for i in range(200):
+            subscriber = Subscriber.from_json(ENVIRONMENT, subscriber_json(
+                i, state="PENDING" if i % 11 == 0 else None, subscription_ids=[900 + n for n in range(i % 4)]))
+            self.subscribers[subscriber.id] = subscriber
+            self.table.add(subscriber)
+        for subscriber_id in (1003, 1050, 1121):  # dead rows mustn't match
+            del self.subscribers[subscriber_id]
+            del self.table[subscriber_id]
+
+    def test_subscriber_mask_matches_a_scan(self):
+        for criteria in self.criteria:
+            with self.subTest(**criteria):
+                mask = query.subscriber_mask(self.table, **criteria)
+                self.assertEqual(query.subscriber_ids(self.table, mask),
+                                 [subscriber.id for subscriber in self.subscribers.values()
+                                  if matches(subscriber, **criteria)])
+
+    def test_subscriber_counts_match_a_scan(self):
+        for criteria in self.criteria:
+            mask = query.subscriber_mask(self.table, **criteria)
+            selected = [subscriber for subscriber in self.subscribers.values() if matches(subscriber, **criteria)]
+            with self.subTest(**criteria):
+                for by in ("state", "security_realm", "party_role_type", "customer_id"):
+                    self.assertEqual(query.subscriber_counts(self.table, by, mask),
+                                     Counter(getattr(subscriber, by) for subscriber in selected))
+                self.assertEqual(query.subscriber_counts(self.table, "role", mask),
+                                 Counter(role for subscriber in selected for role in subscriber.role_set))
+                self.assertEqual(query.subscriber_counts(self.table, "created", mask, period="month"),
+                                 Counter(date(subscriber.created.year, subscriber.created.month, 1)
+                                         for subscriber in selected))
+                self.assertEqual(query.subscriber_counts(self.table, "modified", mask, period="day"),
+                                 Counter(subscriber.modified.date() for subscriber in selected))
+
+    def test_attribute_mask_matches_a_scan(self):
+        for attribute, value, passed_operator in (("state", "SUSPENDED", operator.eq),
+                                                  ("state", "ACTIVE", operator.ne),
+                                                  ("created", datetime(2019, 6, 1), operator.lt),
+                                                  ("modified", datetime(2019, 6, 1), operator.ge),
+                                                  ("id", 1100, operator.gt)):
+            with self.subTest(attribute=attribute, operator=passed_operator):
+                mask = query.subscriber_attribute_mask(self.table, attribute, value, passed_operator)
+                self.assertEqual(query.subscriber_ids(self.table, mask),
+                                 [subscriber.id for subscriber in self.subscribers.values()
+                                  if passed_operator(getattr(subscriber, attribute), value)])
+        self.assertIsNone(query.subscriber_attribute_mask(self.table, "email", "a@b.c", operator.eq))
+        self.assertIsNone(query.subscriber_attribute_mask(self.table, "state", "ACTIVE", operator.contains))
+
+    def test_empty_table(self):
+        table = SubscriberTable(ENVIRONMENT)
+        self.assertEqual(query.subscriber_ids(table, query.subscriber_mask(table, state="ACTIVE", min_seats=1)), [])
+        self.assertEqual(query.subscriber_counts(table, "created"), {})
+
+
+@unittest.skipIf(query.numpy is None, "numpy is not installed")
+class TestOrganizationQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+
+    def test_table_of_a_dict_backed_organization_is_kept_up_to_date(self):
+        self.assertEqual(sorted(self.organization.query_subscribers(state="SUSPENDED")), [1000, 1007, 1014, 1021])
+        table = self.organization._table
+        self.bss.subscriptions[0] = dict(subscription_json(0), NumberOfAvailableSeats=1)
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        del self.bss.subscribers[7]
+        self.organization.sync()
+        subscriber = self.organization.subscribers[1002]
+        subscriber.state = "SUSPENDED"
+        self.organization.reindex_subscriber(subscriber)
+
+        self.assertEqual(sorted(self.organization.query_subscribers(state="SUSPENDED")), [1000, 1001, 1002, 1014, 1021])
+        self.assertEqual(self.organization.count_subscribers("state"),
+                         Counter(subscriber.state for subscriber in self.organization.subscribers.values()))
+        self.assertIs(self.organization._table, table)
+
+
+@unittest.skipIf(query.numpy is None, "numpy is not installed")
+class TestSubscriptionQueries(unittest.TestCase):
+
+    def setUp(self):
+        self.subscriptions = [Subscription.from_json(ENVIRONMENT, dict(
+            subscription_json(i), SubscriptionState="SUSPENDED" if i % 3 == 0 else "ACTIVE",
+            PartNumber="D0NPULL" if i % 2 else "D0NRILL")) for i in range(20)]
+        self.columns = query.subscription_columns(self.subscriptions)
+
+    def test_subscription_mask_matches_a_scan(self):
+        for criteria, predicate in (
+                ({"state": "ACTIVE"}, lambda subscription: subscription.state == "ACTIVE"),
+                ({"part_number": ["D0NRILL"]}, lambda subscription: subscription.part_number == "D0NRILL"),
+                ({"expires_before": datetime(2019, 6, 1)},
+                 lambda subscription: subscription.expiration_date < datetime(2019, 6, 1)),
+                ({"min_available_seats": 15, "max_available_seats": 25},
+                 lambda subscription: 15 <= subscription.available_numbers_of_seats <= 25)):
+            with self.subTest(**criteria):
+                mask = query.subscription_mask(self.columns, **criteria)
+                self.assertEqual([subscription.id for subscription, found in zip(self.subscriptions, mask) if found],
+                                 [subscription.id for subscription in self.subscriptions if predicate(subscription)])
+                self.assertEqual(query.subscription_counts(self.columns, "state", mask),
+                                 Counter(str(subscription.state) for subscription in self.subscriptions
+                                         if predicate(subscription)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import asyncio
+import email.utils
+import time
+import unittest
+from unittest import mock
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.utils import rate_limit
+from smartcloudadmin.utils.rate_limit import TokenBucket, get_bucket, parse_retry_after, throttle_stats
+
+ENVIRONMENT = "RATE"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        patch = mock.patch.object(rate_limit.time, "monotonic", self.clock.monotonic)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=10, burst=3)
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0.0, 0.0, 0.0])
+        self.assertEqual([round(bucket.reserve(), 6) for _ in range(3)], [0.1, 0.2, 0.3])  # first come first served
+        self.clock.now += 0.3
+        self.assertEqual(round(bucket.reserve(), 6), 0.1)
+
+    def test_refills_up_to_burst(self):
+        bucket = TokenBucket(rate=10, burst=2)
+        bucket.reserve()
+        self.clock.now += 60
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0.0, 0.0])
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+
+    def test_unlimited(self):
+        bucket = TokenBucket()
+        self.assertEqual([bucket.reserve() for _ in range(100)], [0.0] * 100)
+        self.assertEqual(TokenBucket(rate=5, burst=0).burst, 1)
+
+    def test_throttle_pauses_every_request(self):
+        for bucket in (TokenBucket(), TokenBucket(rate=10, burst=5)):
+            bucket.throttle(5)
+            bucket.throttle(2)  # a shorter pause doesn't cut the longer one short
+            self.assertEqual(bucket.reserve(), 5.0)
+            self.clock.now += 5
+            self.assertEqual(bucket.reserve(), 0.0)
+            self.assertEqual(bucket.throttle_count, 2)
+
+    def test_acquire_sleeps_for_its_token(self):
+        bucket = TokenBucket(rate=10, burst=1)
+        with mock.patch.object(rate_limit.time, "sleep") as sleep:
+            bucket.acquire()
+            bucket.acquire()
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args[0][0], 0.1)
+
+        async def acquire():
+            with mock.patch.object(rate_limit.asyncio, "sleep") as async_sleep:
+                await bucket.acquire_async()
+            return async_sleep
+        self.assertAlmostEqual(asyncio.run(acquire()).call_args[0][0], 0.2)
+
+
+class TestDatacenterBuckets(unittest.TestCase):
+
+    def test_bucket_per_datacenter(self):
+        config = BssConfig()
+        config.add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), rate_limit=5, rate_burst=2)
+        bucket = get_bucket(ENVIRONMENT)
+        self.assertIs(get_bucket(ENVIRONMENT), bucket)
+        self.assertEqual((bucket.rate, bucket.burst), (5, 2))
+        bucket.throttle(0)
+        self.assertEqual(throttle_stats()[ENVIRONMENT], 1)
+
+        config.add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), rate_limit=1)
+        self.assertIsNot(get_bucket(ENVIRONMENT), bucket)
+        self.assertEqual(get_bucket(ENVIRONMENT).rate, 1)
+        self.assertEqual(throttle_stats()[ENVIRONMENT], 0)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("30"), 30.0)
+        self.assertEqual(parse_retry_after("-5"), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertAlmostEqual(parse_retry_after(email.utils.formatdate(time.time() + 120, usegmt=True)), 120, delta=2)
+        self.assertEqual(parse_retry_after(email.utils.formatdate(time.time() - 120, usegmt=True)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.utils.cache import ResponseCache, cached, invalidates
+
+ENVIRONMENT = "CACHE"
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_get_put_and_copies(self):
+        cache = ResponseCache()
+        self.assertEqual(cache.get(("NA", "get", ("1",))), (False, None))
+        response = {"Id": 1}
+        cache.put(("NA", "get", ("1",)), ("NA", "thing", "1"), response)
+        response["Id"] = 2
+        found, cached_response = cache.get(("NA", "get", ("1",)))
+        self.assertEqual((found, cached_response), (True, {"Id": 1}))
+        cached_response["Id"] = 3
+        self.assertEqual(cache.get(("NA", "get", ("1",)))[1], {"Id": 1})
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1, "evictions": 0, "size": 1})
+
+    def test_ttl(self):
+        cache = ResponseCache(ttl=60, ttls={"short": 0.01})
+        cache.put(("NA", "short", ()), ("NA", "thing", "1"), 1)
+        cache.put(("NA", "long", ()), ("NA", "thing", "1"), 2)
+        time.sleep(0.02)
+        self.assertEqual(cache.get(("NA", "short", ())), (False, None))
+        self.assertEqual(cache.get(("NA", "long", ())), (True, 2))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResponseCache(max_size=2)
+        for i in range(2):
+            cache.put(("NA", "get", (i,)), ("NA", "thing", str(i)), i)
+        cache.get(("NA", "get", (0,)))
+        cache.put(("NA", "get", (2,)), ("NA", "thing", "2"), 2)
+        self.assertTrue(cache.get(("NA", "get", (0,)))[0])
+        self.assertFalse(cache.get(("NA", "get", (1,)))[0])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_invalidate(self):
+        cache = ResponseCache()
+        for i in range(3):
+            cache.put(("NA", "get", (i,)), ("NA", "thing", str(i)), i)
+        cache.put(("NA", "other", (0,)), ("NA", "other", "0"), 0)
+        cache.invalidate("NA", "thing", 1)
+        self.assertEqual([cache.get(("NA", "get", (i,)))[0] for i in range(3)], [True, False, True])
+        cache.invalidate("NA", "thing")
+        self.assertEqual([cache.get(("NA", "get", (i,)))[0] for i in range(3)], [False, False, False])
+        self.assertTrue(cache.get(("NA", "other", (0,)))[0])
+
+    def test_put_after_invalidate_is_skipped(self):
+        cache = ResponseCache()
+        resource = ("NA", "thing", "1")
+        for invalidate in (lambda: cache.invalidate("NA", "thing", 1), lambda: cache.invalidate("NA", "thing")):
+            generation = cache.begin_read(resource)
+            invalidate()
+            cache.put(("NA", "get", ("1",)), resource, "stale", generation=generation)
+            cache.end_read(resource)
+            self.assertFalse(cache.get(("NA", "get", ("1",)))[0])
+        generation = cache.begin_read(resource)
+        cache.put(("NA", "get", ("1",)), resource, "fresh", generation=generation)
+        cache.end_read(resource)
+        self.assertEqual(cache.get(("NA", "get", ("1",))), (True, "fresh"))
+
+
+class TestCachedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResponseCache()
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"),
+                                   response_cache=self.cache)
+        self.value = "before"
+        self.reading = threading.Event()
+        self.release = threading.Event()
+
+        @cached("thing", "thing_id")
+        def get_thing(environment, thing_id):
+            value = self.value
+            if self.reading is not None:
+                self.reading.set()
+                self.release.wait(5)
+            return value
+
+        @invalidates("thing", "thing_id")
+        def change_thing(environment, thing_id):
+            self.value = "after"
+
+        self.get_thing, self.change_thing = get_thing, change_thing
+
+    def test_read_racing_a_change_is_not_cached(self):
+        slow_read = threading.Thread(target=self.get_thing, args=(ENVIRONMENT, 1))
+        slow_read.start()
+        self.reading.wait(5)
+        self.change_thing(ENVIRONMENT, 1)
+        self.release.set()
+        slow_read.join()
+        self.reading = None
+        self.assertEqual(self.get_thing(ENVIRONMENT, 1), "after")
+        self.assertEqual(self.get_thing(ENVIRONMENT, 1), "after")
+        self.assertEqual(self.cache.hits, 1)
+        self.assertEqual(self.cache._generations, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
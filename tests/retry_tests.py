@@ -0,0 +1,104 @@
+import unittest
+from unittest import mock
+
+import requests
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.exceptions import BssServerError
+from smartcloudadmin.utils.retry import RetryPolicy
+
+ENVIRONMENT = "RETRY"
+
+
+class Response:
+    def __init__(self, status_code: int) -> None:
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self) -> dict:
+        return {"BSSResponse": {"Message": f"status {self.status_code}"}}
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_backoff_doubles_up_to_max_delay(self):
+        policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=0)
+        self.assertEqual([policy.delay(attempt) for attempt in range(1, 6)], [0.5, 1, 2, 3, 3])
+
+    def test_jitter_removes_up_to_its_fraction(self):
+        policy = RetryPolicy(base_delay=1, jitter=0.25)
+        with mock.patch("random.random", return_value=0.0):
+            self.assertEqual(policy.delay(2), 2)
+        with mock.patch("random.random", return_value=0.999999):
+            self.assertAlmostEqual(policy.delay(2), 1.5, places=5)
+        self.assertTrue(all(1.5 <= policy.delay(2) <= 2 for _ in range(100)))
+
+    def test_can_retry(self):
+        policy = RetryPolicy(max_attempts=3)
+        self.assertTrue(policy.can_retry(1, idempotent=True))
+        self.assertTrue(policy.can_retry(2, idempotent=True))
+        self.assertFalse(policy.can_retry(3, idempotent=True))
+        self.assertFalse(policy.can_retry(1, idempotent=False))
+        self.assertTrue(RetryPolicy(retry_mutating=True).can_retry(1, idempotent=False))
+        self.assertFalse(RetryPolicy(max_attempts=1).can_retry(1, idempotent=True))
+
+
+class TestMakeReqRetries(unittest.TestCase):
+
+    def setUp(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"),
+                                   retry_policy=RetryPolicy(max_attempts=3, base_delay=0.001),
+                                   circuit_failure_threshold=0)
+        self.outcomes = []
+        self.sent = []
+
+        def send(environment, url, *, timeout, **kwargs):
+            self.sent.append(kwargs.get("method", "get"))
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return Response(outcome)
+
+        patch = mock.patch.object(bss_api, "_send", send)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_reads_are_retried(self):
+        self.outcomes = [503, requests.exceptions.ConnectionError("reset"), 200]
+        self.assertEqual(bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1").status_code, 200)
+        self.assertEqual(self.sent, ["get"] * 3)
+
+    def test_last_attempt_is_returned_or_raised(self):
+        self.outcomes = [503, 502, 504]
+        with self.assertRaises(BssServerError):
+            bss_api.get_org_by_id(ENVIRONMENT, 1)
+        self.assertEqual(len(self.sent), 3)
+        self.outcomes = [503, 503, requests.exceptions.Timeout("slow")]
+        self.assertRaises(requests.exceptions.Timeout, bss_api.make_req, ENVIRONMENT, "/api/bss/resource/customer/1")
+
+    def test_changes_are_not_retried(self):
+        self.outcomes = [503]
+        self.assertEqual(bss_api.make_req(ENVIRONMENT, "/api/bss/resource/subscriber/1", method="post").status_code,
+                         503)
+        self.outcomes = [requests.exceptions.ConnectionError("reset")]
+        self.assertRaises(requests.exceptions.ConnectionError, bss_api.make_req, ENVIRONMENT,
+                          "/api/bss/resource/subscriber/1", method="post")
+        self.assertEqual(self.sent, ["post", "post"])
+
+    def test_idempotent_changes_are_retried(self):
+        self.outcomes = [503, 204]
+        self.assertEqual(bss_api.make_req(ENVIRONMENT, "/api/bss/resource/subscriber/1", method="put",
+                                          idempotent=True).status_code, 204)
+        self.assertEqual(self.sent, ["put", "put"])
+
+    def test_other_errors_and_statuses_are_not_retried(self):
+        self.outcomes = [404]
+        self.assertEqual(bss_api.make_req(ENVIRONMENT, "/api/bss/resource/customer/1").status_code, 404)
+        self.outcomes = [ValueError("bug")]
+        self.assertRaises(ValueError, bss_api.make_req, ENVIRONMENT, "/api/bss/resource/customer/1")
+        self.assertEqual(len(self.sent), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+
+ENVIRONMENT = "SESSION"
+
+
+class TestSessionPool(unittest.TestCase):
+
+    def setUp(self):
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), pool_maxsize=4,
+                                   pool_block=True)
+        self.addCleanup(bss_api.reset_session, ENVIRONMENT)
+
+    def test_session_is_shared(self):
+        session = bss_api.get_session(ENVIRONMENT)
+        self.assertEqual(session.auth, ("user", "password"))
+        self.assertEqual(session.headers["Connection"], "keep-alive")
+        adapter = session.get_adapter("http://localhost:9/api/bss/resource/customer")
+        self.assertEqual((adapter._pool_maxsize, adapter._pool_block), (4, True))
+        with ThreadPoolExecutor(8) as executor:
+            sessions = list(executor.map(lambda _: bss_api.get_session(ENVIRONMENT), range(16)))
+        self.assertTrue(all(shared is session for shared in sessions))
+
+    def test_reset_and_close(self):
+        session = bss_api.get_session(ENVIRONMENT)
+        with mock.patch.object(session, "close") as close:
+            bss_api.reset_session(ENVIRONMENT)
+            close.assert_called_once_with()
+        session = bss_api.get_session(ENVIRONMENT)
+        with mock.patch.object(session, "close") as close:
+            bss_api.close_sessions()
+            close.assert_called_once_with()
+        self.assertEqual(bss_api._sessions, {})
+        self.assertIsNot(bss_api.get_session(ENVIRONMENT), session)
+
+    def test_re_registered_datacenter_gets_a_new_session(self):
+        session = bss_api.get_session(ENVIRONMENT)
+        BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("other", "password"), keep_alive=False)
+        with mock.patch.object(session, "close") as close:
+            replacement = bss_api.get_session(ENVIRONMENT)
+            close.assert_called_once_with()
+        self.assertIsNot(replacement, session)
+        self.assertEqual(replacement.auth, ("other", "password"))
+        self.assertEqual(replacement.headers["Connection"], "close")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,181 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import urlsplit, parse_qs
+
+import smartcloudadmin.http_requests as bss_api
+from smartcloudadmin.config import BssConfig
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.utils.deadline import within
+from smartcloudadmin.utils.single_flight import SingleFlight
+from tests.offline import ORGANIZATION_ID, customer_json, subscriber_json, subscription_json
+
+ENVIRONMENT = "FLIGHT"
+
+BssConfig().add_datacenter(ENVIRONMENT, "http://localhost:9", ("user", "password"), page_size=10)
+
+
+class _Response:
+    def __init__(self, status_code: int, body: dict = None) -> None:
+        self.status_code = status_code
+        self.headers = {}
+        self._body = body
+
+    def json(self) -> dict:
+        return self._body
+
+
+class StubBss:
+    """
+        Stands in for make_req, answering the requests an Organization is loaded with after a delay so concurrent
+        callers overlap.
+
+        Attributes
+        ----------
+        requests : [(str, str)]
+            (method, url) of every request.
+    """
+    def __init__(self, subscriber_count: int = 25, delay: float = 0.05) -> None:
+        self.subscribers = [subscriber_json(i) for i in range(subscriber_count)]
+        self.subscriptions = [subscription_json(i) for i in range(3)]
+        self.delay = delay
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def make_req(self, environment, url, **kwargs) -> _Response:
+        delay = self.delay
+        response = self._respond(url, **kwargs)
+        with self._lock:
+            self.requests.append((kwargs.get("method", "get"), url))
+        time.sleep(delay)
+        return response
+
+    def _respond(self, url, **kwargs) -> _Response:
+        path = urlsplit(url).path
+        query = {name: values[0] for name, values in parse_qs(urlsplit(url).query).items()}
+        query.update(kwargs.get("params") or {})
+        if kwargs.get("method", "get") != "get":
+            return _Response(204)
+        if path.startswith("/api/bss/resource/customer/"):
+            return _Response(200, {"Customer": customer_json()})
+        if path.startswith("/api/bss/resource/subscriber/"):
+            subscriber_id = int(path.rsplit("/", 1)[1])
+            return _Response(200, {"Subscriber": next(subscriber for subscriber in self.subscribers
+                                                      if subscriber["Id"] == subscriber_id)})
+        records = self.subscribers if path == "/api/bss/resource/subscriber" else self.subscriptions
+        page_number, page_size = int(query["_pageNumber"]), int(query["_pageSize"])
+        return _Response(200, {"List": records[(page_number - 1) * page_size:page_number * page_size]})
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def setUp(self):
+        self.flights = SingleFlight()
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def call(self, result="result"):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def test_concurrent_calls_share_one(self):
+        key = ((ENVIRONMENT, "thing", "1"), "get_thing", ())
+        with ThreadPoolExecutor(10) as executor:
+            first = executor.submit(self.flights.do, key, self.call)
+            self.started.wait(5)
+            others = [executor.submit(self.flights.do, key, self.call) for _ in range(9)]
+            while self.flights.coalesced < 9:
+                time.sleep(0.001)
+            self.release.set()
+            self.assertEqual([future.result() for future in [first] + others], ["result"] * 10)
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(self.flights._calls, {})
+
+    def test_exception_is_shared(self):
+        key = ((ENVIRONMENT, "thing", "1"), "get_thing", ())
+        with ThreadPoolExecutor(2) as executor:
+            first = executor.submit(self.flights.do, key, self.call, KeyError("missing"))
+            self.started.wait(5)
+            second = executor.submit(self.flights.do, key, self.call)
+            while not self.flights.coalesced:
+                time.sleep(0.001)
+            self.release.set()
+            for future in (first, second):
+                self.assertRaises(KeyError, future.result)
+        self.assertEqual(self.calls, 1)
+
+    def test_detached_call_is_not_joined(self):
+        key = ((ENVIRONMENT, "thing", "1"), "get_thing", ())
+        listing = ((ENVIRONMENT, "thing", None), "get_things", ())
+        other = ((ENVIRONMENT, "thing", "2"), "get_thing", ())
+        with ThreadPoolExecutor(3) as executor:
+            for flight in (key, listing, other):
+                executor.submit(self.flights.do, flight, self.call)
+            while len(self.flights._calls) < 3:
+                time.sleep(0.001)
+            self.flights.detach(ENVIRONMENT, "thing", 1)
+            self.assertEqual(list(self.flights._calls), [other])
+            self.release.set()
+        self.assertEqual(self.flights.do(key, lambda: "new"), "new")
+        self.assertEqual(self.flights._calls, {})
+
+
+class TestCoalescedEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = StubBss()
+        patch = mock.patch.object(bss_api, "make_req", self.bss.make_req)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_concurrent_organization_loads_share_requests(self):
+        Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+        requests_per_load = len(self.bss.requests)
+        self.bss.requests.clear()
+        barrier = threading.Barrier(10)
+
+        def load(_):
+            barrier.wait()
+            return Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+
+        with ThreadPoolExecutor(10) as executor:
+            organizations = list(executor.map(load, range(10)))
+        self.assertEqual(len(self.bss.requests), requests_per_load)
+        self.assertTrue(all(len(organization.subscribers) == 25 for organization in organizations))
+
+    def test_read_after_change_does_not_join_earlier_read(self):
+        self.bss.delay = 0.2
+        with ThreadPoolExecutor(1) as executor:
+            earlier = executor.submit(bss_api.get_subscriber_by_id, ENVIRONMENT, 1001)
+            while not self.bss.requests:
+                time.sleep(0.001)
+            self.bss.delay = 0
+            self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+            bss_api.suspend_subscriber(ENVIRONMENT, 1001)
+            self.assertEqual(bss_api.get_subscriber_by_id(ENVIRONMENT, 1001)["SubscriberState"], "SUSPENDED")
+            self.assertEqual(earlier.result()["SubscriberState"], "ACTIVE")
+        self.assertEqual([url for method, url in self.bss.requests if method == "get"],
+                         ["/api/bss/resource/subscriber/1001"] * 2)
+
+    def test_calls_with_a_deadline_are_not_shared(self):
+        barrier = threading.Barrier(2)
+
+        def read(seconds):
+            barrier.wait()
+            with within(seconds):
+                return bss_api.get_org_by_id(ENVIRONMENT, ORGANIZATION_ID)
+
+        with ThreadPoolExecutor(2) as executor:
+            list(executor.map(read, (None, 30)))
+        self.assertEqual(len(self.bss.requests), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from smartcloudadmin.models.address_set import AddressSet
+from smartcloudadmin.models.contact import Contact
+from smartcloudadmin.models.seat import Seat
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscription import Subscription
+from tests.offline import ENVIRONMENT, subscriber_json, subscription_json
+
+
+class TestSlots(unittest.TestCase):
+
+    def setUp(self):
+        self.subscriber = Subscriber.from_json(ENVIRONMENT, subscriber_json(1, subscription_ids=[900, 901]))
+        self.subscription = Subscription.from_json(ENVIRONMENT, subscription_json(1))
+
+    def test_models_have_no_instance_dict(self):
+        seat = next(iter(self.subscriber.seat_set.values()))
+        address_set = AddressSet.not_provided(modified="01/01/1970 00:00:00")
+        for model in (self.subscriber, self.subscription, seat, address_set,
+                      Contact(given_name="Given", family_name="Family", email_address="a@example.com", deleted=False)):
+            with self.subTest(model=type(model).__name__):
+                self.assertFalse(hasattr(model, "__dict__"))
+                self.assertRaises(AttributeError, setattr, model, "misspelt_attribute", 1)
+
+    def test_every_slot_is_set(self):
+        for model in (self.subscriber, self.subscription):
+            with self.subTest(model=type(model).__name__):
+                self.assertEqual([field for field in type(model).__slots__ if not hasattr(model, field)], [])
+
+    def test_equality(self):
+        same = Subscriber.from_json(ENVIRONMENT, subscriber_json(1, subscription_ids=[900, 901]))
+        self.assertEqual(self.subscriber, same)
+        same.state = "SUSPENDED"
+        self.assertNotEqual(self.subscriber, same)
+        self.assertEqual(self.subscription, Subscription.from_json(ENVIRONMENT, subscription_json(1)))
+        self.assertNotEqual(self.subscription, Subscription.from_json(ENVIRONMENT, subscription_json(2)))
+        self.assertNotEqual(self.subscriber, self.subscription)
+
+    def test_slot_set_on_one_side_only_is_unequal(self):
+        same = Subscriber.from_json(ENVIRONMENT, subscriber_json(1, subscription_ids=[900, 901]))
+        del same.employee_number
+        self.assertNotEqual(self.subscriber, same)
+        self.assertNotEqual(same, self.subscriber)
+        del self.subscriber.employee_number
+        self.assertEqual(self.subscriber, same)
+
+    def test_seats_are_hashable(self):
+        seats = list(self.subscriber.seat_set.values())
+        copies = list(Subscriber.from_json(ENVIRONMENT, subscriber_json(1, subscription_ids=[900, 901]))
+                      .seat_set.values())
+        self.assertEqual(seats, copies)
+        self.assertEqual(set(seats), set(copies))
+        self.assertEqual(len(set(seats + copies)), 2)
+        self.assertEqual({seat: seat.subscription_id for seat in seats}[copies[1]], 901)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from smartcloudadmin.models.lazy import LazyOrganization, LazySubscriber, LazySubscription
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+from smartcloudadmin.models.subscription import Subscription
+from smartcloudadmin.store import LocalStore
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json
+
+
+class TestLocalStore(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.store = LocalStore()
+        self.addCleanup(self.store.close)
+        self.organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID, store=self.store)
+        self.bss.requests.clear()
+
+    def test_round_trip(self):
+        stored = self.store.load_organization(ENVIRONMENT, ORGANIZATION_ID)
+        self.assertEqual(stored.subscribers, self.organization.subscribers)
+        self.assertEqual(stored.subscriptions, self.organization.subscriptions)
+        self.assertEqual(set(stored.admins), set(self.organization.admins))
+
+    def test_recent_enough_is_used_as_is(self):
+        stored = Organization.get(ENVIRONMENT, ORGANIZATION_ID, store=self.store, max_age=600)
+        self.assertEqual(self.bss.requests, [])
+        self.assertEqual(len(stored.subscribers), 25)
+
+    def test_stored_organization_is_synced(self):
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        del self.bss.subscribers[2]
+        stored = Organization.get(ENVIRONMENT, ORGANIZATION_ID, store=self.store)
+        self.assertEqual(stored.subscribers[1001].state, "SUSPENDED")
+        self.assertNotIn(1002, stored.subscribers)
+        self.assertEqual(self.store.get_subscriber(ENVIRONMENT, subscriber_id=1001).state, "SUSPENDED")
+        self.assertIsNone(self.store.get_subscriber(ENVIRONMENT, subscriber_id=1002))
+        self.assertFalse(stored.sync().changed)
+
+    def test_layout_and_model(self):
+        lazy = LazyOrganization.get(ENVIRONMENT, ORGANIZATION_ID, store=self.store, max_age=600)
+        self.assertIsInstance(lazy, LazyOrganization)
+        self.assertIsInstance(lazy.subscribers[1001], LazySubscriber)
+        self.assertIsInstance(lazy.subscriptions[900], LazySubscription)
+        self.assertEqual(lazy.subscribers[1001], self.organization.subscribers[1001])
+        columnar = Organization.get(ENVIRONMENT, ORGANIZATION_ID, store=self.store, max_age=600, columnar=True)
+        self.assertIsInstance(columnar.subscribers, SubscriberTable)
+        self.assertEqual(set(columnar.admins), set(self.organization.admins))
+        self.assertEqual(columnar.subscribers[1003], self.organization.subscribers[1003])
+
+    def test_subscriber_and_subscription_max_age(self):
+        Subscriber.get(ENVIRONMENT, subscriber_id=1001, store=self.store)
+        Subscription.get(ENVIRONMENT, 900, store=self.store)
+        self.assertEqual(len(self.bss.requests), 2)
+        self.assertIsInstance(LazySubscriber.get(ENVIRONMENT, subscriber_id=1001, store=self.store, max_age=600),
+                              LazySubscriber)
+        Subscription.get(ENVIRONMENT, 900, store=self.store, max_age=600)
+        self.assertEqual(len(self.bss.requests), 2)
+        Subscription.get(ENVIRONMENT, 900, store=self.store, max_age=0)
+        self.assertEqual(len(self.bss.requests), 3)
+
+    def test_seats_are_loaded_in_one_query(self):
+        queries = []
+        self.store._connection.set_trace_callback(queries.append)
+        self.addCleanup(self.store._connection.set_trace_callback, None)
+        stored = self.store.load_organization(ENVIRONMENT, ORGANIZATION_ID)
+        self.assertEqual(len([query for query in queries if "FROM seats" in query]), 1)
+        self.assertEqual({subscriber_id: sorted(subscriber.seat_set) for subscriber_id, subscriber
+                          in stored.subscribers.items()},
+                         {subscriber_id: sorted(subscriber.seat_set) for subscriber_id, subscriber
+                          in self.organization.subscribers.items()})
+        suspended = self.store.find_subscribers(ENVIRONMENT, customer_id=ORGANIZATION_ID, state="SUSPENDED")
+        self.assertEqual([subscriber.id for subscriber in suspended], [1000, 1007, 1014, 1021])
+        self.assertEqual([subscriber.seat_set for subscriber in suspended],
+                         [self.organization.subscribers[subscriber.id].seat_set for subscriber in suspended])
+
+
+if __name__ == '__main__':
+    unittest.main()
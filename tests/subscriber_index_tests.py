@@ -0,0 +1,115 @@
+import unittest
+
+from smartcloudadmin.models.organization import Organization
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscriber_index import SubscriberIndex
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json
+
+
+def index_contents(index: SubscriberIndex) -> tuple:
+    return index.by_email, index.by_state, index.by_role, index.by_subscription, len(index)
+
+
+class TestSubscriberIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.subscribers = [Subscriber.from_json(ENVIRONMENT, subscriber_json(i)) for i in range(20)]
+        self.index = SubscriberIndex(self.subscribers)
+
+    def test_lookups(self):
+        self.assertEqual(self.index.by_email["user3@example.com"], 1003)
+        self.assertEqual(self.index.by_state["SUSPENDED"], {1000, 1007, 1014})
+        self.assertEqual(self.index.by_role["CustomerAdministrator"], {1000, 1010})
+        self.assertEqual(self.index.by_subscription[901], {1001, 1004, 1007, 1010, 1013, 1016, 1019})
+        self.assertIn(1019, self.index)
+
+    def test_changed_subscriber_is_moved(self):
+        changed = Subscriber.from_json(ENVIRONMENT, subscriber_json(
+            3, state="SUSPENDED", roles=["User", "CustomerAdministrator"], subscription_ids=[901, 902]))
+        changed.email = "Renamed@Example.com"
+        self.index.add(changed)
+        self.subscribers[3] = changed
+        self.assertEqual(index_contents(self.index), index_contents(SubscriberIndex(self.subscribers)))
+        self.assertNotIn("user3@example.com", self.index.by_email)
+
+    def test_remove(self):
+        self.index.remove(1010)
+        self.index.remove(1010)
+        self.index.remove(2000)
+        self.assertEqual(index_contents(self.index),
+                         index_contents(SubscriberIndex(subscriber for subscriber in self.subscribers
+                                                        if subscriber.id != 1010)))
+        self.index.remove(1000)
+        self.assertNotIn("CustomerAdministrator", self.index.by_role)
+
+    def test_shared_email_keeps_the_remaining_subscriber(self):
+        duplicate = Subscriber.from_json(ENVIRONMENT, dict(subscriber_json(20), Person=subscriber_json(3)["Person"]))
+        self.index.add(duplicate)
+        self.index.remove(1003)
+        self.assertEqual(self.index.by_email["user3@example.com"], 1020)
+
+
+class TestOrganizationLookups(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+        self.assertIsNone(self.organization._index)
+
+    def assertIndexIsCurrent(self):
+        self.assertEqual(index_contents(self.organization._subscriber_index()),
+                         index_contents(SubscriberIndex(self.organization.subscribers.values())))
+
+    def test_lookups(self):
+        self.assertEqual(self.organization.subscriber_by_email("USER4@example.COM").id, 1004)
+        self.assertIsNone(self.organization.subscriber_by_email("nobody@example.com"))
+        self.assertEqual(sorted(self.organization.subscribers_by_state("SUSPENDED")), [1000, 1007, 1014, 1021])
+        self.assertEqual(sorted(self.organization.subscribers_by_role("CustomerAdministrator")), [1000, 1010, 1020])
+        self.assertEqual(sorted(self.organization.subscribers_by_subscription(902)),
+                         [1002, 1005, 1008, 1011, 1014, 1017, 1020, 1023])
+        self.assertEqual(self.organization.subscribers_by_subscription(999), {})
+
+    def test_entitle_revoke_and_reindex(self):
+        self.organization.subscribers_by_state("ACTIVE")
+        subscriber = self.organization.subscribers[1001]
+        self.organization.entitle_subscriber(subscriber, 902)
+        self.assertIn(1001, self.organization.subscribers_by_subscription(902))
+        self.organization.revoke_subscriber(subscriber, 901)
+        self.assertNotIn(1001, self.organization.subscribers_by_subscription(901))
+        subscriber.suspend()
+        self.organization.reindex_subscriber(subscriber)
+        self.assertIn(1001, self.organization.subscribers_by_state("SUSPENDED"))
+        self.assertIndexIsCurrent()
+
+    def test_added_subscriber_is_indexed(self):
+        self.organization.subscribers_by_state("ACTIVE")
+        subscriber = self.organization.add_subscriber(email_address="New.Admin@Example.com", given_name="New",
+                                                      family_name="Admin", role_set="CustomerAdministrator")
+        self.assertIs(self.organization.subscriber_by_email("new.admin@example.com"), subscriber)
+        self.assertIn(subscriber.id, self.organization.subscribers_by_state("PENDING"))
+        self.assertIn(subscriber.id, self.organization.subscribers_by_role("CustomerAdministrator"))
+        self.assertIn(subscriber.id, self.organization.admins)
+        self.assertIndexIsCurrent()
+
+    def test_sync_updates_the_index(self):
+        self.organization.subscribers_by_state("ACTIVE")
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED", roles=["User", "CustomerAdministrator"])
+        self.bss.subscribers.append(subscriber_json(25))
+        del self.bss.subscribers[2]
+        self.organization.sync()
+        self.assertIn(1001, self.organization.subscribers_by_state("SUSPENDED"))
+        self.assertIn(1001, self.organization.subscribers_by_role("CustomerAdministrator"))
+        self.assertEqual(self.organization.subscriber_by_email("user25@example.com").id, 1025)
+        self.assertIsNone(self.organization.subscriber_by_email("user2@example.com"))
+        self.assertIndexIsCurrent()
+
+    def test_columnar_organization(self):
+        organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID, columnar=True)
+        self.assertEqual(sorted(organization.subscribers_by_role("CustomerAdministrator")), [1000, 1010, 1020])
+        self.assertEqual(organization.subscriber_by_email("user4@example.com"), self.organization.subscribers[1004])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+from collections import Counter
+
+from smartcloudadmin.models.subscriber import Subscriber
+from smartcloudadmin.models.subscriber_table import SubscriberTable
+from tests.offline import ENVIRONMENT, subscriber_json
+
+
+def subscribers(count: int = 30) -> [Subscriber]:
+    return [Subscriber.from_json(ENVIRONMENT, subscriber_json(i, subscription_ids=[900 + n for n in range(i % 4)]))
+            for i in range(count)]
+
+
+class TestSubscriberTable(unittest.TestCase):
+
+    def setUp(self):
+        self.subscribers = subscribers()
+        self.table = SubscriberTable(ENVIRONMENT)
+        for subscriber in self.subscribers:
+            self.table.add(subscriber)
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.table), 30)
+        self.assertEqual(list(self.table), [subscriber.id for subscriber in self.subscribers])
+        for subscriber in self.subscribers:
+            with self.subTest(id=subscriber.id):
+                self.assertEqual(self.table[subscriber.id], subscriber)
+                self.assertEqual(sorted(self.table[subscriber.id].seat_set), sorted(subscriber.seat_set))
+        self.assertNotIn(1030, self.table)
+        self.assertRaises(KeyError, lambda: self.table[1030])
+
+    def test_rows_are_copies(self):
+        subscriber = self.table[1001]
+        subscriber.state = "SUSPENDED"
+        self.assertEqual(self.table[1001].state, "ACTIVE")
+        self.table[1001] = subscriber
+        self.assertEqual(self.table[1001].state, "SUSPENDED")
+
+    def test_replaced_and_removed_rows_are_dead_until_compacted(self):
+        suspended = Subscriber.from_json(ENVIRONMENT, subscriber_json(1, state="SUSPENDED"))
+        self.table.add(suspended)
+        del self.table[1002]
+        self.assertEqual(len(self.table), 29)
+        self.assertEqual(len(self.table.columns["live"]), 31)
+        self.assertEqual(sum(self.table.columns["live"]), 29)
+        self.assertNotIn(1002, self.table)
+
+        self.table.compact()
+        self.assertEqual(len(self.table.columns["live"]), 29)
+        self.assertEqual(self.table[1001], suspended)
+        unchanged = [subscriber for subscriber in self.subscribers if subscriber.id not in (1001, 1002)]
+        self.assertEqual([self.table[subscriber.id] for subscriber in unchanged], unchanged)
+
+    def test_compacts_once_most_rows_are_dead(self):
+        for subscriber in subscribers(1100)[30:]:
+            self.table.add(subscriber)
+        for subscriber_id in range(1000, 1551):
+            del self.table[subscriber_id]
+        self.assertEqual(len(self.table), 549)
+        self.assertEqual(len(self.table.columns["live"]), 549)
+        self.assertEqual(self.table[1551].id, 1551)
+
+    def test_count_by_matches_a_scan(self):
+        for column, attribute in (("state", "state"), ("security_realm", "security_realm"),
+                                  ("customer_id", "customer_id"), ("created", "created")):
+            with self.subTest(column=column):
+                self.assertEqual(self.table.count_by(column),
+                                 Counter(getattr(subscriber, attribute) for subscriber in self.subscribers))
+        self.assertEqual(self.table.count_by("role"),
+                         Counter(role for subscriber in self.subscribers for role in subscriber.role_set))
+        self.assertEqual(self.table.count_by("modified", key=lambda modified: modified.month),
+                         Counter(subscriber.modified.month for subscriber in self.subscribers))
+        del self.table[1001]
+        self.assertEqual(self.table.count_by("state"),
+                         Counter(subscriber.state for subscriber in self.subscribers if subscriber.id != 1001))
+
+    def test_role_view(self):
+        admins = self.table.with_role("CustomerAdministrator")
+        self.assertEqual(list(admins), [1000, 1010, 1020])
+        self.assertEqual(len(admins), 3)
+        self.assertIn(1010, admins)
+        self.assertNotIn(1001, admins)
+        self.assertEqual(admins[1010], self.table[1010])
+        self.assertRaises(KeyError, lambda: admins[1001])
+
+        self.table.add(Subscriber.from_json(ENVIRONMENT, subscriber_json(1, roles=["User", "CustomerAdministrator"])))
+        del self.table[1010]
+        self.assertEqual(sorted(admins), [1000, 1001, 1020])
+        self.assertEqual(list(self.table.with_role("VendorAdministrator")), [])
+
+    def test_at_most_64_roles(self):
+        table = SubscriberTable(ENVIRONMENT)
+        table.add(Subscriber.from_json(ENVIRONMENT, subscriber_json(0, roles=[f"Role{n}" for n in range(64)])))
+        self.assertRaises(ValueError, table.add,
+                          Subscriber.from_json(ENVIRONMENT, subscriber_json(1, roles=["Role64"])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+
+from smartcloudadmin.models.organization import Organization
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json, subscription_json
+
+
+class TestOrganizationSync(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.organization = Organization.get(ENVIRONMENT, ORGANIZATION_ID)
+
+    def test_unchanged(self):
+        result = self.organization.sync()
+        self.assertFalse(result.changed)
+        self.assertEqual(len(self.organization.subscribers), 25)
+
+    def test_changes_are_reported(self):
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.bss.subscribers.append(subscriber_json(25))
+        del self.bss.subscribers[2]
+        self.bss.subscriptions.append(subscription_json(3))
+        result = self.organization.sync()
+        self.assertEqual([(before.state, after.state) for before, after in result.changed_subscribers],
+                         [("ACTIVE", "SUSPENDED")])
+        self.assertEqual([subscriber.id for subscriber in result.added_subscribers], [1025])
+        self.assertEqual([subscriber.id for subscriber in result.removed_subscribers], [1002])
+        self.assertEqual([subscription.id for subscription in result.added_subscriptions], [903])
+        self.assertEqual(self.organization.subscribers[1001].state, "SUSPENDED")
+        self.assertFalse(self.organization.sync().changed)
+
+    def test_failed_sync_applies_nothing(self):
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.bss.subscriptions[0] = dict(subscription_json(0), SubscriptionState="SUSPENDED")
+        self.bss.fail_pages[("get_subscribers_by_org", 2)] = TimeoutError()
+        with self.assertRaises(TimeoutError):
+            self.organization.sync()
+        self.assertEqual(self.organization.subscribers[1001].state, "ACTIVE")
+        self.assertEqual(self.organization.subscriptions[900].state, "ACTIVE")
+
+        del self.bss.fail_pages[("get_subscribers_by_org", 2)]
+        result = self.organization.sync()
+        self.assertEqual([after.id for before, after in result.changed_subscribers], [1001])
+        self.assertEqual([after.id for before, after in result.changed_subscriptions], [900])
+        self.assertEqual(self.organization.subscribers[1001].state, "SUSPENDED")
+
+    def subscriber_page_requests(self) -> int:
+        return sum(1 for name, _, _ in self.bss.requests if name == "get_subscribers_by_org")
+
+    def test_check_for_updates_skips_subscribers_while_subscriptions_are_unchanged(self):
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.bss.requests.clear()
+        self.assertFalse(self.organization.check_for_updates())
+        self.assertEqual(self.subscriber_page_requests(), 0)
+        self.assertEqual(len(self.bss.requests), 2)
+
+        self.bss.subscriptions[0] = dict(subscription_json(0), NumberOfAvailableSeats=1)
+        self.assertTrue(self.organization.check_for_updates())
+        self.assertEqual(self.subscriber_page_requests(), 3)
+        self.assertEqual(self.organization.subscribers[1001].state, "SUSPENDED")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import threading
+import time
+import unittest
+from datetime import datetime
+
+from smartcloudadmin.watcher import FleetWatcher, ChangeType
+from tests.offline import OfflineBss, ENVIRONMENT, ORGANIZATION_ID, subscriber_json
+
+
+class TestFleetWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.bss = OfflineBss(subscriber_count=25)
+        self.bss.__enter__()
+        self.addCleanup(self.bss.__exit__)
+        self.watcher = FleetWatcher([(ENVIRONMENT, ORGANIZATION_ID)])
+        self.assertEqual(self.watcher.poll_once(), [])  # baseline
+
+    def change_types(self) -> [ChangeType]:
+        return [event.change_type for event in self.watcher.poll_once()]
+
+    def test_failed_poll_keeps_its_changes(self):
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.bss.fail_pages[("get_subscribers_by_org", 2)] = TimeoutError()
+        self.assertEqual(self.change_types(), [ChangeType.POLL_FAILED])
+        del self.bss.fail_pages[("get_subscribers_by_org", 2)]
+        self.assertEqual(self.change_types(), [ChangeType.SUBSCRIBER_SUSPENDED])
+        self.assertEqual(self.change_types(), [])
+
+    def test_expiry_during_failed_poll_is_reported(self):
+        time.sleep(1.1)
+        expiration_date = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
+        self.bss.subscriptions[0].update(ExpirationDate=expiration_date, Modified=expiration_date)
+        self.bss.fail_pages[("get_subscribers_by_org", 1)] = TimeoutError()
+        self.assertEqual(self.change_types(), [ChangeType.POLL_FAILED])
+        del self.bss.fail_pages[("get_subscribers_by_org", 1)]
+        self.assertEqual(self.change_types(), [ChangeType.SUBSCRIPTION_UPDATED, ChangeType.SUBSCRIPTION_EXPIRED])
+        self.assertEqual(self.change_types(), [])
+
+    def test_started_watcher_polls_on_its_own_threads(self):
+        threads = []
+        self.watcher.callback = lambda event: threads.append(threading.current_thread().name)
+        self.watcher.start()  # the baseline poll scheduled the next one interval seconds away
+        self.addCleanup(self.watcher.stop)
+        self.bss.subscribers[1] = subscriber_json(1, state="SUSPENDED")
+        self.assertEqual(self.change_types(), [ChangeType.SUBSCRIBER_SUSPENDED])
+        self.assertTrue(threads[0].startswith("fleet-watcher_"))
+        self.assertEqual((self.watcher.polls, self.watcher.failures), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()